@@ -7,6 +7,8 @@ from app.services.venue_service import VenueService
 from app.services.game_service import GameService
 from app.services.simulation_service import SimulationService
 from app.services.data_loader import DataLoaderService
+from app.services.game_analysis_service import GameAnalysisService, game_analysis_service
+from app.services.events import DataVersionBroadcaster, data_events
 
 # Repository dependencies
 def get_venue_repository() -> VenueRepository:
@@ -50,3 +52,13 @@ def get_simulation_service(
 def get_data_loader_service() -> DataLoaderService:
     """Get data loader service instance."""
     return DataLoaderService()
+
+
+def get_game_analysis_service() -> GameAnalysisService:
+    """Get the shared game analysis service instance."""
+    return game_analysis_service
+
+
+def get_data_events() -> DataVersionBroadcaster:
+    """Get the shared data-version event broadcaster."""
+    return data_events
@@ -0,0 +1,66 @@
+# app/api/endpoints/events.py
+"""Server-Sent Events endpoints."""
+
+import asyncio
+import logging
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import get_data_events
+from app.api.responses.encoding import format_sse
+from app.api.routing import TracedRoute
+from app.services.events import DataVersionBroadcaster
+from app.constants import API, Performance
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/events", tags=["events"], route_class=TracedRoute)
+
+
+async def data_version_stream(
+    request: Request,
+    events: DataVersionBroadcaster,
+    last_event_id: str | None
+) -> AsyncIterator[bytes]:
+    """Yield data-version events, with keep-alive comments while idle."""
+    queue = events.subscribe()
+    try:
+        yield f"retry: {Performance.Events.RETRY_MS}\n\n".encode()
+        # Tell a new (or reconnecting, out of date) client the current version
+        latest = events.latest
+        if latest is not None and latest["version"] != last_event_id:
+            yield format_sse(latest, API.Events.DATA_VERSION, latest["version"])
+        
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=Performance.Events.HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield format_sse(event, API.Events.DATA_VERSION, event["version"])
+    finally:
+        events.unsubscribe(queue)
+        logger.debug(f"Data-version subscriber disconnected ({events.subscriber_count()} remaining)")
+
+
+@router.get("/data-version")
+async def stream_data_version(
+    request: Request,
+    events: Annotated[DataVersionBroadcaster, Depends(get_data_events)],
+    last_event_id: Annotated[str | None, Header()] = None
+):
+    """Stream an event whenever the loaded data changes.
+    
+    Each ``data-version`` event carries the new data version and, for partial
+    updates, the affected game IDs and team names; a ``full`` scope means
+    every cached game view is stale.
+    """
+    logger.debug("GET /events/data-version - Client subscribed to data-version events")
+    return StreamingResponse(
+        data_version_stream(request, events, last_event_id),
+        media_type=API.MediaTypes.EVENT_STREAM,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,17 +1,31 @@
 # app/api/endpoints/games.py
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any, Annotated
+from fastapi import APIRouter, HTTPException, Depends, Query, Header
+from datetime import date
+from typing import List, Dict, Any, Annotated, Literal, Tuple
 import logging
 import traceback
 import sqlite3
 
 # Import database connection
 from app.database.connection import db_manager
+from app.database.pagination import split_page, where_clause
+from app.services.game_analysis_service import GameAnalysisService
+from app.api.dependencies import get_game_analysis_service
+from app.api.responses.models import (
+    GameAnalysisBatchRequest, GameAnalysisBatchResponse, GameBundleResponse, GameOverviewResponse
+)
+from app.api.responses.encoding import (
+    FastJSONResponse, MessagePackResponse, encode_rows, negotiate_media_type
+)
+from app.api.routing import TracedRoute
+from app.constants import API, BusinessLogic, Performance
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/games", tags=["games"])
+router = APIRouter(
+    prefix="/games", tags=["games"], default_response_class=FastJSONResponse, route_class=TracedRoute
+)
 
 
 def get_database_connection():
@@ -19,49 +33,112 @@ def get_database_connection():
     return db_manager.get_connection()
 
 
+# Rows come back in response order, so they encode without per-row fixes
+GAME_COLUMNS = ("id", "home_team", "away_team", "date", "venue_id", "venue_name")
+GAME_DTYPES = {"id": API.BinaryDtypes.INTEGER, "venue_id": API.BinaryDtypes.INTEGER}
+GAMES_WITH_VENUES = """
+    SELECT g.id, g.home_team, g.away_team, g.date, g.venue_id,
+           COALESCE(NULLIF(v.venue_name, ''), 'Unknown Venue') AS venue_name
+    FROM games g
+    LEFT JOIN venues v ON g.venue_id = v.venue_id
+"""
+
+
+def games_page_query(
+    limit: int,
+    after: int | None = None,
+    team: str | None = None,
+    venue_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None
+) -> Tuple[str, List[Any]]:
+    """Build the query for up to ``limit`` games after ID ``after``, ordered by ID.
+    
+    Games are read in ID order from an index ending in ``id``, so a page stops
+    after ``limit`` matches without sorting: a team filter is a UNION ALL of
+    the home and away team indexes, merged by ID, and a venue filter uses the
+    venue index. A date range on its own is searched on the date index
+    instead, and only the games in the range are sorted.
+    """
+    # The unary plus stops SQLite from walking the ID index and filtering
+    # every game by date
+    date_only = (date_from or date_to) and not team and venue_id is None
+    game_id = "+g.id" if date_only else "g.id"
+    
+    conditions, params = [], []
+    if after is not None:
+        conditions.append(f"{game_id} > ?")
+        params.append(after)
+    if venue_id is not None:
+        conditions.append("g.venue_id = ?")
+        params.append(venue_id)
+    if date_from:
+        conditions.append("g.date >= ?")
+        params.append(date_from.isoformat())
+    if date_to:
+        conditions.append("g.date <= ?")
+        params.append(date_to.isoformat())
+    
+    if not team:
+        return f"{GAMES_WITH_VENUES} {where_clause(conditions)} ORDER BY {game_id} LIMIT ?", [*params, limit]
+    
+    home = where_clause(["g.home_team = ?", *conditions])
+    # Games where the team is also the home team were already read by the first branch
+    away = where_clause(["g.away_team = ?", "g.home_team != ?", *conditions])
+    query = f"""
+        {GAMES_WITH_VENUES} {home}
+        UNION ALL
+        {GAMES_WITH_VENUES} {away}
+        ORDER BY id
+        LIMIT ?
+    """
+    return query, [team, *params, team, team, *params, limit]
+
+
 @router.get("/")
-async def get_games():
-    """Get all games from database."""
-    logger.info("GET /games/ - Getting all games from database")
+async def get_games(
+    limit: Annotated[int, Query(
+        ge=1, le=Performance.QueryLimits.MAX_RECORD_LIMIT, description="Maximum number of games to return"
+    )] = Performance.QueryLimits.DEFAULT_RECORD_LIMIT,
+    cursor: Annotated[int | None, Query(description="Return games after this game ID (from X-Next-Cursor)")] = None,
+    team: Annotated[str | None, Query(description="Only games with this home or away team")] = None,
+    venue_id: Annotated[int | None, Query(description="Only games at this venue")] = None,
+    date_from: Annotated[date | None, Query(description="Only games on or after this date")] = None,
+    date_to: Annotated[date | None, Query(description="Only games on or before this date")] = None,
+    accept: Annotated[str | None, Header()] = None
+):
+    """Get one page of games from database, ordered by ID.
+    
+    Pages are keyed on the game ID, so fetching a deep page costs the same as
+    the first. When more games match, the ``X-Next-Cursor`` header holds the
+    ``cursor`` value for the next page.
+    
+    Send ``Accept: application/x-msgpack`` for the page as columns (IDs packed
+    as integer buffers) or ``Accept: application/x-ndjson`` for one JSON
+    object per line.
+    """
+    logger.debug("GET /games/ - Getting games from database")
+    
+    media_type = negotiate_media_type(
+        accept, offered=(API.MediaTypes.JSON, API.MediaTypes.MSGPACK, API.MediaTypes.NDJSON)
+    )
     
     try:
         conn = get_database_connection()
-        cursor = conn.cursor()
-        
-        # Query games with venue information
-        query = """
-        SELECT 
-            g.id, 
-            g.home_team, 
-            g.away_team, 
-            g.date, 
-            g.venue_id,
-            v.venue_name
-        FROM games g
-        LEFT JOIN venues v ON g.venue_id = v.venue_id
-        ORDER BY g.id
-        """
-        
-        logger.info(f"Executing query: {query}")
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        db_cursor = conn.cursor()
         
-        # Convert rows to list of dictionaries
-        games = []
-        for row in rows:
-            game = {
-                "id": row[0],
-                "home_team": row[1],
-                "away_team": row[2],
-                "date": row[3],
-                "venue_id": row[4],
-                "venue_name": row[5] if row[5] else "Unknown Venue"
-            }
-            games.append(game)
+        query, params = games_page_query(limit + 1, cursor, team, venue_id, date_from, date_to)
         
+        logger.debug(f"Executing query: {query} with params: {params}")
+        db_cursor.execute(query, params)
+        rows, next_cursor = split_page(db_cursor.fetchall(), limit)
         conn.close()
-        logger.info(f"Successfully retrieved {len(games)} games from database")
-        return games
+        
+        logger.debug(f"Successfully retrieved {len(rows)} games from database")
+        headers = {"Vary": "Accept"}
+        if next_cursor is not None:
+            headers[API.Headers.NEXT_CURSOR] = str(next_cursor)
+        return encode_rows(rows, GAME_COLUMNS, GAME_DTYPES, media_type, headers)
         
     except sqlite3.Error as e:
         logger.error(f"Database error in get_games: {str(e)}")
@@ -79,10 +156,72 @@ async def get_games():
         )
 
 
+@router.get("/overview", response_model=GameOverviewResponse)
+async def get_games_overview(
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)]
+):
+    """Get every game with its home win probability, tie rate and simulation count.
+    
+    Served from the per-game counts materialized when the data is loaded.
+    """
+    logger.debug("GET /games/overview - Getting games overview")
+    
+    try:
+        overview = await analysis_service.get_overview()
+        return FastJSONResponse(overview.body)
+        
+    except sqlite3.Error as e:
+        logger.error(f"Database error in get_games_overview: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Database error retrieving games overview: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_games_overview: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error retrieving games overview: {str(e)}"
+        )
+
+
+@router.post("/analysis:batch", response_model=GameAnalysisBatchResponse)
+async def get_game_analysis_batch(
+    request: GameAnalysisBatchRequest,
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)]
+):
+    """Get win probability summaries for many games in one call."""
+    logger.debug(f"POST /games/analysis:batch - Getting analysis summaries for {len(request.ids)} games")
+    
+    try:
+        results, missing = await analysis_service.get_analysis_summaries(request.ids)
+        
+        if missing:
+            logger.warning(f"Games not found for batch analysis: {missing}")
+        
+        return FastJSONResponse({"results": results, "missing": missing})
+        
+    except sqlite3.Error as e:
+        logger.error(f"Database error in get_game_analysis_batch: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Database error retrieving batch analysis: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_game_analysis_batch: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error retrieving batch analysis: {str(e)}"
+        )
+
+
 @router.get("/{game_id}")
 async def get_game(game_id: int):
     """Get game by ID from database."""
-    logger.info(f"GET /games/{game_id} - Getting game by ID from database")
+    logger.debug(f"GET /games/{game_id} - Getting game by ID from database")
     
     try:
         if game_id <= 0:
@@ -93,35 +232,17 @@ async def get_game(game_id: int):
         cursor = conn.cursor()
         
         # Query specific game with venue information
-        query = """
-        SELECT 
-            g.id, 
-            g.home_team, 
-            g.away_team, 
-            g.date, 
-            g.venue_id,
-            v.venue_name
-        FROM games g
-        LEFT JOIN venues v ON g.venue_id = v.venue_id
-        WHERE g.id = ?
-        """
+        query = f"{GAMES_WITH_VENUES} WHERE g.id = ?"
         
-        logger.info(f"Executing query: {query} with game_id: {game_id}")
+        logger.debug(f"Executing query: {query} with game_id: {game_id}")
         cursor.execute(query, (game_id,))
         row = cursor.fetchone()
         
         if row:
-            game = {
-                "id": row[0],
-                "home_team": row[1],
-                "away_team": row[2],
-                "date": row[3],
-                "venue_id": row[4],
-                "venue_name": row[5] if row[5] else "Unknown Venue"
-            }
+            game = dict(zip(GAME_COLUMNS, row))
             conn.close()
-            logger.info(f"Found game: {game}")
-            return game
+            logger.debug(f"Found game {game_id}")
+            return FastJSONResponse(game)
         else:
             conn.close()
             logger.warning(f"Game not found for ID: {game_id}")
@@ -147,112 +268,41 @@ async def get_game(game_id: int):
 
 
 @router.get("/{game_id}/analysis")
-async def get_game_analysis(game_id: int):
-    """Get game analysis with real simulations and win probability."""
-    logger.info(f"GET /games/{game_id}/analysis - Getting game analysis from database")
+async def get_game_analysis(
+    game_id: int,
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)],
+    accept: Annotated[str | None, Header()] = None,
+    response_format: Annotated[
+        Literal[API.AnalysisFormats.ROWS, API.AnalysisFormats.COLUMNAR],
+        Query(alias="format", description="Per-run simulations as row objects or parallel arrays")
+    ] = API.AnalysisFormats.ROWS,
+    include_runs: Annotated[
+        bool, Query(description="Set to false to return only the aggregates")
+    ] = True
+):
+    """Get game analysis with real simulations and win probability.
+    
+    Send ``Accept: application/x-msgpack`` for a MessagePack body whose
+    per-run scores are packed int16 columns.
+    """
+    logger.debug(f"GET /games/{game_id}/analysis - Getting game analysis from database")
     
     try:
         if game_id <= 0:
             logger.warning(f"Invalid game ID: {game_id}")
             raise HTTPException(status_code=400, detail="Game ID must be positive")
         
-        conn = get_database_connection()
-        cursor = conn.cursor()
-        
-        # First, get the game information
-        game_query = """
-        SELECT 
-            g.id, 
-            g.home_team, 
-            g.away_team, 
-            g.date, 
-            g.venue_id,
-            v.venue_name
-        FROM games g
-        LEFT JOIN venues v ON g.venue_id = v.venue_id
-        WHERE g.id = ?
-        """
-        
-        logger.info(f"Getting game info for ID: {game_id}")
-        cursor.execute(game_query, (game_id,))
-        game_row = cursor.fetchone()
+        media_type = negotiate_media_type(accept)
+        analysis = await analysis_service.get_game_analysis(game_id, response_format, include_runs, media_type)
         
-        if not game_row:
-            conn.close()
+        if analysis is None:
             logger.warning(f"Game not found for analysis: {game_id}")
             raise HTTPException(status_code=404, detail="Game not found")
         
-        game_info = {
-            "id": game_row[0],
-            "home_team": game_row[1],
-            "away_team": game_row[2],
-            "date": game_row[3],
-            "venue_id": game_row[4],
-            "venue_name": game_row[5] if game_row[5] else "Unknown Venue"
-        }
-        
-        # Get simulations for both teams
-        simulation_query = """
-        SELECT 
-            team,
-            simulation_run,
-            results
-        FROM simulations 
-        WHERE team IN (?, ?)
-        ORDER BY simulation_run, team
-        """
-        
-        logger.info(f"Getting simulations for teams: {game_info['home_team']}, {game_info['away_team']}")
-        cursor.execute(simulation_query, (game_info['home_team'], game_info['away_team']))
-        simulation_rows = cursor.fetchall()
+        if media_type == API.MediaTypes.MSGPACK:
+            return MessagePackResponse(analysis.body, headers={"Vary": "Accept"})
         
-        # Process simulations - group by simulation_run
-        simulations_by_run = {}
-        for row in simulation_rows:
-            team, sim_run, result = row
-            if sim_run not in simulations_by_run:
-                simulations_by_run[sim_run] = {}
-            simulations_by_run[sim_run][team] = result
-        
-        # Create simulation pairs (only where both teams have data for the same run)
-        simulations = []
-        home_wins = 0
-        total_simulations = 0
-        
-        for sim_run, team_results in simulations_by_run.items():
-            home_team = game_info['home_team']
-            away_team = game_info['away_team']
-            
-            if home_team in team_results and away_team in team_results:
-                home_score = team_results[home_team]
-                away_score = team_results[away_team]
-                
-                simulations.append({
-                    "home_score": home_score,
-                    "away_score": away_score
-                })
-                
-                if home_score > away_score:
-                    home_wins += 1
-                total_simulations += 1
-        
-        # Calculate win probability
-        if total_simulations > 0:
-            home_win_probability = round((home_wins / total_simulations) * 100, 2)
-        else:
-            home_win_probability = 0.0
-        
-        conn.close()
-        
-        analysis = {
-            "game": game_info,
-            "simulations": simulations,
-            "home_win_probability": home_win_probability,
-            "total_simulations": total_simulations
-        }
-        
-        logger.info(f"Generated analysis for game {game_id}: {total_simulations} simulations, {home_win_probability}% home win rate")
-        return analysis
+        return FastJSONResponse(analysis.body, headers={"Vary": "Accept"})
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -274,92 +324,39 @@ async def get_game_analysis(game_id: int):
 
 
 @router.get("/{game_id}/histogram-data")
-async def get_histogram_data(game_id: int):
+async def get_histogram_data(
+    game_id: int,
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)],
+    version: Annotated[
+        int,
+        Query(
+            ge=API.HistogramVersions.RAW,
+            le=API.HistogramVersions.BINNED,
+            description="1: raw scores and frequencies, 2: pre-binned count arrays"
+        )
+    ] = API.HistogramVersions.RAW,
+    bin_size: Annotated[
+        int, Query(ge=1, le=BusinessLogic.DataLimits.MAX_SCORE, description="Bin width for version 2")
+    ] = BusinessLogic.Histogram.DEFAULT_BIN_SIZE
+):
     """Get histogram data for game visualization from database."""
-    logger.info(f"GET /games/{game_id}/histogram-data - Getting histogram data from database")
+    logger.debug(f"GET /games/{game_id}/histogram-data - Getting histogram data from database")
     
     try:
         if game_id <= 0:
             logger.warning(f"Invalid game ID: {game_id}")
             raise HTTPException(status_code=400, detail="Game ID must be positive")
         
-        conn = get_database_connection()
-        cursor = conn.cursor()
-        
-        # First, get the game information
-        game_query = """
-        SELECT home_team, away_team
-        FROM games 
-        WHERE id = ?
-        """
-        
-        logger.info(f"Getting game info for histogram, ID: {game_id}")
-        cursor.execute(game_query, (game_id,))
-        game_row = cursor.fetchone()
+        if version == API.HistogramVersions.BINNED:
+            histogram_data = await analysis_service.get_histogram_bins(game_id, bin_size)
+        else:
+            histogram_data = await analysis_service.get_histogram_data(game_id)
         
-        if not game_row:
-            conn.close()
+        if histogram_data is None:
             logger.warning(f"Game not found for histogram: {game_id}")
             raise HTTPException(status_code=404, detail="Game not found")
         
-        home_team, away_team = game_row
-        
-        # Get all simulation results for both teams
-        simulation_query = """
-        SELECT team, results
-        FROM simulations 
-        WHERE team IN (?, ?)
-        """
-        
-        logger.info(f"Getting simulation data for teams: {home_team}, {away_team}")
-        cursor.execute(simulation_query, (home_team, away_team))
-        simulation_rows = cursor.fetchall()
-        
-        # Separate scores by team
-        home_scores = []
-        away_scores = []
-        
-        for row in simulation_rows:
-            team, score = row
-            if team == home_team:
-                home_scores.append(score)
-            elif team == away_team:
-                away_scores.append(score)
-        
-        # Calculate score range
-        all_scores = home_scores + away_scores
-        if all_scores:
-            score_range = {"min": min(all_scores), "max": max(all_scores)}
-        else:
-            score_range = {"min": 0, "max": 0}
-        
-        # Create frequency objects (count occurrences of each score)
-        from collections import Counter
-        
-        home_frequency = dict(Counter(home_scores))
-        away_frequency = dict(Counter(away_scores))
-        
-        # Convert integer keys to string keys (as expected by frontend)
-        home_frequency_str = {str(score): count for score, count in home_frequency.items()}
-        away_frequency_str = {str(score): count for score, count in away_frequency.items()}
-        
-        conn.close()
-        
-        histogram_data = {
-            "home_team": home_team,
-            "away_team": away_team,
-            "home_scores": home_scores,
-            "away_scores": away_scores,
-            "home_frequency": home_frequency_str,
-            "away_frequency": away_frequency_str,
-            "score_range": score_range
-        }
-        
-        logger.info(f"Generated histogram data for game {game_id}: {len(home_scores)} home scores, {len(away_scores)} away scores")
-        logger.info(f"Home frequency sample: {dict(list(home_frequency_str.items())[:5])}")
-        logger.info(f"Away frequency sample: {dict(list(away_frequency_str.items())[:5])}")
-        
-        return histogram_data
+        return FastJSONResponse(histogram_data.body)
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -377,4 +374,47 @@ async def get_histogram_data(game_id: int):
         raise HTTPException(
             status_code=500, 
             detail=f"Error retrieving histogram data for game {game_id}: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/{game_id}/bundle", response_model=GameBundleResponse)
+async def get_game_bundle(
+    game_id: int,
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)],
+    bin_size: Annotated[
+        int, Query(ge=1, le=BusinessLogic.DataLimits.MAX_SCORE, description="Histogram bin width")
+    ] = BusinessLogic.Histogram.DEFAULT_BIN_SIZE
+):
+    """Get game info, win probability and binned histogram for a game view in one call."""
+    logger.debug(f"GET /games/{game_id}/bundle - Getting game bundle from database")
+    
+    try:
+        if game_id <= 0:
+            logger.warning(f"Invalid game ID: {game_id}")
+            raise HTTPException(status_code=400, detail="Game ID must be positive")
+        
+        bundle = await analysis_service.get_game_bundle(game_id, bin_size)
+        
+        if bundle is None:
+            logger.warning(f"Game not found for bundle: {game_id}")
+            raise HTTPException(status_code=404, detail="Game not found")
+        
+        return FastJSONResponse(bundle.body)
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except sqlite3.Error as e:
+        logger.error(f"Database error in get_game_bundle: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Database error retrieving bundle for game {game_id}: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Error in get_game_bundle: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error retrieving bundle for game {game_id}: {str(e)}"
+        )
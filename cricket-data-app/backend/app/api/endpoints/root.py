@@ -1,13 +1,23 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from datetime import datetime
-from ...constants import HTTPStatus, API, Database
+from ...constants import HTTPStatus, API, Database, ErrorMessages, Performance
 from ...services.data_loader import DataLoaderService
-from ..dependencies import get_data_loader_service
-from ..responses.models import APIInfoResponse, HealthResponse, DataStatusResponse
+from ...services.game_analysis_service import GameAnalysisService
+from ..routing import TracedRoute
+from ..dependencies import get_data_loader_service, get_game_analysis_service
+from ..responses.models import (
+    APIInfoResponse, HealthResponse, DataStatusResponse, CoalescingStatsResponse,
+    CacheStatsResponse, ProfileListResponse, SlowQueryListResponse, TraceListResponse, TraceResponse
+)
+from ..responses.encoding import FastJSONResponse
 from ...config import get_environment_settings
+from ...monitoring.metrics import registry
+from ...monitoring.profiling import profile_store
+from ...monitoring.slow_queries import slow_query_observer
+from ...monitoring.tracing import trace_buffer
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 
 
 @router.get("/", response_model=APIInfoResponse)
@@ -22,15 +32,26 @@ async def root():
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint."""
+async def health_check(request: Request, response: Response):
+    """Health check endpoint; not ready until the startup warm-up finishes."""
+    if not getattr(request.app.state, "warmup_complete", True):
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+        status = API.ResponseMessages.HEALTH_STATUS_WARMING_UP
+    else:
+        status = API.ResponseMessages.HEALTH_STATUS_HEALTHY
     return HealthResponse(
-        status=API.ResponseMessages.HEALTH_STATUS_HEALTHY,
+        status=status,
         database=API.ResponseMessages.DATABASE_CONNECTED,
         timestamp=datetime.now().isoformat()
     )
 
 
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in the text exposition format."""
+    return Response(registry.render(), media_type=API.MediaTypes.PROMETHEUS)
+
+
 @router.get("/debug/data-status", response_model=DataStatusResponse)
 async def debug_data_status(
     data_loader: Annotated[DataLoaderService, Depends(get_data_loader_service)]
@@ -39,3 +60,82 @@ async def debug_data_status(
     status = data_loader.get_data_status()
     return DataStatusResponse(**status)
 
+
+@router.get("/debug/coalescing", response_model=CoalescingStatsResponse)
+async def debug_coalescing_stats(
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)]
+):
+    """Debug endpoint showing how many analysis computations were shared."""
+    return CoalescingStatsResponse(**analysis_service.get_coalescing_stats())
+
+
+@router.get("/debug/cache", response_model=CacheStatsResponse)
+async def debug_cache_stats(
+    analysis_service: Annotated[GameAnalysisService, Depends(get_game_analysis_service)]
+):
+    """Debug endpoint showing analysis result cache usage."""
+    return CacheStatsResponse(**analysis_service.get_cache_stats())
+
+
+@router.get("/debug/profiles", response_model=ProfileListResponse)
+async def debug_profiles():
+    """Debug endpoint listing stored request profiles (enable with PROFILING_ENABLED)."""
+    return ProfileListResponse(profiles=profile_store.list())
+
+
+@router.get("/debug/profiles/{profile_id}")
+async def debug_profile(
+    profile_id: str,
+    profile_format: Annotated[
+        Literal[API.ProfileFormats.JSON, API.ProfileFormats.FOLDED],
+        Query(alias="format", description="Full profile, or collapsed stacks for flamegraph tools")
+    ] = API.ProfileFormats.JSON
+):
+    """Download a stored request profile."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=ErrorMessages.PROFILE_NOT_FOUND)
+    
+    if profile_format == API.ProfileFormats.FOLDED:
+        return Response(
+            profile.folded(),
+            media_type=API.MediaTypes.PLAIN_TEXT,
+            headers={API.Headers.CONTENT_DISPOSITION: f'attachment; filename="profile-{profile.id}.folded"'}
+        )
+    return FastJSONResponse(
+        profile.to_dict(),
+        headers={API.Headers.CONTENT_DISPOSITION: f'attachment; filename="profile-{profile.id}.json"'}
+    )
+
+
+@router.get("/debug/slow-queries", response_model=SlowQueryListResponse)
+async def debug_slow_queries(
+    limit: Annotated[int, Query(
+        ge=1, le=Performance.SlowQueries.MAX_LIMIT, description="Number of statements to return"
+    )] = Performance.SlowQueries.DEFAULT_LIMIT
+):
+    """Debug endpoint listing the slowest SQL statements with run counts and query plans."""
+    return SlowQueryListResponse(
+        threshold_ms=slow_query_observer.threshold_ms,
+        untracked=slow_query_observer.untracked,
+        statements=slow_query_observer.slowest(limit)
+    )
+
+
+@router.get("/debug/traces", response_model=TraceListResponse)
+async def debug_traces(
+    limit: Annotated[int, Query(
+        ge=1, le=Performance.Tracing.MAX_SLOW_LIMIT, description="Number of traces to return"
+    )] = Performance.Tracing.DEFAULT_SLOW_LIMIT
+):
+    """Debug endpoint listing the slowest recently traced requests with time per span kind."""
+    return TraceListResponse(traces=[trace.summary() for trace in trace_buffer.slowest(limit)])
+
+
+@router.get("/debug/traces/{trace_id}", response_model=TraceResponse)
+async def debug_trace(trace_id: str):
+    """Debug endpoint returning every span of a traced request."""
+    trace = trace_buffer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail=ErrorMessages.TRACE_NOT_FOUND)
+    return TraceResponse(**trace.to_dict())
@@ -1,30 +1,40 @@
 # app/api/endpoints/simulations.py
 """Simulation API endpoints with real database queries."""
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Header, Query, Request
+from typing import List, Dict, Any, Annotated
 import logging
 import traceback
 import sqlite3
 
 # Import database connection
 from app.database.connection import db_manager
+from app.api.responses.encoding import (
+    FastJSONResponse, MessagePackResponse, encode_rows, negotiate_media_type, pack_columns, stream_ndjson_response
+)
+from app.api.routing import TracedRoute
+from app.constants import API, Performance
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/simulations", tags=["simulations"])
+router = APIRouter(
+    prefix="/simulations", tags=["simulations"], default_response_class=FastJSONResponse, route_class=TracedRoute
+)
 
 
-def get_database_connection():
+def get_database_connection(check_same_thread: bool = True):
     """Get database connection."""
-    return db_manager.get_connection()
+    return db_manager.get_connection(check_same_thread=check_same_thread)
+
+
+SIMULATION_COLUMNS = ("team_id", "team", "simulation_run", "results")
 
 
 @router.get("/teams")
 async def get_teams():
     """Get all unique team names from database."""
-    logger.info("GET /simulations/teams - Getting all team names from database")
+    logger.debug("GET /simulations/teams - Getting all team names from database")
     
     try:
         conn = get_database_connection()
@@ -33,7 +43,7 @@ async def get_teams():
         # Query unique team names
         query = "SELECT DISTINCT team FROM simulations ORDER BY team"
         
-        logger.info(f"Executing query: {query}")
+        logger.debug(f"Executing query: {query}")
         cursor.execute(query)
         rows = cursor.fetchall()
         
@@ -41,8 +51,8 @@ async def get_teams():
         teams = [row[0] for row in rows]
         
         conn.close()
-        logger.info(f"Successfully retrieved {len(teams)} teams from database")
-        return teams
+        logger.debug(f"Successfully retrieved {len(teams)} teams from database")
+        return FastJSONResponse(teams)
         
     except sqlite3.Error as e:
         logger.error(f"Database error in get_teams: {str(e)}")
@@ -61,12 +71,28 @@ async def get_teams():
 
 
 @router.get("/{team_name}")
-async def get_team_simulations(team_name: str):
-    """Get simulations for a specific team from database."""
-    logger.info(f"GET /simulations/{team_name} - Getting simulations for team from database")
+async def get_team_simulations(
+    request: Request,
+    team_name: str,
+    accept: Annotated[str | None, Header()] = None,
+    stream: Annotated[bool, Query(description="Stream the runs as NDJSON")] = False
+):
+    """Get simulations for a specific team from database.
+    
+    Send ``Accept: application/x-msgpack`` for a MessagePack body with the
+    columns packed as integer buffers instead of one object per run.
+    Send ``Accept: application/x-ndjson`` (or ``?stream=true``) to stream one
+    JSON object per line, read from the database in bounded chunks.
+    """
+    logger.debug(f"GET /simulations/{team_name} - Getting simulations for team from database")
+    
+    media_type = API.MediaTypes.NDJSON if stream else negotiate_media_type(
+        accept, offered=(API.MediaTypes.JSON, API.MediaTypes.MSGPACK, API.MediaTypes.NDJSON)
+    )
     
     try:
-        conn = get_database_connection()
+        # A streamed response reads its later chunks from the thread pool
+        conn = get_database_connection(check_same_thread=media_type != API.MediaTypes.NDJSON)
         cursor = conn.cursor()
         
         # Query simulations for specific team
@@ -77,9 +103,12 @@ async def get_team_simulations(team_name: str):
         ORDER BY simulation_run
         """
         
-        logger.info(f"Executing query: {query} with team_name: {team_name}")
+        logger.debug(f"Executing query: {query} with team_name: {team_name}")
         cursor.execute(query, (team_name,))
-        rows = cursor.fetchall()
+        if media_type == API.MediaTypes.NDJSON:
+            rows = cursor.fetchmany(Performance.QueryLimits.STREAM_FETCH_SIZE)
+        else:
+            rows = cursor.fetchall()
         
         if not rows:
             conn.close()
@@ -89,20 +118,38 @@ async def get_team_simulations(team_name: str):
                 detail=f"No simulations found for team: {team_name}"
             )
         
-        # Convert rows to list of dictionaries
-        simulations = []
-        for row in rows:
-            simulation = {
-                "team_id": row[0],
-                "team": row[1],
-                "simulation_run": row[2],
-                "results": row[3]
+        if media_type == API.MediaTypes.NDJSON:
+            # The response owns the connection from here and closes it
+            logger.debug(f"Streaming simulations for team {team_name} (ndjson)")
+            return stream_ndjson_response(
+                request, conn, cursor,
+                columns=SIMULATION_COLUMNS,
+                first_rows=rows,
+                fetch_size=Performance.QueryLimits.STREAM_FETCH_SIZE,
+                headers={"Vary": "Accept"}
+            )
+        
+        if media_type == API.MediaTypes.MSGPACK:
+            conn.close()
+            team_ids, _, simulation_runs, results = zip(*rows)
+            payload = {
+                "team": team_name,
+                "count": len(rows),
+                **pack_columns(
+                    {"team_id": team_ids, "simulation_run": simulation_runs, "results": results},
+                    {
+                        "team_id": API.BinaryDtypes.INTEGER,
+                        "simulation_run": API.BinaryDtypes.INTEGER,
+                        "results": API.BinaryDtypes.SCORE
+                    }
+                )
             }
-            simulations.append(simulation)
+            logger.debug(f"Successfully retrieved {len(rows)} simulations for team {team_name} (msgpack)")
+            return MessagePackResponse(payload, headers={"Vary": "Accept"})
         
         conn.close()
-        logger.info(f"Successfully retrieved {len(simulations)} simulations for team {team_name}")
-        return simulations
+        logger.debug(f"Successfully retrieved {len(rows)} simulations for team {team_name}")
+        return encode_rows(rows, SIMULATION_COLUMNS, {}, media_type, headers={"Vary": "Accept"})
         
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -126,7 +173,7 @@ async def get_team_simulations(team_name: str):
 @router.get("/{team_name}/statistics")
 async def get_team_statistics(team_name: str):
     """Get statistical summary for a team from database."""
-    logger.info(f"GET /simulations/{team_name}/statistics - Getting team statistics from database")
+    logger.debug(f"GET /simulations/{team_name}/statistics - Getting team statistics from database")
     
     try:
         conn = get_database_connection()
@@ -143,7 +190,7 @@ async def get_team_statistics(team_name: str):
         WHERE team = ?
         """
         
-        logger.info(f"Executing query: {query} with team_name: {team_name}")
+        logger.debug(f"Executing query: {query} with team_name: {team_name}")
         cursor.execute(query, (team_name,))
         row = cursor.fetchone()
         
@@ -179,8 +226,8 @@ async def get_team_statistics(team_name: str):
             "standard_deviation": round(std_dev, 2)
         }
         
-        logger.info(f"Generated statistics for team {team_name}: {statistics}")
-        return statistics
+        logger.debug(f"Generated statistics for team {team_name}")
+        return FastJSONResponse(statistics)
         
     except HTTPException:
         # Re-raise HTTP exceptions
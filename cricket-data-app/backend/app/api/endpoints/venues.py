@@ -1,19 +1,23 @@
 # app/api/endpoints/venues.py
 """Venue API endpoints with real database queries."""
 
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Header, Query
+from typing import List, Annotated
 import logging
 import traceback
 import sqlite3
 
 # Import database connection
 from app.database.connection import db_manager
+from app.database.pagination import split_page, where_clause
+from app.api.responses.encoding import FastJSONResponse, encode_rows, negotiate_media_type
+from app.api.routing import TracedRoute
+from app.constants import API, Performance
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/venues", tags=["venues"])
+router = APIRouter(prefix="/venues", tags=["venues"], default_response_class=FastJSONResponse, route_class=TracedRoute)
 
 
 def get_database_connection():
@@ -21,34 +25,53 @@ def get_database_connection():
     return db_manager.get_connection()
 
 
+VENUE_COLUMNS = ("id", "name")
+VENUE_DTYPES = {"id": API.BinaryDtypes.INTEGER}
+
+
 @router.get("/")
-async def get_venues():
-    """Get all venues from database."""
-    logger.info("GET /venues/ - Getting all venues from database")
+async def get_venues(
+    limit: Annotated[int, Query(
+        ge=1, le=Performance.QueryLimits.MAX_RECORD_LIMIT, description="Maximum number of venues to return"
+    )] = Performance.QueryLimits.DEFAULT_RECORD_LIMIT,
+    cursor: Annotated[int | None, Query(description="Return venues after this venue ID (from X-Next-Cursor)")] = None,
+    accept: Annotated[str | None, Header()] = None
+):
+    """Get one page of venues from database, ordered by ID.
+    
+    When more venues exist, the ``X-Next-Cursor`` header holds the ``cursor``
+    value for the next page. Send ``Accept: application/x-msgpack`` for the
+    page as columns or ``Accept: application/x-ndjson`` for one JSON object
+    per line.
+    """
+    logger.debug("GET /venues/ - Getting venues from database")
+    
+    media_type = negotiate_media_type(
+        accept, offered=(API.MediaTypes.JSON, API.MediaTypes.MSGPACK, API.MediaTypes.NDJSON)
+    )
     
     try:
         conn = get_database_connection()
-        cursor = conn.cursor()
-        
-        # Query all venues
-        query = "SELECT venue_id, venue_name FROM venues ORDER BY venue_id"
+        db_cursor = conn.cursor()
         
-        logger.info(f"Executing query: {query}")
-        cursor.execute(query)
-        rows = cursor.fetchall()
+        conditions, params = [], []
+        if cursor is not None:
+            conditions.append("venue_id > ?")
+            params.append(cursor)
         
-        # Convert rows to list of dictionaries
-        venues = []
-        for row in rows:
-            venue = {
-                "id": row[0],
-                "name": row[1]
-            }
-            venues.append(venue)
+        # Query one page of venues, plus one row to detect a next page
+        query = f"SELECT venue_id, venue_name FROM venues {where_clause(conditions)} ORDER BY venue_id LIMIT ?"
         
+        logger.debug(f"Executing query: {query} with params: {params}, limit: {limit}")
+        db_cursor.execute(query, (*params, limit + 1))
+        rows, next_cursor = split_page(db_cursor.fetchall(), limit)
         conn.close()
-        logger.info(f"Successfully retrieved {len(venues)} venues from database")
-        return venues
+        
+        logger.debug(f"Successfully retrieved {len(rows)} venues from database")
+        headers = {"Vary": "Accept"}
+        if next_cursor is not None:
+            headers[API.Headers.NEXT_CURSOR] = str(next_cursor)
+        return encode_rows(rows, VENUE_COLUMNS, VENUE_DTYPES, media_type, headers)
         
     except sqlite3.Error as e:
         logger.error(f"Database error in get_venues: {str(e)}")
@@ -69,7 +92,7 @@ async def get_venues():
 @router.get("/{venue_id}")
 async def get_venue(venue_id: int):
     """Get venue by ID from database."""
-    logger.info(f"GET /venues/{venue_id} - Getting venue by ID from database")
+    logger.debug(f"GET /venues/{venue_id} - Getting venue by ID from database")
     
     try:
         if venue_id <= 0:
@@ -82,18 +105,15 @@ async def get_venue(venue_id: int):
         # Query specific venue
         query = "SELECT venue_id, venue_name FROM venues WHERE venue_id = ?"
         
-        logger.info(f"Executing query: {query} with venue_id: {venue_id}")
+        logger.debug(f"Executing query: {query} with venue_id: {venue_id}")
         cursor.execute(query, (venue_id,))
         row = cursor.fetchone()
         
         if row:
-            venue = {
-                "id": row[0],
-                "name": row[1]
-            }
+            venue = dict(zip(VENUE_COLUMNS, row))
             conn.close()
-            logger.info(f"Found venue: {venue}")
-            return venue
+            logger.debug(f"Found venue {venue_id}")
+            return FastJSONResponse(venue)
         else:
             conn.close()
             logger.warning(f"Venue not found for ID: {venue_id}")
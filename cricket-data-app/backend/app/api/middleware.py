@@ -1,7 +1,155 @@
+import random
+import time
+from urllib.parse import parse_qs
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from ..config import get_environment_settings
-from ..constants import API
+from ..constants import API, Performance
+from ..database.instrumentation import add_query_observer
+from ..monitoring.metrics import (
+    registry, http_requests, http_request_duration, http_requests_in_flight,
+    http_request_db_statements, http_request_db_rows, database_metrics_observer, analysis_cache_collector
+)
+from ..monitoring.query_counts import count_queries
+from ..monitoring.profiling import (
+    RequestProfile, StackSampler, current_profile, profile_store, profiling_query_observer
+)
+from ..monitoring.slow_queries import slow_query_observer
+from ..monitoring.tracing import Trace, current_trace, trace_buffer, tracing_query_observer
+from ..services.game_analysis_service import game_analysis_service
+
+
+class MetricsMiddleware:
+    """Record request count, latency, in-flight requests and database work per route template.
+    
+    Plain ASGI middleware, so streamed responses are timed until their last
+    chunk is sent.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        http_requests_in_flight.inc()
+        start_time = time.perf_counter()
+        try:
+            with count_queries() as queries:
+                await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start_time
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the scope; label by its
+            # template so /games/1 and /games/2 share a series
+            route = getattr(scope.get("route"), "path", Performance.Metrics.UNMATCHED_ROUTE)
+            labels = (scope["method"], route)
+            http_request_duration.observe(labels, duration)
+            http_requests.inc(labels + (str(status_code),))
+            http_request_db_statements.observe(labels, queries.statements)
+            http_request_db_rows.observe(labels, queries.rows)
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it with ``X-Profile: 1`` or ``?profile=1``.
+    
+    The profile is stored under the id returned in the ``X-Profile-Id``
+    response header. Requests without the trigger pass straight through.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        profile = RequestProfile(scope["method"], scope["path"])
+        
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((Performance.Profiling.ID_HEADER.lower().encode(), profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        token = current_profile.set(profile)
+        sampler = StackSampler(profile)
+        sampler.start()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.duration = time.perf_counter() - start_time
+            sampler.stop()
+            current_profile.reset(token)
+            profile_store.add(profile)
+
+
+class TracingMiddleware:
+    """Trace a sample of requests (and any sent with ``X-Trace: 1``).
+    
+    Sampled requests get an ``X-Trace-Id`` response header; the finished
+    trace is kept in the in-memory buffer read by ``/debug/traces``.
+    """
+    
+    def __init__(self, app: ASGIApp, sample_rate: float = Performance.Tracing.SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (
+            random.random() < self.sample_rate or _header_flag(scope, Performance.Tracing.TRIGGER_HEADER)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        trace = Trace(scope["method"], scope["path"])
+        
+        async def send_with_trace_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                trace.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((Performance.Tracing.ID_HEADER.lower().encode(), trace.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        token = current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            trace.duration = time.perf_counter() - trace.start
+            trace.route = getattr(scope.get("route"), "path", None)
+            current_trace.reset(token)
+            trace_buffer.add(trace)
+
+
+def _is_true(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+def _header_flag(scope: Scope, header: str) -> bool:
+    header = header.encode()
+    return any(name == header and _is_true(value.decode("latin-1")) for name, value in scope["headers"])
+
+
+def _profiling_requested(scope: Scope) -> bool:
+    if _header_flag(scope, Performance.Profiling.TRIGGER_HEADER):
+        return True
+    flags = parse_qs(scope.get("query_string", b"").decode("latin-1")).get(Performance.Profiling.TRIGGER_QUERY_PARAM)
+    return bool(flags) and _is_true(flags[-1])
 
 
 def setup_middleware(app: FastAPI) -> None:
@@ -16,4 +164,24 @@ def setup_middleware(app: FastAPI) -> None:
         allow_methods=API.CORS.ALLOWED_METHODS,
         allow_headers=API.CORS.ALLOWED_HEADERS,
     )
-
+    
+    # Configure Prometheus metrics
+    if config.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        add_query_observer(database_metrics_observer)
+        registry.add_collector("analysis_cache", analysis_cache_collector(game_analysis_service))
+    
+    # Configure on-demand request profiling; not installed at all when disabled
+    if config.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware)
+        add_query_observer(profiling_query_observer)
+    
+    # Configure sampled span tracing
+    if config.tracing_enabled:
+        app.add_middleware(TracingMiddleware, sample_rate=config.tracing_sample_rate)
+        add_query_observer(tracing_query_observer)
+    
+    # Configure the slow-query log
+    if config.slow_query_log_enabled:
+        slow_query_observer.threshold_ms = config.slow_query_threshold_ms
+        add_query_observer(slow_query_observer)
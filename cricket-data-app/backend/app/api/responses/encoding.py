@@ -0,0 +1,207 @@
+"""Content negotiation and binary response encodings."""
+
+import sqlite3
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+
+from ...constants import API, Performance
+from ...monitoring.metrics import response_render_duration
+from ...monitoring.tracing import span
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is listed in requirements.txt
+    msgpack = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded in one step with orjson.
+
+    Return it directly from an endpoint to skip FastAPI's ``jsonable_encoder``
+    pass. ``content`` may also be JSON that is already encoded (``bytes``),
+    e.g. a cached payload body, which is sent as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        start_time = time.perf_counter()
+        with span("FastJSONResponse.render", Performance.Tracing.Kinds.SERIALIZE):
+            body = orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        response_render_duration.observe((API.MediaTypes.JSON,), time.perf_counter() - start_time)
+        return body
+
+
+class MessagePackResponse(Response):
+    """Response encoded with MessagePack.
+
+    As with FastJSONResponse, ``content`` that is already encoded (``bytes``)
+    is sent as-is.
+    """
+
+    media_type = API.MediaTypes.MSGPACK
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        start_time = time.perf_counter()
+        with span("MessagePackResponse.render", Performance.Tracing.Kinds.SERIALIZE):
+            body = msgpack.packb(content, use_bin_type=True)
+        response_render_duration.observe((API.MediaTypes.MSGPACK,), time.perf_counter() - start_time)
+        return body
+
+
+def negotiate_media_type(
+    accept: Optional[str],
+    offered: Sequence[str] = (API.MediaTypes.JSON, API.MediaTypes.MSGPACK)
+) -> str:
+    """Pick the response media type for an Accept header.
+
+    JSON is the default; another offered type is chosen only when the client
+    asks for it with at least the quality it gives JSON (ties go to the first
+    listed).
+    """
+    if not accept:
+        return API.MediaTypes.JSON
+    if msgpack is None:
+        offered = [media_type for media_type in offered if media_type != API.MediaTypes.MSGPACK]
+
+    best_type, best_quality = API.MediaTypes.JSON, 0.0
+    for entry in accept.split(','):
+        media_range, *params = [part.strip() for part in entry.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if media_range in API.MediaTypes.MSGPACK_ALIASES:
+            candidate = API.MediaTypes.MSGPACK
+        elif media_range in API.MediaTypes.NDJSON_ALIASES:
+            candidate = API.MediaTypes.NDJSON
+        elif media_range in (API.MediaTypes.JSON, '*/*', 'application/*'):
+            candidate = API.MediaTypes.JSON
+        else:
+            continue
+        if candidate in offered and quality > best_quality:
+            best_type, best_quality = candidate, quality
+    return best_type
+
+
+def encode_ndjson(rows: Iterable[Sequence[Any]], columns: Sequence[str]) -> bytes:
+    """Encode database rows as newline-delimited JSON objects."""
+    return b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+async def stream_ndjson_rows(
+    request: Request,
+    conn: sqlite3.Connection,
+    cursor: sqlite3.Cursor,
+    columns: Sequence[str],
+    first_rows: List[Sequence[Any]],
+    fetch_size: int
+) -> AsyncIterator[bytes]:
+    """Stream the rows of an executed query as NDJSON, one chunk per fetch.
+
+    Only ``fetch_size`` rows are held at a time, and each fetch runs in the
+    thread pool so reading the next chunk does not block the event loop (the
+    connection must be opened with ``check_same_thread=False``). The
+    connection is closed when the cursor is exhausted, when the client
+    disconnects, or when the response is cancelled.
+    """
+    try:
+        rows = first_rows
+        while rows:
+            yield encode_ndjson(rows, columns)
+            if await request.is_disconnected():
+                break
+            rows = await run_in_threadpool(cursor.fetchmany, fetch_size)
+    finally:
+        conn.close()
+
+
+def stream_ndjson_response(
+    request: Request,
+    conn: sqlite3.Connection,
+    cursor: sqlite3.Cursor,
+    columns: Sequence[str],
+    first_rows: List[Sequence[Any]],
+    fetch_size: int,
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """Respond with the rows of an executed query streamed as NDJSON.
+
+    The response owns the connection: besides the stream closing it (see
+    ``stream_ndjson_rows``), a background task closes it once the response
+    is sent, so it is not left open if the stream never starts.
+    """
+    return StreamingResponse(
+        stream_ndjson_rows(request, conn, cursor, columns, first_rows, fetch_size),
+        media_type=API.MediaTypes.NDJSON,
+        headers=headers,
+        background=BackgroundTask(conn.close)
+    )
+
+
+def format_sse(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> bytes:
+    """Encode one Server-Sent Events message with a JSON data line."""
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    if event_id:
+        lines.append(f"id: {event_id}")
+    return ("\n".join(lines) + "\n").encode() + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def pack_column(values: Iterable[int], dtype: str) -> bytes:
+    """Pack an integer column into a little-endian buffer."""
+    return np.asarray(values, dtype=dtype).tobytes()
+
+
+def pack_columns(columns: Dict[str, Iterable[int]], dtypes: Dict[str, str]) -> Dict[str, Any]:
+    """Pack integer columns and describe their dtypes for the client."""
+    return {
+        "dtypes": dtypes,
+        "columns": {name: pack_column(values, dtypes[name]) for name, values in columns.items()}
+    }
+
+
+def pack_rows(rows: Sequence[Sequence[Any]], columns: Sequence[str], dtypes: Dict[str, str]) -> Dict[str, Any]:
+    """Transpose database rows into columns without building an object per row.
+
+    The integer columns named in ``dtypes`` are packed as with ``pack_columns``;
+    the other columns are sent as plain arrays.
+    """
+    values = dict(zip(columns, zip(*rows))) if rows else {name: () for name in columns}
+    payload = pack_columns({name: values[name] for name in dtypes}, dtypes)
+    payload["columns"].update({name: list(column) for name, column in values.items() if name not in dtypes})
+    return payload
+
+
+def encode_rows(
+    rows: Sequence[Sequence[Any]],
+    columns: Sequence[str],
+    dtypes: Dict[str, str],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Respond with database rows in a negotiated media type.
+
+    MessagePack bodies are columnar (see ``pack_rows``) and NDJSON bodies have
+    one object per line. JSON bodies stay an array of objects built from the
+    rows: orjson encodes such a list in one pass, which is faster than
+    encoding the rows one at a time.
+    """
+    if media_type == API.MediaTypes.MSGPACK:
+        return MessagePackResponse({"count": len(rows), **pack_rows(rows, columns, dtypes)}, headers=headers)
+    if media_type == API.MediaTypes.NDJSON:
+        return Response(encode_ndjson(rows, columns), media_type=API.MediaTypes.NDJSON, headers=headers)
+    return FastJSONResponse([dict(zip(columns, row)) for row in rows], headers=headers)
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 from ...models.venue import Venue
 from ...models.game import Game
 from ...models.simulation import Simulation
+from ...constants import Performance
 
 
 class VenueResponse(BaseModel):
@@ -35,6 +36,36 @@ class GameAnalysisResponse(BaseModel):
     total_simulations: int
 
 
+class GameAnalysisSummaryResponse(BaseModel):
+    """Game analysis without per-run simulations."""
+    game: GameResponse
+    home_win_probability: float
+    total_simulations: int
+
+
+class GameOverviewItem(GameResponse):
+    """Game with its precomputed win probability and tie rate."""
+    home_win_probability: float
+    tie_rate: float
+    total_simulations: int
+
+
+class GameOverviewResponse(BaseModel):
+    """Dashboard overview of every game."""
+    games: List[GameOverviewItem]
+
+
+class GameAnalysisBatchRequest(BaseModel):
+    """Batch game analysis request model."""
+    ids: List[int] = Field(..., min_length=1, max_length=Performance.QueryLimits.MAX_BATCH_SIZE)
+
+
+class GameAnalysisBatchResponse(BaseModel):
+    """Batch game analysis API response model."""
+    results: List[GameAnalysisSummaryResponse]
+    missing: List[int]
+
+
 class HistogramDataResponse(BaseModel):
     """Histogram data API response model."""
     home_team: str
@@ -44,6 +75,28 @@ class HistogramDataResponse(BaseModel):
     score_range: tuple[int, int]
 
 
+class HistogramBinsResponse(BaseModel):
+    """Binned histogram (version 2) API response model."""
+    version: int
+    home_team: str
+    away_team: str
+    bin_size: int
+    bin_start: int
+    home_counts: List[int]
+    away_counts: List[int]
+    home_total: int
+    away_total: int
+    score_range: Dict[str, int]
+
+
+class GameBundleResponse(BaseModel):
+    """Game info, analysis aggregates and histogram bins in one response."""
+    game: GameResponse
+    home_win_probability: float
+    total_simulations: int
+    histogram: HistogramBinsResponse
+
+
 class TeamSimulationResponse(BaseModel):
     """Team simulation API response model."""
     team_id: int
@@ -75,6 +128,93 @@ class DataStatusResponse(BaseModel):
     tables_info: Dict[str, Dict[str, Any]]
 
 
+class CoalescingStatsResponse(BaseModel):
+    """Request coalescing statistics response model."""
+    executed: int
+    coalesced: int
+    in_flight: int
+
+
+class CacheStatsResponse(BaseModel):
+    """Result cache statistics response model."""
+    size: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class ProfileSummary(BaseModel):
+    """Stored request profile summary."""
+    id: str
+    method: str
+    path: str
+    started_at: float
+    duration_ms: Optional[float] = None
+    queries: int
+
+
+class ProfileListResponse(BaseModel):
+    """Stored request profiles, newest first."""
+    profiles: List[ProfileSummary]
+
+
+class SlowQueryStatement(BaseModel):
+    """Timings of one distinct SQL statement."""
+    sql: str
+    operation: str  # function that ran the statement
+    count: int
+    slow_count: int  # runs at or over the slow-query threshold
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    params: Optional[Any] = None  # parameter types of the slowest run
+    plan: Optional[List[str]] = None  # EXPLAIN QUERY PLAN, once the statement was slow
+
+
+class SlowQueryListResponse(BaseModel):
+    """Slowest SQL statements, slowest first."""
+    threshold_ms: float
+    untracked: int
+    statements: List[SlowQueryStatement]
+
+
+class TraceSummary(BaseModel):
+    """Buffered request trace summary."""
+    id: str
+    method: str
+    path: str
+    route: Optional[str] = None
+    status_code: Optional[int] = None
+    started_at: float
+    duration_ms: float
+    span_count: int
+    breakdown: Dict[str, float]  # milliseconds per span kind
+
+
+class TraceListResponse(BaseModel):
+    """Slowest buffered request traces, slowest first."""
+    traces: List[TraceSummary]
+
+
+class TraceSpan(BaseModel):
+    """One span of a request trace."""
+    id: int
+    parent_id: Optional[int] = None
+    name: str
+    kind: str
+    start_ms: float  # offset from the start of the request
+    duration_ms: float
+    attributes: Dict[str, Any]
+
+
+class TraceResponse(TraceSummary):
+    """Request trace with all of its spans."""
+    dropped_spans: int
+    spans: List[TraceSpan]
+
+
 class APIInfoResponse(BaseModel):
     """API info response model."""
     message: str
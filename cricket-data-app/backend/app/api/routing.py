@@ -0,0 +1,19 @@
+from typing import Callable
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from ..constants import Performance
+from ..monitoring.tracing import span
+
+
+class TracedRoute(APIRoute):
+    """Route whose handler (dependencies, endpoint and response encoding) is an ``endpoint`` span."""
+    
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        name = self.name
+        
+        async def traced_handler(request: Request) -> Response:
+            with span(name, Performance.Tracing.Kinds.ENDPOINT, route=self.path):
+                return await handler(request)
+        
+        return traced_handler
@@ -13,7 +13,7 @@ from pathlib import Path
 
 # Import constants for default values and validation
 from app.constants import (
-    API, Database, FilePaths, validate_environment
+    API, Database, FilePaths, Logging, Performance, validate_environment
 )
 
 class Settings(BaseSettings):
@@ -47,6 +47,46 @@ class Settings(BaseSettings):
     venues_csv_file: str = Field(default=FilePaths.CSVFiles.VENUES, env="VENUES_CSV_FILE")
     simulations_csv_file: str = Field(default=FilePaths.CSVFiles.SIMULATIONS, env="SIMULATIONS_CSV_FILE")
     
+    # Cache Settings using constants
+    warmup_on_startup: bool = Field(default=Performance.Cache.WARMUP_ON_STARTUP, env="WARMUP_ON_STARTUP")
+    warmup_workers: int = Field(default=Performance.Cache.WARMUP_WORKERS, env="WARMUP_WORKERS")
+    persistent_cache_enabled: bool = Field(
+        default=Performance.Cache.PERSISTENT_CACHE_ENABLED,
+        env="PERSISTENT_CACHE_ENABLED"
+    )
+    cache_max_bytes: int = Field(default=Performance.Cache.MAX_CACHE_BYTES, ge=0, env="CACHE_MAX_BYTES")
+    
+    # Monitoring Settings using constants
+    metrics_enabled: bool = Field(default=Performance.Metrics.ENABLED, env="METRICS_ENABLED")
+    profiling_enabled: bool = Field(default=Performance.Profiling.ENABLED, env="PROFILING_ENABLED")
+    slow_query_log_enabled: bool = Field(default=Performance.SlowQueries.ENABLED, env="SLOW_QUERY_LOG_ENABLED")
+    slow_query_threshold_ms: float = Field(
+        default=Performance.SlowQueries.THRESHOLD_MS,
+        ge=0.0,
+        env="SLOW_QUERY_THRESHOLD_MS"
+    )
+    tracing_enabled: bool = Field(default=Performance.Tracing.ENABLED, env="TRACING_ENABLED")
+    tracing_sample_rate: float = Field(
+        default=Performance.Tracing.SAMPLE_RATE,
+        ge=0.0,
+        le=1.0,
+        env="TRACING_SAMPLE_RATE"
+    )
+    
+    # Logging Settings using constants
+    log_level: str = Field(default=Logging.Pipeline.DEFAULT_LEVEL, env="LOG_LEVEL")
+    log_file: str = Field(default=Logging.Pipeline.DEFAULT_FILE, env="LOG_FILE")
+    log_format: str = Field(default=Logging.Pipeline.TEXT, env="LOG_FORMAT")
+    log_max_bytes: int = Field(default=Logging.Pipeline.MAX_BYTES, env="LOG_MAX_BYTES")
+    log_backup_count: int = Field(default=Logging.Pipeline.BACKUP_COUNT, env="LOG_BACKUP_COUNT")
+    access_log_sample_rate: float = Field(
+        default=Logging.Pipeline.ACCESS_LOG_SAMPLE_RATE,
+        ge=0.0,
+        le=1.0,
+        env="ACCESS_LOG_SAMPLE_RATE"
+    )
+    log_request_headers: bool = Field(default=False, env="LOG_REQUEST_HEADERS")  # at DEBUG, never in production
+    
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
@@ -62,6 +102,14 @@ class Settings(BaseSettings):
             raise ValueError(f'Environment must be one of: {API.Environments.VALID_ENVIRONMENTS}')
         return v.lower()
     
+    @field_validator('log_format')
+    @classmethod
+    def validate_log_format(cls, v):
+        """Validate log format is one of allowed values using constants"""
+        if v.lower() not in Logging.Pipeline.VALID_FORMATS:
+            raise ValueError(f'Log format must be one of: {Logging.Pipeline.VALID_FORMATS}')
+        return v.lower()
+    
     @field_validator('database_path')
     @classmethod
     def validate_database_path(cls, v):
@@ -107,6 +155,8 @@ def get_environment_settings() -> Settings:
         settings.api_host = "0.0.0.0"  # Accept connections from any host
         settings.database_echo = False
         settings.cors_allowed_origins = API.CORS.DEFAULT_ORIGINS_PROD
+        settings.log_request_headers = False
+        settings.profiling_enabled = False
     else:  # development (default)
         # Development overrides using constants
         settings.api_debug = True
@@ -19,6 +19,8 @@ class ErrorMessages:
     GAME_NOT_FOUND = "Game not found"
     SIMULATION_DATA_NOT_FOUND = "Simulation data not found for one or both teams"
     NO_SIMULATIONS_FOR_TEAM = "No simulations found for this team"
+    PROFILE_NOT_FOUND = "Profile not found"
+    TRACE_NOT_FOUND = "Trace not found"
     DATABASE_ERROR = "Database error occurred"
     SERVICE_UNAVAILABLE = "Service unavailable: {error}"
     DEBUG_ERROR = "Debug error: {error}"
@@ -49,6 +51,8 @@ class Database:
         VENUES = "venues"
         GAMES = "games"
         SIMULATIONS = "simulations"
+        RESULT_CACHE = "result_cache"
+        GAME_OVERVIEW = "game_overview"
     
     # Column names
     class Columns:
@@ -105,6 +109,96 @@ class Database:
             )
         """
         
+        CREATE_RESULT_CACHE_TABLE = """
+            CREATE TABLE IF NOT EXISTS result_cache (
+                endpoint TEXT NOT NULL,
+                game_id INTEGER NOT NULL,
+                data_fingerprint TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (endpoint, game_id, data_fingerprint)
+            )
+        """
+        
+        # Per-game win/tie counts, materialized when the CSV data is loaded
+        CREATE_GAME_OVERVIEW_TABLE = """
+            CREATE TABLE IF NOT EXISTS game_overview (
+                game_id INTEGER PRIMARY KEY,
+                home_team TEXT NOT NULL,
+                away_team TEXT NOT NULL,
+                date TEXT,
+                venue_id INTEGER,
+                venue_name TEXT,
+                total_simulations INTEGER NOT NULL,
+                home_wins INTEGER NOT NULL,
+                ties INTEGER NOT NULL
+            )
+        """
+        
+        DELETE_GAME_OVERVIEW = "DELETE FROM game_overview"
+        
+        # Pairs each game's home and away runs on simulation_run in SQLite
+        MATERIALIZE_GAME_OVERVIEW = """
+            INSERT OR REPLACE INTO game_overview
+                (game_id, home_team, away_team, date, venue_id, venue_name, total_simulations, home_wins, ties)
+            SELECT
+                g.id,
+                g.home_team,
+                g.away_team,
+                g.date,
+                g.venue_id,
+                v.venue_name,
+                COUNT(a.results),
+                COALESCE(SUM(h.results > a.results), 0),
+                COALESCE(SUM(h.results = a.results), 0)
+            FROM games g
+            LEFT JOIN venues v ON g.venue_id = v.venue_id
+            LEFT JOIN simulations h ON h.team = g.home_team
+            LEFT JOIN simulations a ON a.team = g.away_team AND a.simulation_run = h.simulation_run
+            GROUP BY g.id
+        """
+        
+        SELECT_GAME_OVERVIEW = """
+            SELECT
+                game_id,
+                home_team,
+                away_team,
+                date,
+                venue_id,
+                venue_name,
+                total_simulations,
+                home_wins,
+                ties
+            FROM game_overview
+            ORDER BY game_id
+        """
+        
+        # Persistent result cache
+        SELECT_RESULT_CACHE = """
+            SELECT payload FROM result_cache
+            WHERE endpoint = ? AND game_id = ? AND data_fingerprint = ?
+        """
+        
+        UPSERT_RESULT_CACHE = """
+            INSERT OR REPLACE INTO result_cache
+                (endpoint, game_id, data_fingerprint, payload, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """
+        
+        DELETE_STALE_RESULT_CACHE = "DELETE FROM result_cache WHERE data_fingerprint != ?"
+        
+        # Indexes for keyset pagination and list filters. Loading a CSV replaces
+        # its table, so these are recreated after every load.
+        CREATE_INDEXES = [
+            "CREATE INDEX IF NOT EXISTS idx_games_id ON games (id)",
+            "CREATE INDEX IF NOT EXISTS idx_games_home_team ON games (home_team, id)",
+            "CREATE INDEX IF NOT EXISTS idx_games_away_team ON games (away_team, id)",
+            "CREATE INDEX IF NOT EXISTS idx_games_venue_id ON games (venue_id, id)",
+            "CREATE INDEX IF NOT EXISTS idx_games_date ON games (date, id)",
+            "CREATE INDEX IF NOT EXISTS idx_venues_venue_id ON venues (venue_id)",
+            "CREATE INDEX IF NOT EXISTS idx_simulations_team_run ON simulations (team, simulation_run)",
+        ]
+        
         # Data selection
         SELECT_VENUES = "SELECT venue_id as id, venue_name as name FROM venues"
         
@@ -210,10 +304,51 @@ class API:
         ALLOWED_METHODS = ["*"]
         ALLOWED_HEADERS = ["*"]
     
+    # Response media types for content negotiation
+    class MediaTypes:
+        JSON = "application/json"
+        MSGPACK = "application/x-msgpack"
+        MSGPACK_ALIASES = ["application/x-msgpack", "application/msgpack", "application/vnd.msgpack"]
+        NDJSON = "application/x-ndjson"
+        NDJSON_ALIASES = ["application/x-ndjson", "application/ndjson", "application/jsonl"]
+        EVENT_STREAM = "text/event-stream"
+        PROMETHEUS = "text/plain; version=0.0.4"
+        PLAIN_TEXT = "text/plain; charset=utf-8"
+    
+    # Server-Sent Events names
+    class Events:
+        DATA_VERSION = "data-version"
+    
+    # Response headers
+    class Headers:
+        NEXT_CURSOR = "X-Next-Cursor"  # keyset cursor for the next page of a list
+        CONTENT_DISPOSITION = "Content-Disposition"
+    
+    # Little-endian dtypes of packed integer columns in binary responses
+    class BinaryDtypes:
+        SCORE = "<i2"  # scores are bounded by BusinessLogic.DataLimits.MAX_SCORE
+        INTEGER = "<i4"
+    
+    # Representations of /games/{id}/analysis
+    class AnalysisFormats:
+        ROWS = "rows"  # simulations as [{"home_score": x, "away_score": y}, ...]
+        COLUMNAR = "columnar"  # simulations as {"home_score": [...], "away_score": [...]}
+    
+    # Downloads from /debug/profiles/{id}
+    class ProfileFormats:
+        JSON = "json"  # samples, SQL statements and timings
+        FOLDED = "folded"  # collapsed stacks for flamegraph tools
+    
+    # Versions of /games/{id}/histogram-data
+    class HistogramVersions:
+        RAW = 1  # raw score lists plus per-score frequencies
+        BINNED = 2  # dense per-bin count arrays
+    
     # Response messages
     class ResponseMessages:
         API_RUNNING = "{title} is running"
         HEALTH_STATUS_HEALTHY = "healthy"
+        HEALTH_STATUS_WARMING_UP = "warming_up"
         DATABASE_CONNECTED = "connected"
 
 
@@ -330,6 +465,8 @@ class Logging:
         STARTUP_COMPLETE = "Application startup complete"
         HEALTH_CHECK_PASSED = "Health check passed"
         HEALTH_CHECK_FAILED = "Health check failed: {error}"
+        WARMUP_COMPLETE = "Warmed analysis cache for {count} games in {duration:.2f}s"
+        WARMUP_TRUNCATED = "Warmed the {count} most recent of {total} games; the rest exceed the cache budget ({max_bytes} bytes)"
     
     # Log levels
     class Levels:
@@ -338,6 +475,21 @@ class Logging:
         WARNING = "WARNING"
         ERROR = "ERROR"
         CRITICAL = "CRITICAL"
+    
+    # Queue-based log pipeline
+    class Pipeline:
+        DEFAULT_LEVEL = "INFO"
+        DEFAULT_FILE = "app.log"
+        TEXT = "text"
+        JSON = "json"
+        VALID_FORMATS = [TEXT, JSON]
+        TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        MAX_BYTES = 10 * 1024 * 1024  # rotate app.log at 10 MB
+        BACKUP_COUNT = 5
+        QUEUE_SIZE = 10000  # records waiting for the writer; newer ones are dropped when full
+        ACCESS_LOGGER = "app.access"
+        SLOW_QUERY_LOGGER = "app.slow_queries"
+        ACCESS_LOG_SAMPLE_RATE = 1.0  # share of successful requests logged; errors always are
 
 
 # ==============================================================================
@@ -373,11 +525,76 @@ class Performance:
         DEFAULT_RECORD_LIMIT = 1000
         MAX_RECORD_LIMIT = 10000
         PAGINATION_SIZE = 50
+        MAX_BATCH_SIZE = 500  # game IDs per batch request
+        STREAM_FETCH_SIZE = 1000  # rows read per fetchmany() when streaming
+    
+    # Prometheus metrics
+    class Metrics:
+        ENABLED = True
+        # Histogram upper bounds, in seconds
+        REQUEST_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+        QUERY_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+        RENDER_LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.25)
+        # Per-request database work
+        STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+        ROW_COUNT_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+        UNMATCHED_ROUTE = "unmatched"  # route label for requests that matched no route
+    
+    # On-demand request profiling (development and staging)
+    class Profiling:
+        ENABLED = False
+        TRIGGER_HEADER = "x-profile"  # send "X-Profile: 1" to profile a request
+        TRIGGER_QUERY_PARAM = "profile"  # or add ?profile=1
+        ID_HEADER = "X-Profile-Id"  # response header naming the stored profile
+        SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+        MAX_STACK_DEPTH = 64
+        MAX_STORED_PROFILES = 20
+    
+    # Slow-query log and per-statement statistics
+    class SlowQueries:
+        ENABLED = True
+        THRESHOLD_MS = 100.0  # statements at least this slow are logged with their plan
+        MAX_TRACKED_STATEMENTS = 500  # distinct statement texts kept in each thread's statistics
+        NORMALIZED_SQL_CACHE_SIZE = 1024  # raw statement texts whose normalized form is kept
+        DEFAULT_LIMIT = 20
+        MAX_LIMIT = 200
+    
+    # Local span tracing of sampled requests
+    class Tracing:
+        ENABLED = True
+        SAMPLE_RATE = 0.01  # fraction of requests traced
+        TRIGGER_HEADER = "x-trace"  # send "X-Trace: 1" to always trace a request
+        ID_HEADER = "X-Trace-Id"  # response header naming the stored trace
+        BUFFER_SIZE = 200  # finished traces kept in memory
+        MAX_SPANS = 2000  # spans kept per trace; later ones are counted as dropped
+        DEFAULT_SLOW_LIMIT = 20
+        MAX_SLOW_LIMIT = 200
+        
+        # Span kinds, summed per trace in its breakdown
+        class Kinds:
+            ROUTING = "routing"  # request time outside the endpoint handler
+            ENDPOINT = "endpoint"
+            SERVICE = "service"
+            REPOSITORY = "repository"
+            CONVERT = "convert"  # database rows to models
+            SQL = "sql"
+            SERIALIZE = "serialize"
+            INTERNAL = "internal"
+    
+    # Server-Sent Events
+    class Events:
+        SUBSCRIBER_QUEUE_SIZE = 16  # pending events kept per slow client
+        HEARTBEAT_INTERVAL = 15  # seconds between keep-alive comments
+        RETRY_MS = 5000  # reconnect delay suggested to clients
     
     # Cache settings
     class Cache:
         DEFAULT_TTL = 300  # 5 minutes
-        MAX_CACHE_SIZE = 1000
+        MAX_CACHE_BYTES = 256 * 1024 * 1024  # encoded payload bytes held in memory
+        WARMUP_ON_STARTUP = True
+        WARMUP_WORKERS = 4
+        PERSISTENT_CACHE_ENABLED = True
+        FINGERPRINT_CHUNK_SIZE = 1024 * 1024  # bytes read per hash update
     
     # Connection settings
     class Connection:
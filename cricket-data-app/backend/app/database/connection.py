@@ -1,9 +1,11 @@
 import sqlite3
 import asyncio
+import functools
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 from ..config import get_environment_settings
 from ..constants import Database, Logging
+from .instrumentation import InstrumentedConnection
 
 
 class DatabaseManager:
@@ -13,18 +15,21 @@ class DatabaseManager:
         self.config = get_environment_settings()
         self._connection: Optional[sqlite3.Connection] = None
     
-    def get_connection(self) -> sqlite3.Connection:
-        """Get a database connection."""
-        return sqlite3.connect(self.config.database_path)
+    def get_connection(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Get a database connection (instrumented, see ``instrumentation``)."""
+        return sqlite3.connect(
+            self.config.database_path, factory=InstrumentedConnection, check_same_thread=check_same_thread
+        )
     
     @asynccontextmanager
     async def get_async_connection(self) -> AsyncGenerator[sqlite3.Connection, None]:
         """Async context manager for database connections."""
         conn = None
         try:
-            # Run in thread pool to avoid blocking
+            # Run in thread pool to avoid blocking; the connection is then
+            # used from the event loop thread, one statement at a time
             conn = await asyncio.get_event_loop().run_in_executor(
-                None, self.get_connection
+                None, functools.partial(self.get_connection, check_same_thread=False)
             )
             conn.row_factory = sqlite3.Row  # Enable dict-like access
             yield conn
@@ -42,11 +47,25 @@ class DatabaseManager:
             cursor.execute(Database.Queries.CREATE_VENUES_TABLE)
             cursor.execute(Database.Queries.CREATE_GAMES_TABLE)
             cursor.execute(Database.Queries.CREATE_SIMULATIONS_TABLE)
+            cursor.execute(Database.Queries.CREATE_RESULT_CACHE_TABLE)
+            cursor.execute(Database.Queries.CREATE_GAME_OVERVIEW_TABLE)
             
             conn.commit()
             print(Logging.Messages.DATABASE_INITIALIZED)
         finally:
             conn.close()
+        
+        self.create_indexes()
+    
+    def create_indexes(self) -> None:
+        """Create the indexes used by paginated and filtered list queries."""
+        conn = self.get_connection()
+        try:
+            for statement in Database.Queries.CREATE_INDEXES:
+                conn.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
 
 
 # Singleton instance
@@ -0,0 +1,167 @@
+"""Timing hook around SQLite statement execution.
+
+``DatabaseManager`` opens every connection with ``InstrumentedConnection``,
+so each statement run through ``cursor().execute``/``conn.execute`` (raw
+endpoint SQL, repositories, services) is timed and reported to the
+registered ``QueryObserver``s, as is the number of rows each fetch returns.
+With no observers registered the hook only costs one list check per call.
+"""
+
+import sqlite3
+import sys
+import time
+from typing import Any, List, Optional
+
+
+class QueryEvent:
+    """One executed statement.
+
+    ``operation`` is looked up on the call stack the first time an observer
+    reads it, so statements whose observers do not need it skip the frame
+    walk. It can only be read while the observers are being notified.
+    """
+
+    __slots__ = ("sql", "params", "duration", "connection", "_depth", "_operation")
+
+    def __init__(
+        self, sql: str, params: Any, duration: float,
+        connection: Optional[sqlite3.Connection] = None, depth: int = 0
+    ):
+        self.sql = sql
+        self.params = params
+        self.duration = duration  # seconds
+        self.connection = connection  # connection the statement ran on
+        self._depth = depth  # frames between _report and the calling function
+        self._operation: Optional[str] = None
+
+    @property
+    def operation(self) -> str:
+        """Qualified name of the calling function."""
+        if self._operation is None:
+            frame = sys._getframe(1)
+            while frame.f_code is not _report.__code__:
+                frame = frame.f_back
+            for _ in range(self._depth):
+                frame = frame.f_back
+            self._operation = frame.f_code.co_qualname
+        return self._operation
+
+    def params_shape(self) -> Any:
+        """Parameter types, not values, so logs and artifacts do not leak data."""
+        if self.params is None:
+            return None
+        if isinstance(self.params, dict):
+            return {key: type(value).__name__ for key, value in self.params.items()}
+        return [type(value).__name__ for value in self.params]
+
+
+class QueryObserver:
+    """Receives statement events; override the hooks that are needed."""
+
+    def on_query(self, event: QueryEvent) -> None:
+        """Called after each statement executes (also when it fails)."""
+
+    def on_rows_fetched(self, count: int) -> None:
+        """Called after each fetchone/fetchmany/fetchall with the rows returned."""
+
+    def on_connection_opened(self) -> None:
+        """Called when a connection is opened."""
+
+    def on_connection_closed(self) -> None:
+        """Called when a connection is closed."""
+
+
+_observers: List[QueryObserver] = []
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Start reporting statements to ``observer``."""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    """Stop reporting statements to ``observer``."""
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _report(connection: sqlite3.Connection, sql: str, params: Any, depth: int, start: float) -> None:
+    event = QueryEvent(sql, params, time.perf_counter() - start, connection, depth + 1)
+    for observer in _observers:
+        observer.on_query(event)
+
+
+def _report_rows(count: int) -> None:
+    for observer in _observers:
+        observer.on_rows_fetched(count)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement and the rows fetched to the query observers.
+
+    Rows read by iterating the cursor directly are not counted; the
+    application fetches with fetchone/fetchmany/fetchall.
+    """
+
+    def execute(self, sql: str, parameters: Any = (), _depth: int = 1):
+        if not _observers:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _report(self.connection, sql, parameters, _depth, start)
+
+    def executemany(self, sql: str, seq_of_parameters: Any, _depth: int = 1):
+        if not _observers:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _report(self.connection, sql, None, _depth, start)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if _observers and row is not None:
+            _report_rows(1)
+        return row
+
+    def fetchmany(self, size: int = -1):
+        rows = super().fetchmany(self.arraysize if size == -1 else size)
+        if _observers:
+            _report_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if _observers:
+            _report_rows(len(rows))
+        return rows
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors and shortcut methods are instrumented."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._closed = False
+        for observer in _observers:
+            observer.on_connection_opened()
+
+    def cursor(self, factory: Optional[type] = None):
+        return super().cursor(factory or InstrumentedCursor)
+
+    def execute(self, sql: str, parameters: Any = ()):
+        return self.cursor().execute(sql, parameters, _depth=2)
+
+    def executemany(self, sql: str, seq_of_parameters: Any):
+        return self.cursor().executemany(sql, seq_of_parameters, _depth=2)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            for observer in _observers:
+                observer.on_connection_closed()
+        super().close()
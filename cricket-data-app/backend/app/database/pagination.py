@@ -0,0 +1,20 @@
+"""Helpers for keyset (cursor) pagination over integer primary keys."""
+
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+
+def where_clause(conditions: Sequence[str]) -> str:
+    """Join SQL conditions into a WHERE clause (empty when there are none)."""
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def split_page(rows: List[Any], limit: int, key: Union[int, str] = 0) -> Tuple[List[Any], Optional[int]]:
+    """Trim rows fetched with ``LIMIT limit + 1`` to one page.
+
+    Returns the page and the cursor for the next one: the key of the last row
+    on the page (column ``key``), or None when there are no more rows.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, page[-1][key]
@@ -1,9 +1,14 @@
 import sqlite3
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, TypeVar, Generic
-from ...models.base import DomainEntity, Repository
+from ...models.base import Repository
+from ...constants import Performance
+from ..pagination import where_clause
+from ..row_mapping import ColumnConverter, RowMapper, mapper_cache
+from ...monitoring.tracing import Kinds, span, traced
 
-T = TypeVar('T', bound=DomainEntity)
+# Domain models, or lightweight records for per-run data (see models.records)
+T = TypeVar('T')
 
 
 class SQLiteRepository(Repository, Generic[T], ABC):
@@ -24,40 +29,88 @@ class SQLiteRepository(Repository, Generic[T], ABC):
         """Model class for this repository."""
         pass
     
+    @property
+    def primary_key(self) -> str:
+        """Integer primary key column, used for lookups and keyset pagination."""
+        return "id"
+    
+    @property
     @abstractmethod
-    def _row_to_model(self, row: sqlite3.Row) -> T:
-        """Convert database row to model instance."""
+    def field_columns(self) -> Dict[str, str]:
+        """Model field -> result column that fills it (missing columns give None)."""
         pass
     
+    @property
+    def column_converters(self) -> Dict[str, ColumnConverter]:
+        """Model field -> converter applied to the field's whole column."""
+        return {}
+    
+    def _mapper(self, cursor: sqlite3.Cursor) -> RowMapper:
+        """The mapper for the cursor's result shape, compiled on first use."""
+        column_names = tuple(column[0] for column in cursor.description)
+        return mapper_cache.get(
+            type(self),
+            column_names,
+            lambda: RowMapper(column_names, self.field_columns, self.model_class, self.column_converters)
+        )
+    
+    def _fetch_models(self, cursor: sqlite3.Cursor) -> List[T]:
+        """Fetch every remaining row of an executed query as model instances."""
+        # Plain tuples: the mapper reads columns by position
+        cursor.row_factory = None
+        rows = cursor.fetchall()
+        with span(f"{type(self).__name__}._fetch_models", Kinds.CONVERT, rows=len(rows)):
+            return self._mapper(cursor).map_rows(rows)
+    
+    def _fetch_model(self, cursor: sqlite3.Cursor) -> Optional[T]:
+        """Fetch the next row of an executed query as a model instance, or None."""
+        cursor.row_factory = None
+        return self._mapper(cursor).map_row(cursor.fetchone())
+    
+    @traced(Kinds.REPOSITORY)
     async def find_by_id(self, entity_id: int) -> Optional[T]:
         """Find entity by ID."""
         async with self.db_manager.get_async_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                f"SELECT * FROM {self.table_name} WHERE id = ?",
+                f"SELECT * FROM {self.table_name} WHERE {self.primary_key} = ?",
                 (entity_id,)
             )
-            row = cursor.fetchone()
-            return self._row_to_model(row) if row else None
+            return self._fetch_model(cursor)
     
-    async def find_all(self) -> List[T]:
-        """Find all entities."""
+    @traced(Kinds.REPOSITORY)
+    async def find_all(
+        self,
+        limit: int = Performance.QueryLimits.DEFAULT_RECORD_LIMIT,
+        after: Optional[int] = None
+    ) -> List[T]:
+        """Find up to ``limit`` entities ordered by primary key, after key ``after``."""
+        limit = min(limit, Performance.QueryLimits.MAX_RECORD_LIMIT)
+        conditions, params = [], []
+        if after is not None:
+            conditions.append(f"{self.primary_key} > ?")
+            params.append(after)
+        
         async with self.db_manager.get_async_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(f"SELECT * FROM {self.table_name}")
-            rows = cursor.fetchall()
-            return [self._row_to_model(row) for row in rows]
+            cursor.execute(
+                f"SELECT * FROM {self.table_name} {where_clause(conditions)} "
+                f"ORDER BY {self.primary_key} LIMIT ?",
+                (*params, limit)
+            )
+            return self._fetch_models(cursor)
     
     async def save(self, entity: T) -> T:
         """Save entity (not implemented in base - override in concrete classes)."""
         raise NotImplementedError("Save method must be implemented by concrete repositories")
     
+    @traced(Kinds.REPOSITORY)
     async def delete(self, entity_id: int) -> bool:
         """Delete entity by ID."""
         async with self.db_manager.get_async_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                f"DELETE FROM {self.table_name} WHERE id = ?",
+                f"DELETE FROM {self.table_name} WHERE {self.primary_key} = ?",
                 (entity_id,)
             )
             conn.commit()
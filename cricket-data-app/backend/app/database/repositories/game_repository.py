@@ -1,10 +1,11 @@
-import sqlite3
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
 from ..connection import db_manager
 from ...models.game import Game
-from ...constants import Database
+from ...constants import Database, Performance
+from ..pagination import where_clause
+from ..row_mapping import ColumnConverter, parse_dates
 from .base import SQLiteRepository
+from ...monitoring.tracing import Kinds, traced
 
 
 class GameRepository(SQLiteRepository[Game]):
@@ -21,24 +22,22 @@ class GameRepository(SQLiteRepository[Game]):
     def model_class(self) -> type[Game]:
         return Game
     
-    def _row_to_model(self, row: sqlite3.Row) -> Game:
-        """Convert database row to Game model."""
-        game_date = None
-        if row.get(Database.Columns.DATE):
-            try:
-                game_date = datetime.strptime(row[Database.Columns.DATE], "%Y-%m-%d").date()
-            except (ValueError, TypeError):
-                pass
-        
-        return Game(
-            id=row[Database.Columns.GAME_ID],
-            home_team=row[Database.Columns.HOME_TEAM],
-            away_team=row[Database.Columns.AWAY_TEAM],
-            game_date=game_date,
-            venue_id=row[Database.Columns.GAME_VENUE_ID],
-            venue_name=row.get(Database.Columns.VENUE_NAME)  # From JOIN
-        )
+    @property
+    def field_columns(self) -> Dict[str, str]:
+        return {
+            "id": Database.Columns.GAME_ID,
+            "home_team": Database.Columns.HOME_TEAM,
+            "away_team": Database.Columns.AWAY_TEAM,
+            "game_date": Database.Columns.DATE,
+            "venue_id": Database.Columns.GAME_VENUE_ID,
+            "venue_name": Database.Columns.VENUE_NAME  # From JOIN
+        }
     
+    @property
+    def column_converters(self) -> Dict[str, ColumnConverter]:
+        return {"game_date": parse_dates}
+    
+    @traced(Kinds.REPOSITORY)
     async def find_with_venue(self, game_id: int) -> Optional[Game]:
         """Find game with venue information."""
         async with self.db_manager.get_async_connection() as conn:
@@ -49,22 +48,34 @@ class GameRepository(SQLiteRepository[Game]):
                 JOIN {Database.Tables.VENUES} v ON g.{Database.Columns.GAME_VENUE_ID} = v.{Database.Columns.VENUE_ID}
                 WHERE g.{Database.Columns.GAME_ID} = ?
             """, (game_id,))
-            row = cursor.fetchone()
-            return self._row_to_model(row) if row else None
+            return self._fetch_model(cursor)
     
-    async def find_all_with_venues(self) -> List[Game]:
-        """Find all games with venue information."""
+    @traced(Kinds.REPOSITORY)
+    async def find_all_with_venues(
+        self,
+        limit: int = Performance.QueryLimits.DEFAULT_RECORD_LIMIT,
+        after: Optional[int] = None
+    ) -> List[Game]:
+        """Find up to ``limit`` games with venue information, after game ID ``after``."""
+        limit = min(limit, Performance.QueryLimits.MAX_RECORD_LIMIT)
+        conditions, params = [], []
+        if after is not None:
+            conditions.append(f"g.{Database.Columns.GAME_ID} > ?")
+            params.append(after)
+        
         async with self.db_manager.get_async_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(f"""
                 SELECT g.*, v.{Database.Columns.VENUE_NAME}
                 FROM {Database.Tables.GAMES} g
                 JOIN {Database.Tables.VENUES} v ON g.{Database.Columns.GAME_VENUE_ID} = v.{Database.Columns.VENUE_ID}
+                {where_clause(conditions)}
                 ORDER BY g.{Database.Columns.GAME_ID}
-            """)
-            rows = cursor.fetchall()
-            return [self._row_to_model(row) for row in rows]
+                LIMIT ?
+            """, (*params, limit))
+            return self._fetch_models(cursor)
     
+    @traced(Kinds.REPOSITORY)
     async def find_by_teams(self, home_team: str, away_team: str) -> List[Game]:
         """Find games by team names."""
         async with self.db_manager.get_async_connection() as conn:
@@ -75,6 +86,5 @@ class GameRepository(SQLiteRepository[Game]):
                 JOIN {Database.Tables.VENUES} v ON g.{Database.Columns.GAME_VENUE_ID} = v.{Database.Columns.VENUE_ID}
                 WHERE g.{Database.Columns.HOME_TEAM} = ? AND g.{Database.Columns.AWAY_TEAM} = ?
             """, (home_team, away_team))
-            rows = cursor.fetchall()
-            return [self._row_to_model(row) for row in rows]
+            return self._fetch_models(cursor)
 
@@ -1,14 +1,18 @@
-import sqlite3
-from typing import List, Dict
+from typing import Dict, List
 from collections import Counter
 from ..connection import db_manager
-from ...models.simulation import TeamSimulation, Simulation
+from ...models.records import ScorePair, SimulationRecord
 from ...constants import Database
 from .base import SQLiteRepository
+from ...monitoring.tracing import Kinds, span, traced
 
 
-class SimulationRepository(SQLiteRepository[TeamSimulation]):
-    """Repository for simulation data access."""
+class SimulationRepository(SQLiteRepository[SimulationRecord]):
+    """Repository for simulation data access.
+    
+    Returns ``SimulationRecord``/``ScorePair`` records and plain score
+    columns rather than Pydantic models; see ``models.records``.
+    """
     
     def __init__(self):
         super().__init__(db_manager)
@@ -18,19 +22,20 @@ class SimulationRepository(SQLiteRepository[TeamSimulation]):
         return Database.Tables.SIMULATIONS
     
     @property
-    def model_class(self) -> type[TeamSimulation]:
-        return TeamSimulation
+    def model_class(self) -> type[SimulationRecord]:
+        return SimulationRecord
     
-    def _row_to_model(self, row: sqlite3.Row) -> TeamSimulation:
-        """Convert database row to TeamSimulation model."""
-        return TeamSimulation(
-            team_id=row[Database.Columns.TEAM_ID],
-            team=row[Database.Columns.TEAM],
-            simulation_run=row[Database.Columns.SIMULATION_RUN],
-            results=row[Database.Columns.RESULTS]
-        )
+    @property
+    def field_columns(self) -> Dict[str, str]:
+        return {
+            "team_id": Database.Columns.TEAM_ID,
+            "team": Database.Columns.TEAM,
+            "simulation_run": Database.Columns.SIMULATION_RUN,
+            "results": Database.Columns.RESULTS
+        }
     
-    async def find_by_team(self, team_name: str) -> List[TeamSimulation]:
+    @traced(Kinds.REPOSITORY)
+    async def find_by_team(self, team_name: str) -> List[SimulationRecord]:
         """Find simulations by team name."""
         async with self.db_manager.get_async_connection() as conn:
             cursor = conn.cursor()
@@ -38,44 +43,37 @@ class SimulationRepository(SQLiteRepository[TeamSimulation]):
                 f"SELECT * FROM {self.table_name} WHERE {Database.Columns.TEAM} = ? ORDER BY {Database.Columns.SIMULATION_RUN}",
                 (team_name,)
             )
-            rows = cursor.fetchall()
-            return [self._row_to_model(row) for row in rows]
+            return self._fetch_models(cursor)
     
-    async def get_game_simulations(self, home_team: str, away_team: str) -> List[Simulation]:
-        """Get paired simulations for a game."""
+    @traced(Kinds.REPOSITORY)
+    async def get_game_simulations(self, home_team: str, away_team: str) -> List[ScorePair]:
+        """Get paired home and away scores for every run both teams simulated."""
         async with self.db_manager.get_async_connection() as conn:
             cursor = conn.cursor()
-            
-            # Get simulation runs that exist for both teams
             cursor.execute(f"""
-                SELECT DISTINCT h.{Database.Columns.SIMULATION_RUN}
+                SELECT h.{Database.Columns.RESULTS}, a.{Database.Columns.RESULTS}
                 FROM {self.table_name} h
-                JOIN {self.table_name} a ON h.{Database.Columns.SIMULATION_RUN} = a.{Database.Columns.SIMULATION_RUN}
+                JOIN {self.table_name} a ON a.{Database.Columns.SIMULATION_RUN} = h.{Database.Columns.SIMULATION_RUN}
                 WHERE h.{Database.Columns.TEAM} = ? AND a.{Database.Columns.TEAM} = ?
                 ORDER BY h.{Database.Columns.SIMULATION_RUN}
             """, (home_team, away_team))
-            
-            simulation_runs = [row[0] for row in cursor.fetchall()]
-            
-            simulations = []
-            for run in simulation_runs:
-                # Get scores for both teams in this simulation run
-                cursor.execute(f"""
-                    SELECT {Database.Columns.TEAM}, {Database.Columns.RESULTS}
-                    FROM {self.table_name}
-                    WHERE {Database.Columns.SIMULATION_RUN} = ? 
-                    AND {Database.Columns.TEAM} IN (?, ?)
-                """, (run, home_team, away_team))
-                
-                scores = dict(cursor.fetchall())
-                if home_team in scores and away_team in scores:
-                    simulations.append(Simulation(
-                        home_score=scores[home_team],
-                        away_score=scores[away_team]
-                    ))
-            
-            return simulations
+            rows = cursor.fetchall()
+            with span(f"{type(self).__name__}.get_game_simulations", Kinds.CONVERT, rows=len(rows)):
+                return list(map(ScorePair._make, rows))
+    
+    @traced(Kinds.REPOSITORY)
+    async def get_team_scores(self, team_name: str) -> List[int]:
+        """Scores of a team's simulation runs, in run order, as a plain column."""
+        async with self.db_manager.get_async_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {Database.Columns.RESULTS} FROM {self.table_name} "
+                f"WHERE {Database.Columns.TEAM} = ? ORDER BY {Database.Columns.SIMULATION_RUN}",
+                (team_name,)
+            )
+            return [row[0] for row in cursor.fetchall()]
     
+    @traced(Kinds.REPOSITORY)
     async def get_team_names(self) -> List[str]:
         """Get all unique team names."""
         async with self.db_manager.get_async_connection() as conn:
@@ -83,7 +81,14 @@ class SimulationRepository(SQLiteRepository[TeamSimulation]):
             cursor.execute(f"SELECT DISTINCT {Database.Columns.TEAM} FROM {self.table_name}")
             return [row[0] for row in cursor.fetchall()]
     
+    @traced(Kinds.REPOSITORY)
     async def get_score_distribution(self, team_name: str) -> Counter:
         """Get score distribution for a team."""
-        simulations = await self.find_by_team(team_name)
-        return Counter(sim.results for sim in simulations)
\ No newline at end of file
+        async with self.db_manager.get_async_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {Database.Columns.RESULTS}, COUNT(*) FROM {self.table_name} "
+                f"WHERE {Database.Columns.TEAM} = ? GROUP BY {Database.Columns.RESULTS}",
+                (team_name,)
+            )
+            return Counter(dict(cursor.fetchall()))
\ No newline at end of file
@@ -1,9 +1,9 @@
-import sqlite3
-from typing import List, Optional
+from typing import Dict, Optional
 from ..connection import db_manager
 from ...models.venue import Venue
 from ...constants import Database
 from .base import SQLiteRepository
+from ...monitoring.tracing import Kinds, traced
 
 
 class VenueRepository(SQLiteRepository[Venue]):
@@ -20,13 +20,18 @@ class VenueRepository(SQLiteRepository[Venue]):
     def model_class(self) -> type[Venue]:
         return Venue
     
-    def _row_to_model(self, row: sqlite3.Row) -> Venue:
-        """Convert database row to Venue model."""
-        return Venue(
-            id=row[Database.Columns.VENUE_ID],
-            name=row[Database.Columns.VENUE_NAME]
-        )
+    @property
+    def primary_key(self) -> str:
+        return Database.Columns.VENUE_ID
+    
+    @property
+    def field_columns(self) -> Dict[str, str]:
+        return {
+            "id": Database.Columns.VENUE_ID,
+            "name": Database.Columns.VENUE_NAME
+        }
     
+    @traced(Kinds.REPOSITORY)
     async def find_by_name(self, name: str) -> Optional[Venue]:
         """Find venue by name."""
         async with self.db_manager.get_async_connection() as conn:
@@ -35,5 +40,4 @@ class VenueRepository(SQLiteRepository[Venue]):
                 f"SELECT * FROM {self.table_name} WHERE {Database.Columns.VENUE_NAME} = ?",
                 (name,)
             )
-            row = cursor.fetchone()
-            return self._row_to_model(row) if row else None
+            return self._fetch_model(cursor)
@@ -0,0 +1,72 @@
+"""Persistent store of computed API payloads in the ``result_cache`` table.
+
+Stores the JSON-encoded analysis, histogram and bundle payloads, keyed by
+endpoint, game ID and data fingerprint. The fingerprint is the SHA-256 of
+the source CSV files (``DataLoaderService.compute_data_fingerprint``), so a
+payload is only reused while the data it was computed from is unchanged.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Optional
+from ..constants import Database
+
+logger = logging.getLogger(__name__)
+
+
+class ResultStore:
+    """Persistent store of JSON-encoded API payloads in a SQLite side table.
+
+    Entries are keyed by ``(endpoint, game_id, data_fingerprint)`` so they are
+    shared between worker processes and survive restarts, while a change to
+    the source CSV files makes every older entry unreachable.
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def get(self, endpoint: str, game_id: int, fingerprint: str) -> Optional[bytes]:
+        """Get a stored payload, or None if missing or unreadable."""
+        try:
+            conn = self.db_manager.get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(Database.Queries.SELECT_RESULT_CACHE, (endpoint, game_id, fingerprint))
+                row = cursor.fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Result store read failed for {endpoint}/{game_id}: {e}")
+            return None
+        return bytes(row[0]) if row else None
+
+    def put(self, endpoint: str, game_id: int, fingerprint: str, payload: bytes) -> None:
+        """Store an encoded payload, replacing any previous entry for the same key."""
+        try:
+            conn = self.db_manager.get_connection()
+            try:
+                conn.execute(
+                    Database.Queries.UPSERT_RESULT_CACHE,
+                    (endpoint, game_id, fingerprint, payload, datetime.now().isoformat())
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Result store write failed for {endpoint}/{game_id}: {e}")
+
+    def prune(self, fingerprint: str) -> int:
+        """Delete entries computed from any other data fingerprint."""
+        try:
+            conn = self.db_manager.get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute(Database.Queries.DELETE_STALE_RESULT_CACHE, (fingerprint,))
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Result store prune failed: {e}")
+            return 0
@@ -0,0 +1,91 @@
+"""Positional row-to-model mappers compiled from a cursor description.
+
+A repository declares which column fills each model field; ``RowMapper``
+resolves those columns to positions once per distinct result shape and
+then converts a whole ``fetchall()`` result column by column, so name
+lookups and conversions such as date parsing are not repeated per row.
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Converts a whole column of raw values
+ColumnConverter = Callable[[Sequence[Any]], Sequence[Any]]
+
+
+def parse_dates(values: Sequence[Any], date_format: str = "%Y-%m-%d") -> List[Optional[date]]:
+    """Parse a column of date strings, once per distinct value; unparseable values become None."""
+    parsed: Dict[Any, Optional[date]] = {}
+    for value in set(values):
+        try:
+            parsed[value] = datetime.strptime(value, date_format).date() if value else None
+        except (ValueError, TypeError):
+            parsed[value] = None
+    return [parsed[value] for value in values]
+
+
+class RowMapper:
+    """Builds models from rows of one result shape using fixed column positions."""
+
+    __slots__ = ("fields", "positions", "converters", "factory", "positional")
+
+    def __init__(
+        self,
+        column_names: Sequence[str],
+        field_columns: Mapping[str, str],
+        factory: Callable[..., Any],
+        converters: Optional[Mapping[str, ColumnConverter]] = None
+    ):
+        index = {}
+        for position, name in enumerate(column_names):
+            index.setdefault(name, position)  # first wins, as with sqlite3.Row
+        self.fields = tuple(field_columns)
+        # None for fields the query did not select; they are left as None
+        self.positions = tuple(index.get(column) for column in field_columns.values())
+        self.converters = tuple((converters or {}).get(field) for field in self.fields)
+        self.factory = factory
+        # NamedTuple records take their fields positionally
+        self.positional = isinstance(factory, type) and issubclass(factory, tuple)
+
+    def map_rows(self, rows: Sequence[Sequence[Any]]) -> List[Any]:
+        """Convert every row of a ``fetchall()`` result."""
+        if not rows:
+            return []
+        columns = list(zip(*rows))
+        values = []
+        for position, converter in zip(self.positions, self.converters):
+            column = columns[position] if position is not None else (None,) * len(rows)
+            values.append(converter(column) if converter is not None else column)
+
+        if self.positional:
+            return list(map(self.factory._make, zip(*values)))
+        factory, fields = self.factory, self.fields
+        return [factory(**dict(zip(fields, row_values))) for row_values in zip(*values)]
+
+    def map_row(self, row: Optional[Sequence[Any]]) -> Optional[Any]:
+        """Convert one ``fetchone()`` result; None stays None."""
+        return self.map_rows([row])[0] if row is not None else None
+
+
+class MapperCache:
+    """Compiled mappers, keyed by repository class and result column names."""
+
+    def __init__(self):
+        self._mappers: Dict[Tuple[type, Tuple[str, ...]], RowMapper] = {}
+        self._lock = threading.Lock()
+
+    def get(self, owner: type, column_names: Tuple[str, ...], compile_mapper: Callable[[], RowMapper]) -> RowMapper:
+        key = (owner, column_names)
+        mapper = self._mappers.get(key)
+        if mapper is None:
+            with self._lock:
+                mapper = self._mappers.setdefault(key, compile_mapper())
+        return mapper
+
+    def __len__(self) -> int:
+        return len(self._mappers)
+
+
+# Shared by all repositories; repository instances are created per request
+mapper_cache = MapperCache()
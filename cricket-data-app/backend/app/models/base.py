@@ -22,8 +22,8 @@ class Repository(ABC):
         pass
     
     @abstractmethod
-    async def find_all(self) -> list[DomainEntity]:
-        """Find all entities."""
+    async def find_all(self, limit: int, after: Optional[int] = None) -> list[DomainEntity]:
+        """Find up to ``limit`` entities ordered by ID, after ID ``after``."""
         pass
     
     @abstractmethod
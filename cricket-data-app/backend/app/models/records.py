@@ -0,0 +1,29 @@
+"""Lightweight records for rows read back from the database.
+
+Repositories return these instead of Pydantic models on paths that handle
+one object per simulation run. The rows were checked when they were loaded,
+so validating each of them again on every read is wasted work; Pydantic
+models are built once, at the API boundary, from the aggregated result.
+"""
+
+from typing import NamedTuple
+
+
+class SimulationRecord(NamedTuple):
+    """One team's score in one simulation run."""
+
+    team_id: int
+    team: str
+    simulation_run: int
+    results: int
+
+
+class ScorePair(NamedTuple):
+    """Home and away scores of one simulation run of a game."""
+
+    home_score: int
+    away_score: int
+
+    @property
+    def home_wins(self) -> bool:
+        return self.home_score > self.away_score
@@ -1,6 +1,7 @@
 from typing import Optional, List
 from pydantic import Field, validator
 from .base import DomainEntity
+from .records import ScorePair
 
 
 class Simulation(DomainEntity):
@@ -35,10 +36,14 @@ class TeamSimulation(DomainEntity):
 
 
 class GameAnalysis(DomainEntity):
-    """Complete game analysis with simulations."""
+    """Complete game analysis with simulations.
+    
+    Runs are kept as ScorePair tuples (serialized as ``[home, away]`` pairs)
+    rather than one Simulation model per run.
+    """
     
     game_id: int = Field(..., description="Game identifier")
-    simulations: List[Simulation] = Field(..., description="All simulation results")
+    simulations: List[ScorePair] = Field(..., description="All simulation results")
     home_win_probability: float = Field(..., ge=0, le=100, description="Home team win percentage")
     total_simulations: int = Field(..., ge=0, description="Total number of simulations")
     
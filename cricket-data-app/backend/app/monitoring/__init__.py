@@ -0,0 +1 @@
+"""Runtime instrumentation: metrics, profiling and tracing."""
@@ -0,0 +1,97 @@
+"""Non-blocking logging pipeline.
+
+Application code logs to a ``QueueHandler``; a background ``QueueListener``
+thread formats the records and writes them to a rotating file and stdout,
+so a request never waits on log I/O. When the queue is full new records
+are dropped (and counted) rather than blocking the caller.
+"""
+
+import atexit
+import logging
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+import orjson
+
+from ..constants import Logging
+from .metrics import log_records_dropped
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed via ``extra=``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+def setup_logging(settings=None) -> QueueListener:
+    """Route the root logger through the background writer (idempotent).
+
+    ``settings`` supplies the log_* options; defaults are used when it is None
+    (e.g. the configuration could not be loaded).
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = getattr(settings, "log_level", Logging.Pipeline.DEFAULT_LEVEL)
+    log_format = getattr(settings, "log_format", Logging.Pipeline.TEXT)
+    formatter = JsonFormatter() if log_format == Logging.Pipeline.JSON else logging.Formatter(
+        Logging.Pipeline.TEXT_FORMAT
+    )
+
+    handlers = [
+        RotatingFileHandler(
+            getattr(settings, "log_file", Logging.Pipeline.DEFAULT_FILE),
+            maxBytes=getattr(settings, "log_max_bytes", Logging.Pipeline.MAX_BYTES),
+            backupCount=getattr(settings, "log_backup_count", Logging.Pipeline.BACKUP_COUNT),
+            encoding="utf-8"
+        ),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=Logging.Pipeline.QUEUE_SIZE)
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(DroppingQueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # flush what is queued on exit
+    return _listener
+
+
+def should_log_access(status_code: int, sample_rate: float) -> bool:
+    """Whether to write an access log line: always for errors, else sampled."""
+    return status_code >= 400 or sample_rate >= 1.0 or random.random() < sample_rate
@@ -0,0 +1,260 @@
+"""Prometheus-format metrics with lock-free per-thread counters.
+
+Every thread updates its own shard of each metric, so recording never takes
+a lock or contends with other threads; a scrape merges the shards. Labels
+are passed as a tuple of values in the order the metric declares them.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from ..constants import Performance
+from ..database.instrumentation import QueryEvent, QueryObserver
+
+Labels = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class ThreadShards:
+    """One dict per writing thread, merged when read."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()  # only taken the first time a thread writes
+
+    def shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict() copies a builtin dict atomically under the GIL
+        return [dict(shard) for shard in shards]
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._shards = ThreadShards()
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.label_names, values))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type_name = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        shard = self._shards.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return sum(shard.get(labels, 0) for shard in self._shards.snapshot())
+
+    def samples(self) -> List[Sample]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._shards.snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return [(self.name, self._labels(labels), value) for labels, value in sorted(totals.items())]
+
+
+class Gauge(Counter):
+    """Value that goes up and down (e.g. requests in flight)."""
+
+    type_name = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = ()):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: Labels, value: float) -> None:
+        shard = self._shards.shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # Per-bucket counts (last one is +Inf), then the running sum
+            entry = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def samples(self) -> List[Sample]:
+        totals: Dict[Labels, List[float]] = {}
+        for shard in self._shards.snapshot():
+            for labels, entry in shard.items():
+                entry = list(entry)
+                merged = totals.get(labels)
+                if merged is None:
+                    totals[labels] = entry
+                else:
+                    totals[labels] = [a + b for a, b in zip(merged, entry)]
+
+        samples = []
+        for labels, entry in sorted(totals.items()):
+            label_dict = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), entry[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**label_dict, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", label_dict, entry[-1]))
+            samples.append((f"{self.name}_count", label_dict, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors and renders them."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: Dict[str, Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = {}
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = ()
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def add_collector(self, name: str, collector: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]) -> None:
+        """Add (or replace) a function returning ``(name, type, help, samples)`` families at scrape time."""
+        self._collectors[name] = collector
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        families = [(m.name, m.type_name, m.documentation, m.samples()) for m in self._metrics]
+        for collector in self._collectors.values():
+            families.extend(collector())
+
+        lines = []
+        for name, type_name, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {type_name}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: Any) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class DatabaseMetricsObserver(QueryObserver):
+    """Records statement timings and connection counts."""
+
+    def on_query(self, event: QueryEvent) -> None:
+        db_query_duration.observe((event.operation,), event.duration)
+
+    def on_connection_opened(self) -> None:
+        db_connections_opened.inc()
+        db_connections_open.inc()
+
+    def on_connection_closed(self) -> None:
+        db_connections_open.dec()
+
+
+def analysis_cache_collector(analysis_service) -> Callable[[], List[Tuple[str, str, str, List[Sample]]]]:
+    """Collector exposing the analysis result cache and coalescing counters."""
+    def collect():
+        cache = analysis_service.get_cache_stats()
+        coalescing = analysis_service.get_coalescing_stats()
+        return [
+            ("analysis_cache_hits_total", "counter", "Analysis result cache hits.",
+             [("analysis_cache_hits_total", {}, cache["hits"])]),
+            ("analysis_cache_misses_total", "counter", "Analysis result cache misses.",
+             [("analysis_cache_misses_total", {}, cache["misses"])]),
+            ("analysis_cache_entries", "gauge", "Payloads held in the analysis result cache.",
+             [("analysis_cache_entries", {}, cache["size"])]),
+            ("analysis_cache_bytes", "gauge", "Encoded bytes held in the analysis result cache.",
+             [("analysis_cache_bytes", {}, cache["bytes"])]),
+            ("analysis_computations_total", "counter", "Analysis computations started.",
+             [("analysis_computations_total", {}, coalescing["executed"])]),
+            ("analysis_coalesced_total", "counter", "Requests that joined an in-flight computation.",
+             [("analysis_coalesced_total", {}, coalescing["coalesced"])]),
+            ("analysis_in_flight", "gauge", "Analysis computations currently running.",
+             [("analysis_in_flight", {}, coalescing["in_flight"])])
+        ]
+    return collect
+
+
+# Shared registry and the application's metrics
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route"),
+    buckets=Performance.Metrics.REQUEST_LATENCY_BUCKETS
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "SQLite statement latency by calling function.", ("operation",),
+    buckets=Performance.Metrics.QUERY_LATENCY_BUCKETS
+)
+http_request_db_statements = registry.histogram(
+    "http_request_db_statements", "SQLite statements executed per request by route template.", ("method", "route"),
+    buckets=Performance.Metrics.STATEMENT_COUNT_BUCKETS
+)
+http_request_db_rows = registry.histogram(
+    "http_request_db_rows", "SQLite rows fetched per request by route template.", ("method", "route"),
+    buckets=Performance.Metrics.ROW_COUNT_BUCKETS
+)
+db_connections_opened = registry.counter("db_connections_opened_total", "SQLite connections opened.")
+db_connections_open = registry.gauge("db_connections_open", "SQLite connections currently open.")
+response_render_duration = registry.histogram(
+    "response_render_seconds", "Time spent encoding response bodies.", ("media_type",),
+    buckets=Performance.Metrics.RENDER_LATENCY_BUCKETS
+)
+log_records_dropped = registry.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full."
+)
+
+database_metrics_observer = DatabaseMetricsObserver()
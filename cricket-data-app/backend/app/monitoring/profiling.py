@@ -0,0 +1,153 @@
+"""On-demand request profiling for development and staging.
+
+A profiled request gets a ``RequestProfile`` holding a sampled call profile
+(collapsed stacks of every busy thread, compatible with flamegraph tools)
+and the SQL statements it ran with their timings. Profiles are kept in a
+small in-memory store and downloaded from ``/debug/profiles/{id}``.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from ..constants import Performance
+from ..database.instrumentation import QueryEvent, QueryObserver
+
+# Profile of the request being handled, propagated to executor threads
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+# Innermost frames in these modules mean the thread is idle (waiting for work or I/O)
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", "futures/thread.py")
+
+
+class RequestProfile:
+    """Call-stack samples and SQL timings captured for one request."""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.queries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_query(self, event: QueryEvent) -> None:
+        with self._lock:
+            self.queries.append({
+                "sql": " ".join(event.sql.split()),
+                "params": event.params_shape(),
+                "operation": event.operation,
+                "duration_ms": round(event.duration * 1000, 3)
+            })
+
+    def folded(self) -> str:
+        """Samples in collapsed-stack format, one ``stack count`` line each."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "sample_interval_ms": Performance.Profiling.SAMPLE_INTERVAL * 1000,
+            "samples": self.samples,
+            "stacks": dict(self.stacks.most_common()),
+            "queries": list(self.queries),
+            "query_time_ms": round(sum(query["duration_ms"] for query in self.queries), 3)
+        }
+
+
+class StackSampler:
+    """Background thread that samples the stacks of all other busy threads."""
+
+    def __init__(self, profile: RequestProfile, interval: float = Performance.Profiling.SAMPLE_INTERVAL):
+        self.profile = profile
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                self.profile.stacks[self._fold(names.get(thread_id, str(thread_id)), frame)] += 1
+            self.profile.samples += 1
+
+    @staticmethod
+    def _fold(thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None and len(stack) < Performance.Profiling.MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_qualname}")
+            frame = frame.f_back
+        return ";".join([thread_name] + stack[::-1])
+
+
+class ProfileStore:
+    """Keeps the most recent profiles."""
+
+    def __init__(self, max_size: int = Performance.Profiling.MAX_STORED_PROFILES):
+        self.max_size = max_size
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of stored profiles, newest first."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [
+            {
+                "id": profile.id,
+                "method": profile.method,
+                "path": profile.path,
+                "started_at": profile.started_at,
+                "duration_ms": round(profile.duration * 1000, 3) if profile.duration is not None else None,
+                "queries": len(profile.queries)
+            }
+            for profile in reversed(profiles)
+        ]
+
+
+class ProfilingQueryObserver(QueryObserver):
+    """Adds statements to the profile of the request that ran them."""
+
+    def on_query(self, event: QueryEvent) -> None:
+        profile = current_profile.get()
+        if profile is not None:
+            profile.add_query(event)
+
+
+# Shared store and observer
+profile_store = ProfileStore()
+profiling_query_observer = ProfilingQueryObserver()
@@ -0,0 +1,64 @@
+"""Per-request statement and row counts.
+
+``count_queries()`` starts a ``QueryCounter`` for the code running in the
+current context (a request, or a block in a test); statements and fetched
+rows reported by the database instrumentation are added to every counter
+that is active, so a test can count a request that the metrics middleware
+is also counting.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from ..database.instrumentation import QueryEvent, QueryObserver, add_query_observer
+
+_active_counters: ContextVar[Tuple["QueryCounter", ...]] = ContextVar("query_counters", default=())
+
+
+class QueryCounter:
+    """Statements executed and rows fetched while the counter was active."""
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.queries: List[Tuple[str, str]] = []  # (operation, sql) in execution order
+        self._lock = threading.Lock()  # executor threads of one request share the counter
+
+    def add_statement(self, operation: str, sql: str) -> None:
+        with self._lock:
+            self.statements += 1
+            self.queries.append((operation, " ".join(sql.split())))
+
+    def add_rows(self, count: int) -> None:
+        with self._lock:
+            self.rows += count
+
+
+class QueryCountingObserver(QueryObserver):
+    """Adds statements and fetched rows to the active counters."""
+
+    def on_query(self, event: QueryEvent) -> None:
+        for counter in _active_counters.get():
+            counter.add_statement(event.operation, event.sql)
+
+    def on_rows_fetched(self, count: int) -> None:
+        for counter in _active_counters.get():
+            counter.add_rows(count)
+
+
+# Shared observer, registered the first time counting starts
+query_counting_observer = QueryCountingObserver()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the statements and rows of the code run inside the block."""
+    add_query_observer(query_counting_observer)
+    counter = QueryCounter()
+    token = _active_counters.set(_active_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _active_counters.reset(token)
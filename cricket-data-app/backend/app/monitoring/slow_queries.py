@@ -0,0 +1,187 @@
+"""Slow-query log and per-statement timing statistics.
+
+``SlowQueryObserver`` keeps count, total and maximum duration for every
+distinct statement. A statement slower than the threshold is logged on
+the ``app.slow_queries`` logger with its parameter types, duration and
+``EXPLAIN QUERY PLAN`` output; the plan is looked up once per statement
+text and shown by ``/debug/slow-queries``.
+
+Recording a fast statement costs a cached normalization of its text and an
+update of the calling thread's own statistics, without taking a lock; the
+lock, the caller lookup and the plan are only needed for slow statements
+(and the first run of a statement on each thread).
+"""
+
+import functools
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..constants import Logging, Performance
+from ..database.instrumentation import QueryEvent, QueryObserver
+from .metrics import Counter, ThreadShards
+
+logger = logging.getLogger(Logging.Pipeline.SLOW_QUERY_LOGGER)
+
+# Statements SQLite can plan; DDL is timed but not explained
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+class StatementStats:
+    """Timings of one distinct statement."""
+
+    __slots__ = ("sql", "operation", "count", "slow_count", "total", "max", "params", "plan")
+
+    def __init__(self, sql: str, operation: str):
+        self.sql = sql
+        self.operation = operation
+        self.count = 0
+        self.slow_count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.params: Any = None  # parameter types of the slowest run
+        self.plan: Optional[List[str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "operation": self.operation,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "params": self.params,
+            "plan": self.plan
+        }
+
+
+@functools.lru_cache(maxsize=Performance.SlowQueries.NORMALIZED_SQL_CACHE_SIZE)
+def normalize_sql(sql: str) -> str:
+    """Statement text with its whitespace collapsed, as shown in logs."""
+    return " ".join(sql.split())
+
+
+def explain_query_plan(connection: sqlite3.Connection, sql: str, params: Any = ()) -> List[str]:
+    """``EXPLAIN QUERY PLAN`` rows for a statement, indented by depth."""
+    # A plain cursor, so the EXPLAIN itself is not reported to observers
+    cursor = connection.cursor(sqlite3.Cursor)
+    try:
+        rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall()
+    finally:
+        cursor.close()
+
+    depths: Dict[int, int] = {0: -1}
+    lines = []
+    for node_id, parent_id, _, detail in rows:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        lines.append("  " * depths[node_id] + detail)
+    return lines
+
+
+class SlowQueryObserver(QueryObserver):
+    """Aggregates statement timings and logs those over the threshold.
+
+    Each thread keeps its own statistics (up to ``max_statements`` distinct
+    statements), merged when read, as the metrics do.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = Performance.SlowQueries.THRESHOLD_MS,
+        max_statements: int = Performance.SlowQueries.MAX_TRACKED_STATEMENTS
+    ):
+        self.threshold_ms = threshold_ms
+        self.max_statements = max_statements
+        self._plans: Dict[str, Optional[List[str]]] = {}
+        self._lock = threading.Lock()  # only taken for slow statements
+        self.reset()
+
+    @property
+    def untracked(self) -> int:
+        """Executions of statements beyond ``max_statements``."""
+        return int(self._untracked.value())
+
+    def on_query(self, event: QueryEvent) -> None:
+        sql = normalize_sql(event.sql)
+        shard = self._stats.shard()
+        stats = shard.get(sql)
+        if stats is None:
+            if len(shard) >= self.max_statements:
+                self._untracked.inc()
+                return
+            stats = shard[sql] = StatementStats(sql, event.operation)
+        stats.count += 1
+        stats.total += event.duration
+        if event.duration > stats.max:
+            stats.max = event.duration
+            stats.params = event.params_shape()
+        if event.duration * 1000 < self.threshold_ms:
+            return
+        stats.slow_count += 1
+
+        with self._lock:
+            explained = sql in self._plans
+            plan = self._plans.get(sql)
+        if not explained:
+            plan = self._explain(event)
+            with self._lock:
+                self._plans[sql] = plan
+        logger.warning(
+            f"Slow query ({event.duration * 1000:.1f} ms) in {event.operation}: {sql}",
+            extra={
+                "sql": sql,
+                "operation": event.operation,
+                "duration_ms": round(event.duration * 1000, 3),
+                "params": event.params_shape(),
+                "plan": plan
+            }
+        )
+
+    @staticmethod
+    def _explain(event: QueryEvent) -> Optional[List[str]]:
+        # executemany does not report its parameters
+        if event.connection is None or event.params is None:
+            return None
+        if not event.sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        try:
+            return explain_query_plan(event.connection, event.sql, event.params)
+        except sqlite3.Error as e:
+            return [f"EXPLAIN QUERY PLAN failed: {e}"]
+
+    def _merged(self) -> List[StatementStats]:
+        """Every thread's statistics combined per statement."""
+        merged: Dict[str, StatementStats] = {}
+        for shard in self._stats.snapshot():
+            for sql, stats in shard.items():
+                total = merged.get(sql)
+                if total is None:
+                    total = merged[sql] = StatementStats(sql, stats.operation)
+                total.count += stats.count
+                total.slow_count += stats.slow_count
+                total.total += stats.total
+                if stats.max > total.max:
+                    total.max = stats.max
+                    total.params = stats.params
+        with self._lock:
+            for sql, total in merged.items():
+                total.plan = self._plans.get(sql)
+        return list(merged.values())
+
+    def slowest(self, limit: int) -> List[Dict[str, Any]]:
+        """The ``limit`` statements with the highest maximum duration."""
+        stats = sorted(self._merged(), key=lambda entry: entry.max, reverse=True)[:limit]
+        return [entry.to_dict() for entry in stats]
+
+    def reset(self) -> None:
+        """Forget all statistics and plans."""
+        self._stats = ThreadShards()
+        self._untracked = Counter("slow_queries_untracked", "Executions of statements beyond max_statements.")
+        with self._lock:
+            self._plans.clear()
+
+
+# Shared observer; setup_middleware applies the configured threshold
+slow_query_observer = SlowQueryObserver()
@@ -0,0 +1,236 @@
+"""Local span tracing for sampled requests.
+
+A sampled request gets a ``Trace``; code marks the work it does with
+``span()`` blocks or the ``@traced`` decorator, and SQL statements are
+added by ``TracingQueryObserver``. The active span is held in a context
+variable, so spans started in executor threads (which run in a copy of the
+request's context) nest under the span that submitted the work. Finished
+traces go to an in-memory ring buffer read by ``/debug/traces``.
+
+When a request is not sampled ``span()`` returns a shared no-op context
+manager after one context variable lookup.
+"""
+
+import functools
+import inspect
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from ..constants import Performance
+from ..database.instrumentation import QueryEvent, QueryObserver
+
+Kinds = Performance.Tracing.Kinds
+
+# Trace of the request being handled and the innermost open span
+current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed unit of work inside a trace."""
+
+    __slots__ = ("id", "parent", "name", "kind", "start", "duration", "attributes", "outermost")
+
+    def __init__(self, span_id: int, parent: Optional["Span"], name: str, kind: str, attributes: Dict[str, Any]):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.kind = kind
+        self.start = 0.0  # perf_counter seconds
+        self.duration = 0.0
+        self.attributes = attributes
+        # Only the outermost span of each kind counts towards the breakdown,
+        # so a service calling another service is not counted twice
+        self.outermost = True
+        ancestor = parent
+        while ancestor is not None:
+            if ancestor.kind == kind:
+                self.outermost = False
+                break
+            ancestor = ancestor.parent
+
+
+class Trace:
+    """Spans recorded for one request."""
+
+    def __init__(self, method: str, path: str, max_spans: int = Performance.Tracing.MAX_SPANS):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+
+    def new_span(self, name: str, kind: str, attributes: Dict[str, Any]) -> Optional[Span]:
+        """Register a span under the current one; None once the trace is full."""
+        with self._lock:
+            if len(self.spans) >= self.max_spans:
+                self.dropped_spans += 1
+                return None
+            span = Span(len(self.spans), current_span.get(), name, kind, attributes)
+            self.spans.append(span)
+            return span
+
+    def breakdown(self) -> Dict[str, float]:
+        """Milliseconds per span kind; ``routing`` is request time outside any endpoint."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span.outermost:
+                totals[span.kind] = totals.get(span.kind, 0.0) + span.duration
+        totals[Kinds.ROUTING] = max(self.duration - totals.get(Kinds.ENDPOINT, 0.0), 0.0)
+        return {kind: round(seconds * 1000, 3) for kind, seconds in sorted(totals.items())}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "span_count": len(self.spans),
+            "breakdown": self.breakdown()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            "dropped_spans": self.dropped_spans,
+            "spans": [
+                {
+                    "id": span.id,
+                    "parent_id": span.parent.id if span.parent is not None else None,
+                    "name": span.name,
+                    "kind": span.kind,
+                    "start_ms": round((span.start - self.start) * 1000, 3),
+                    "duration_ms": round(span.duration * 1000, 3),
+                    "attributes": span.attributes
+                }
+                for span in self.spans
+            ]
+        }
+
+
+class _SpanContext:
+    __slots__ = ("trace", "name", "kind", "attributes", "span", "token")
+
+    def __init__(self, trace: Trace, name: str, kind: str, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+
+    def __enter__(self) -> Optional[Span]:
+        self.span = self.trace.new_span(self.name, self.kind, self.attributes)
+        if self.span is not None:
+            self.token = current_span.set(self.span)
+            self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.span is not None:
+            self.span.duration = time.perf_counter() - self.span.start
+            if exc_type is not None:
+                self.span.attributes["error"] = exc_type.__name__
+            current_span.reset(self.token)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, kind: str = Kinds.INTERNAL, **attributes: Any):
+    """Context manager timing a block as a span of the current trace, if any."""
+    trace = current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _SpanContext(trace, name, kind, attributes)
+
+
+def traced(kind: str = Kinds.INTERNAL, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """Decorator recording each call of a function or coroutine function as a span."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if current_trace.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceBuffer:
+    """Ring buffer of the most recent finished traces."""
+
+    def __init__(self, max_size: int = Performance.Tracing.BUFFER_SIZE):
+        self._traces: deque = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            return next((trace for trace in self._traces if trace.id == trace_id), None)
+
+    def slowest(self, limit: int) -> List[Trace]:
+        """The ``limit`` slowest buffered traces, slowest first."""
+        with self._lock:
+            traces = list(self._traces)
+        return sorted(traces, key=lambda trace: trace.duration, reverse=True)[:limit]
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+
+class TracingQueryObserver(QueryObserver):
+    """Adds each statement run during a traced request as an ``sql`` span."""
+
+    def on_query(self, event: QueryEvent) -> None:
+        trace = current_trace.get()
+        if trace is None:
+            return
+        query_span = trace.new_span(
+            event.operation, Kinds.SQL, {"sql": " ".join(event.sql.split())}
+        )
+        if query_span is not None:
+            query_span.duration = event.duration
+            query_span.start = time.perf_counter() - event.duration
+
+
+# Shared buffer and observer
+trace_buffer = TraceBuffer()
+tracing_query_observer = TracingQueryObserver()
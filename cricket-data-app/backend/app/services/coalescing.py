@@ -0,0 +1,49 @@
+"""Single-flight request coalescing for expensive service calls."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent identical calls.
+
+    The first caller for a key starts the computation; callers arriving while
+    it is still running await the same task instead of starting their own.
+    The computation runs as its own task, so a cancelled caller (e.g. a client
+    that disconnected) does not cancel the result for everyone else.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` for ``key`` unless an identical call is already in flight."""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executed += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        """Drop a finished task so the next call recomputes."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every caller went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed/coalesced counters and current in-flight count."""
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight)
+        }
@@ -1,9 +1,12 @@
+import hashlib
 import os
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.config import get_environment_settings
 from app.database.connection import db_manager
-from app.constants import Database, Logging, ErrorMessages, format_error_message
+from app.services.events import data_events
+from app.services.game_analysis_service import game_analysis_service
+from app.constants import Database, Logging, ErrorMessages, Performance, format_error_message
 
 
 class DataLoaderService:
@@ -11,6 +14,7 @@ class DataLoaderService:
     
     def __init__(self):
         self.config = get_environment_settings()
+        self.data_fingerprint: Optional[str] = None
     
     def load_all_csv_data(self) -> bool:
         """Load all CSV files into database."""
@@ -21,13 +25,52 @@ class DataLoaderService:
             success &= self._load_simulations()
             
             if success:
+                db_manager.create_indexes()
+                self._materialize_game_overview()
+                self.data_fingerprint = self.compute_data_fingerprint()
                 print(Logging.Messages.STARTUP_COMPLETE)
             
+            self._finish_load(success)
             return success
         except Exception as e:
             print(format_error_message(ErrorMessages.ERROR_LOADING_CSV, error=str(e)))
+            self._finish_load(False)
             return False
     
+    def _finish_load(self, success: bool) -> None:
+        """Drop results cached for the old data, then announce the new version.
+        
+        A failed load may still have replaced some tables, so the cache is
+        dropped either way. The event is only published once stale results
+        are gone; every table was replaced, so it covers all games and teams.
+        """
+        game_analysis_service.set_data_fingerprint(self.data_fingerprint)
+        if success:
+            data_events.publish(self.data_fingerprint)
+    
+    def compute_data_fingerprint(self) -> str:
+        """Hash the source CSV files so derived results can be tied to them."""
+        digest = hashlib.sha256()
+        for path in (self.config.venues_path, self.config.games_path, self.config.simulations_path):
+            digest.update(os.path.basename(path).encode('utf-8'))
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as csv_file:
+                for chunk in iter(lambda: csv_file.read(Performance.Cache.FINGERPRINT_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _materialize_game_overview(self) -> None:
+        """Recompute the per-game win/tie counts behind /games/overview."""
+        conn = db_manager.get_connection()
+        try:
+            conn.execute(Database.Queries.CREATE_GAME_OVERVIEW_TABLE)
+            conn.execute(Database.Queries.DELETE_GAME_OVERVIEW)
+            conn.execute(Database.Queries.MATERIALIZE_GAME_OVERVIEW)
+            conn.commit()
+        finally:
+            conn.close()
+    
     def _load_venues(self) -> bool:
         """Load venues CSV data."""
         return self._load_csv_file(
@@ -38,21 +81,11 @@ class DataLoaderService:
     
     def _load_games(self) -> bool:
         """Load games CSV data."""
-        if not os.path.exists(self.config.games_path):
-            return False
-        
-        try:
-            games_df = pd.read_csv(self.config.games_path)
-            
-            # Add ID column if not present
-            if Database.Columns.GAME_ID not in games_df.columns:
-                games_df = games_df.reset_index()
-                games_df[Database.Columns.GAME_ID] = games_df.index + 1
-            
-            return self._save_dataframe_to_db(games_df, Database.Tables.GAMES, "games")
-        except Exception as e:
-            print(format_error_message(ErrorMessages.ERROR_LOADING_CSV, error=str(e)))
-            return False
+        return self._load_csv_file(
+            self.config.games_path,
+            Database.Tables.GAMES,
+            "games"
+        )
     
     def _load_simulations(self) -> bool:
         """Load simulations CSV data."""
@@ -68,12 +101,20 @@ class DataLoaderService:
             return False
         
         try:
-            df = pd.read_csv(file_path)
+            df = self._prepare_dataframe(pd.read_csv(file_path), table_name)
             return self._save_dataframe_to_db(df, table_name, data_type)
         except Exception as e:
             print(format_error_message(ErrorMessages.ERROR_LOADING_CSV, error=str(e)))
             return False
     
+    def _prepare_dataframe(self, df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+        """Bring a freshly read CSV into the table's shape before it is written."""
+        # Games are numbered in file order unless the CSV has an ID column
+        if table_name == Database.Tables.GAMES and Database.Columns.GAME_ID not in df.columns:
+            df = df.reset_index()
+            df[Database.Columns.GAME_ID] = df.index + 1
+        return df
+    
     def _save_dataframe_to_db(self, df: pd.DataFrame, table_name: str, data_type: str) -> bool:
         """Save DataFrame to database table."""
         try:
@@ -0,0 +1,79 @@
+"""Data-version change notifications for Server-Sent Events subscribers."""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..constants import Performance
+
+
+class DataVersionBroadcaster:
+    """Fan out data-version events to every connected subscriber.
+
+    Each subscriber gets a bounded queue; a slow client loses its oldest
+    pending events rather than holding memory for everyone. Events can be
+    published from any thread (e.g. a data load running in the executor).
+    The latest event is kept so new subscribers learn the current version.
+    """
+
+    def __init__(self, queue_size: int = Performance.Events.SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.latest: Optional[Dict[str, Any]] = None
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber on the running event loop."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; unknown queues are ignored."""
+        with self._lock:
+            self._subscribers = [entry for entry in self._subscribers if entry[1] is not queue]
+
+    def publish(
+        self,
+        version: Optional[str],
+        games: Optional[List[int]] = None,
+        teams: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Announce a new data version.
+
+        ``games`` and ``teams`` list what changed; leave them out when the
+        whole dataset was replaced, so clients invalidate everything.
+        """
+        event = {
+            "version": version,
+            "scope": "full" if games is None and teams is None else "partial",
+            "games": games,
+            "teams": teams,
+            "timestamp": time.time()
+        }
+        with self._lock:
+            self.latest = event
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has closed
+                self.unsubscribe(queue)
+        return event
+
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers."""
+        return len(self._subscribers)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+# Singleton shared by the data loader and the events endpoint
+data_events = DataVersionBroadcaster()
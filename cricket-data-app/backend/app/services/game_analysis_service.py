@@ -0,0 +1,724 @@
+# app/services/game_analysis_service.py
+"""Game analysis and histogram payloads served by the games API."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import operator
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from ..api.responses.encoding import msgpack, pack_columns
+from ..database.connection import db_manager
+from ..database.result_store import ResultStore
+from ..constants import API, BusinessLogic, Database, Logging, Performance
+from .coalescing import SingleFlight
+from .result_cache import CachedPayload, ResultCache
+from ..monitoring.tracing import Kinds, traced
+
+logger = logging.getLogger(__name__)
+
+
+class GameAnalysisService:
+    """Builds analysis and histogram payloads with caching and coalescing.
+
+    Payloads are cached in memory per game until the data is reloaded, backed
+    by an optional persistent ResultStore keyed on the data fingerprint. On a
+    miss, concurrent requests for the same game share one computation; the
+    SQLite work runs in the default executor so waiting requests can attach.
+    Payloads are returned as CachedPayload so cache hits keep their encoding.
+    Every invalidation starts a new generation; a computation that started in
+    an earlier one does not store its result.
+    """
+
+    ANALYSIS = "analysis"
+    ANALYSIS_COLUMNAR = "analysis_columnar"
+    ANALYSIS_SUMMARY = "analysis_summary"
+    ANALYSIS_MSGPACK = "analysis_msgpack"
+    ANALYSIS_SUMMARY_MSGPACK = "analysis_summary_msgpack"
+    HISTOGRAM = "histogram"
+    HISTOGRAM_BINNED = "histogram_binned"
+    BUNDLE = "bundle"
+    OVERVIEW = "overview"
+    OVERVIEW_KEY = 0  # the overview covers every game, so it is cached under one key
+
+    def __init__(
+        self,
+        db_manager,
+        result_store: Optional[ResultStore] = None,
+        cache_max_bytes: int = Performance.Cache.MAX_CACHE_BYTES
+    ):
+        self.db_manager = db_manager
+        self.result_store = result_store
+        self.data_fingerprint: Optional[str] = None
+        self.coalescer = SingleFlight()
+        self.cache = ResultCache(cache_max_bytes)
+        self.generation = 0
+        self._generation_lock = threading.RLock()
+
+    @traced(Kinds.SERVICE)
+    async def get_game_analysis(
+        self,
+        game_id: int,
+        response_format: str = API.AnalysisFormats.ROWS,
+        include_runs: bool = True,
+        media_type: str = API.MediaTypes.JSON
+    ) -> Optional[CachedPayload]:
+        """Get analysis payload for a game, or None if the game does not exist.
+
+        ``response_format`` selects row or columnar per-run simulations;
+        ``include_runs=False`` returns only the aggregates. For MessagePack the
+        payload body is the encoded response, with the per-run scores packed
+        as columns whatever ``response_format`` says.
+        """
+        analysis = await self._get_payload(self.ANALYSIS_COLUMNAR, game_id, self.build_game_analysis)
+        if analysis is None:
+            return None
+        if media_type == API.MediaTypes.MSGPACK:
+            if not include_runs:
+                summary = self._get_derived(self.ANALYSIS_SUMMARY, game_id, analysis, self._summarize)
+                return self._get_derived(self.ANALYSIS_SUMMARY_MSGPACK, game_id, summary, self._to_msgpack)
+            return self._get_derived(self.ANALYSIS_MSGPACK, game_id, analysis, self._to_packed_msgpack)
+        if not include_runs:
+            return self._get_derived(self.ANALYSIS_SUMMARY, game_id, analysis, self._summarize)
+        if response_format == API.AnalysisFormats.ROWS:
+            return self._get_derived(self.ANALYSIS, game_id, analysis, self._to_rows)
+        return analysis
+
+    @traced(Kinds.SERVICE)
+    async def get_histogram_data(self, game_id: int) -> Optional[CachedPayload]:
+        """Get histogram payload for a game, or None if the game does not exist."""
+        return await self._get_payload(self.HISTOGRAM, game_id, self.build_histogram_data)
+
+    @traced(Kinds.SERVICE)
+    async def get_histogram_bins(
+        self, game_id: int, bin_size: int = BusinessLogic.Histogram.DEFAULT_BIN_SIZE
+    ) -> Optional[CachedPayload]:
+        """Get pre-binned histogram counts for a game, or None if it does not exist."""
+        return await self._get_payload(
+            f"{self.HISTOGRAM_BINNED}:{bin_size}",
+            game_id,
+            lambda binned_game_id: self.build_histogram_bins(binned_game_id, bin_size)
+        )
+
+    @traced(Kinds.SERVICE)
+    async def get_game_bundle(
+        self, game_id: int, bin_size: int = BusinessLogic.Histogram.DEFAULT_BIN_SIZE
+    ) -> Optional[CachedPayload]:
+        """Get game info, analysis aggregates and histogram bins in one payload.
+
+        Returns None if the game does not exist.
+        """
+        return await self._get_payload(
+            f"{self.BUNDLE}:{bin_size}",
+            game_id,
+            lambda bundle_game_id: self.build_game_bundle(bundle_game_id, bin_size)
+        )
+
+    @traced(Kinds.SERVICE)
+    async def get_overview(self) -> CachedPayload:
+        """Get win probability and tie rate for every game."""
+        return await self._get_payload(self.OVERVIEW, self.OVERVIEW_KEY, lambda _: self.build_overview())
+
+    @traced(Kinds.SERVICE)
+    async def get_analysis_summaries(self, game_ids: List[int]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Get analysis summaries (no per-run data) for many games.
+
+        Returns the summaries in request order and the IDs that were not found.
+        """
+        summaries = {}
+        uncached = []
+        for game_id in dict.fromkeys(game_ids):
+            cached = self.cache.get((self.ANALYSIS_COLUMNAR, game_id))
+            if cached is not None:
+                summaries[game_id] = self._summarize(cached.data)
+            else:
+                uncached.append(game_id)
+
+        if uncached:
+            summaries.update(await self._run_in_executor(self.build_analysis_summaries, uncached))
+
+        found = [summaries[game_id] for game_id in dict.fromkeys(game_ids) if game_id in summaries]
+        missing = [game_id for game_id in dict.fromkeys(game_ids) if game_id not in summaries]
+        return found, missing
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Executed and coalesced computation counts."""
+        return self.coalescer.stats()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Result cache hit/miss counts."""
+        return self.cache.stats()
+
+    def invalidate(self) -> None:
+        """Forget cached payloads after the underlying data changed."""
+        with self._generation_lock:
+            self.generation += 1
+            self.cache.clear()
+
+    def set_data_fingerprint(self, fingerprint: Optional[str]) -> None:
+        """Tie cached payloads to a new data version and drop stale ones."""
+        with self._generation_lock:
+            self.data_fingerprint = fingerprint
+            self.invalidate()
+        if self.result_store and fingerprint:
+            pruned = self.result_store.prune(fingerprint)
+            if pruned:
+                logger.info(f"Pruned {pruned} stale persisted results")
+
+    def warm_up(self, max_workers: int = Performance.Cache.WARMUP_WORKERS) -> int:
+        """Compute and cache analysis and histogram payloads for every game (blocking).
+
+        Games are warmed most recent first, and only until the cache is full:
+        warming more would evict the games warmed before them. Returns the
+        number of games warmed.
+        """
+        start_time = time.time()
+        self.invalidate()
+        builders = {self.ANALYSIS_COLUMNAR: self.build_game_analysis, self.HISTOGRAM: self.build_histogram_data}
+        game_ids = self.list_game_ids(most_recent_first=True)
+        full = threading.Event()
+
+        def warm(game_id: int) -> bool:
+            for kind, build in builders.items():
+                if full.is_set():
+                    return False
+                self._compute_and_cache(kind, game_id, build, evict=False)
+                if (kind, game_id) not in self.cache:
+                    full.set()
+                    return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(warm, game_id) for game_id in game_ids]
+        warmed = sum(future.result() for future in futures)  # Surfaces the first failure
+
+        if warmed < len(game_ids):
+            logger.warning(Logging.Messages.WARMUP_TRUNCATED.format(
+                count=warmed, total=len(game_ids), max_bytes=self.cache.max_bytes
+            ))
+        logger.info(Logging.Messages.WARMUP_COMPLETE.format(
+            count=warmed,
+            duration=time.time() - start_time
+        ))
+        return warmed
+
+    def list_game_ids(self, most_recent_first: bool = False) -> List[int]:
+        """Get the IDs of all loaded games, by ID or by date descending (blocking)."""
+        order = "date DESC, id DESC" if most_recent_first else "id"
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT id FROM games ORDER BY {order}")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    async def _get_payload(
+        self, kind: str, game_id: int, build: Callable[[int], Optional[Dict[str, Any]]]
+    ) -> Optional[CachedPayload]:
+        cached = self.cache.get((kind, game_id))
+        if cached is not None:
+            return cached
+        # Requests after an invalidation do not join a computation from before it
+        return await self.coalescer.run(
+            (kind, game_id, self._current_generation()),
+            lambda: self._run_in_executor(self._compute_and_cache, kind, game_id, build)
+        )
+
+    def _compute_and_cache(
+        self, kind: str, game_id: int, build: Callable[[int], Optional[Dict[str, Any]]], evict: bool = True
+    ) -> Optional[CachedPayload]:
+        with self._generation_lock:
+            generation = self.generation
+            fingerprint = self.data_fingerprint
+        persist = self.result_store is not None and fingerprint is not None
+
+        body = self.result_store.get(kind, game_id, fingerprint) if persist else None
+        if body is not None:
+            payload = CachedPayload(body=body)
+            self._store(generation, (kind, game_id), payload, evict=evict)
+        else:
+            data = build(game_id)
+            if data is None:
+                return None
+            payload = CachedPayload(data=data)
+            self._store(generation, (kind, game_id), payload, fingerprint if persist else None, evict)
+        return payload
+
+    def _store(
+        self,
+        generation: int,
+        key: Tuple[str, int],
+        payload: CachedPayload,
+        fingerprint: Optional[str] = None,
+        evict: bool = True
+    ) -> bool:
+        """Cache (and persist, given a fingerprint) a payload computed in ``generation``.
+
+        Returns False without caching anything if the data was invalidated since.
+        With ``evict=False`` the payload is not cached if the cache is full.
+        Only the generation check and the cache update hold the generation
+        lock; encoding and persisting happen outside it. The store is keyed by
+        fingerprint, so a write racing an invalidation is never served for the
+        new data.
+        """
+        body = payload.body
+        if generation != self._current_generation():
+            return False
+        if fingerprint is not None:
+            kind, game_id = key
+            self.result_store.put(kind, game_id, fingerprint, body)
+        with self._generation_lock:
+            if generation != self.generation:
+                return False
+            return self.cache.set(key, payload, evict)
+
+    def _current_generation(self) -> int:
+        """The generation, read under the lock that invalidation bumps it with."""
+        with self._generation_lock:
+            return self.generation
+
+    def _get_derived(
+        self,
+        kind: str,
+        game_id: int,
+        source: CachedPayload,
+        derive: Callable[[Dict[str, Any]], Union[Dict[str, Any], bytes]]
+    ) -> CachedPayload:
+        """Get a cached alternative representation of a payload.
+
+        ``derive`` returns either the new payload data or its final encoding.
+        """
+        generation = self._current_generation()
+        payload = self.cache.get((kind, game_id))
+        if payload is None:
+            derived = derive(source.data)
+            payload = CachedPayload(body=derived) if isinstance(derived, bytes) else CachedPayload(data=derived)
+            self._store(generation, (kind, game_id), payload)
+        return payload
+
+    @staticmethod
+    def _percentage(count: int, total_simulations: int) -> float:
+        """Share of simulations as a rounded percentage (0 when there are none)."""
+        if total_simulations == 0:
+            return 0.0
+        return round(
+            (count / total_simulations) * BusinessLogic.WinProbability.PERCENTAGE_MULTIPLIER,
+            BusinessLogic.WinProbability.DECIMAL_PLACES
+        )
+
+    @staticmethod
+    def _summarize(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Analysis payload without the per-run simulations."""
+        return {key: value for key, value in analysis.items() if key != "simulations"}
+
+    @staticmethod
+    def _to_rows(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Analysis payload with simulations as one object per run."""
+        simulations = analysis["simulations"]
+        return {
+            **analysis,
+            "simulations": [
+                {"home_score": home_score, "away_score": away_score}
+                for home_score, away_score in zip(simulations["home_score"], simulations["away_score"])
+            ]
+        }
+
+    @staticmethod
+    def _to_msgpack(payload: Dict[str, Any]) -> bytes:
+        """Payload encoded as MessagePack."""
+        return msgpack.packb(payload, use_bin_type=True)
+
+    @classmethod
+    def _to_packed_msgpack(cls, analysis: Dict[str, Any]) -> bytes:
+        """Analysis encoded as MessagePack with the scores as packed columns."""
+        return cls._to_msgpack({
+            **analysis,
+            "simulations": pack_columns(analysis["simulations"], {
+                "home_score": API.BinaryDtypes.SCORE,
+                "away_score": API.BinaryDtypes.SCORE
+            })
+        })
+
+    @staticmethod
+    def _game_info(row: Tuple) -> Dict[str, Any]:
+        """Game payload from an (id, home, away, date, venue_id, venue_name) row."""
+        return {
+            "id": row[0],
+            "home_team": row[1],
+            "away_team": row[2],
+            "date": row[3],
+            "venue_id": row[4],
+            "venue_name": row[5] if row[5] else "Unknown Venue"
+        }
+
+    @staticmethod
+    def _pair_runs(
+        simulation_rows: List[Tuple[str, int, int]], home_team: str, away_team: str
+    ) -> Tuple[List[int], List[int], int]:
+        """Pair (team, simulation_run, results) rows by run.
+
+        Returns the home and away scores of the runs where both teams have a
+        result, as two parallel lists in the order the runs first appear, and
+        the number of them the home team won.
+        """
+        home_by_run = {}
+        away_by_run = {}
+        for team, sim_run, result in simulation_rows:
+            if team == home_team:
+                home_by_run[sim_run] = result
+            elif team == away_team:
+                away_by_run[sim_run] = result
+
+        home_scores = []
+        away_scores = []
+        for sim_run in dict.fromkeys(sim_run for _, sim_run, _ in simulation_rows):
+            if sim_run in home_by_run and sim_run in away_by_run:
+                home_scores.append(home_by_run[sim_run])
+                away_scores.append(away_by_run[sim_run])
+        home_wins = sum(map(operator.gt, home_scores, away_scores))
+        return home_scores, away_scores, home_wins
+
+    @staticmethod
+    def _bin_frequencies(
+        frequency_rows: List[Tuple[str, int, int]], home_team: str, away_team: str, bin_size: int
+    ) -> Dict[str, Any]:
+        """Binned histogram payload from (team, score, count) rows."""
+        scores = [score for _, score, _ in frequency_rows]
+        score_min = min(scores) if scores else 0
+        score_max = max(scores) if scores else 0
+        num_bins = (score_max - score_min) // bin_size + 1 if scores else 0
+
+        home_counts = [0] * num_bins
+        away_counts = [0] * num_bins
+        for team, score, count in frequency_rows:
+            counts = home_counts if team == home_team else away_counts
+            counts[(score - score_min) // bin_size] += count
+
+        return {
+            "version": API.HistogramVersions.BINNED,
+            "home_team": home_team,
+            "away_team": away_team,
+            "bin_size": bin_size,
+            "bin_start": score_min,
+            "home_counts": home_counts,
+            "away_counts": away_counts,
+            "home_total": sum(home_counts),
+            "away_total": sum(away_counts),
+            "score_range": {"min": score_min, "max": score_max}
+        }
+
+    async def _run_in_executor(self, func, *args):
+        # Carry the caller's context variables (e.g. the request profile) into the worker thread
+        context = contextvars.copy_context()
+        return await asyncio.get_event_loop().run_in_executor(None, functools.partial(context.run, func, *args))
+
+    @traced(Kinds.SERVICE)
+    def build_game_analysis(self, game_id: int) -> Optional[Dict[str, Any]]:
+        """Query and pair simulations for a game, with the per-run scores as columns (blocking)."""
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            SELECT
+                g.id,
+                g.home_team,
+                g.away_team,
+                g.date,
+                g.venue_id,
+                v.venue_name
+            FROM games g
+            LEFT JOIN venues v ON g.venue_id = v.venue_id
+            WHERE g.id = ?
+            """, (game_id,))
+            game_row = cursor.fetchone()
+
+            if not game_row:
+                return None
+
+            game_info = self._game_info(game_row)
+            home_team = game_info['home_team']
+            away_team = game_info['away_team']
+
+            logger.debug(f"Getting simulations for teams: {home_team}, {away_team}")
+            cursor.execute("""
+            SELECT
+                team,
+                simulation_run,
+                results
+            FROM simulations
+            WHERE team IN (?, ?)
+            ORDER BY simulation_run, team
+            """, (home_team, away_team))
+            simulation_rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        home_scores, away_scores, home_wins = self._pair_runs(simulation_rows, home_team, away_team)
+        total_simulations = len(home_scores)
+        home_win_probability = self._percentage(home_wins, total_simulations)
+
+        logger.debug(f"Generated analysis for game {game_id}: {total_simulations} simulations, {home_win_probability}% home win rate")
+        return {
+            "game": game_info,
+            "simulations": {"home_score": home_scores, "away_score": away_scores},
+            "home_win_probability": home_win_probability,
+            "total_simulations": total_simulations
+        }
+
+    @traced(Kinds.SERVICE)
+    def build_analysis_summaries(self, game_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Compute win probabilities for many games at once (blocking).
+
+        Uses one query for the games and one for all their teams' simulations,
+        then pairs runs and counts home wins with vectorized DataFrame joins.
+        """
+        if not game_ids:
+            return {}
+
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            placeholders = ",".join("?" * len(game_ids))
+            cursor.execute(f"""
+            SELECT
+                g.id,
+                g.home_team,
+                g.away_team,
+                g.date,
+                g.venue_id,
+                v.venue_name
+            FROM games g
+            LEFT JOIN venues v ON g.venue_id = v.venue_id
+            WHERE g.id IN ({placeholders})
+            """, list(game_ids))
+            game_rows = cursor.fetchall()
+            if not game_rows:
+                return {}
+
+            teams = sorted({team for row in game_rows for team in (row[1], row[2])})
+            placeholders = ",".join("?" * len(teams))
+            cursor.execute(f"""
+            SELECT team, simulation_run, results
+            FROM simulations
+            WHERE team IN ({placeholders})
+            """, teams)
+            simulation_rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        games = pd.DataFrame(game_rows, columns=["id", "home_team", "away_team", "date", "venue_id", "venue_name"])
+        simulations = pd.DataFrame(simulation_rows, columns=["team", "simulation_run", "results"])
+
+        home = games[["id", "home_team"]].merge(simulations, left_on="home_team", right_on="team")
+        away = games[["id", "away_team"]].merge(simulations, left_on="away_team", right_on="team")
+        paired = home[["id", "simulation_run", "results"]].merge(
+            away[["id", "simulation_run", "results"]],
+            on=["id", "simulation_run"],
+            suffixes=("_home", "_away")
+        )
+        paired["home_win"] = paired["results_home"] > paired["results_away"]
+        totals = paired.groupby("id")["home_win"].agg(["size", "sum"])
+
+        summaries = {}
+        for row in game_rows:
+            game_id = row[0]
+            if game_id in totals.index:
+                total_simulations = int(totals.at[game_id, "size"])
+                home_wins = int(totals.at[game_id, "sum"])
+            else:
+                total_simulations = home_wins = 0
+            summaries[game_id] = {
+                "game": self._game_info(row),
+                "home_win_probability": self._percentage(home_wins, total_simulations),
+                "total_simulations": total_simulations
+            }
+        return summaries
+
+    @traced(Kinds.SERVICE)
+    def build_overview(self) -> Dict[str, Any]:
+        """Read the per-game counts materialized at load time (blocking)."""
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(Database.Queries.SELECT_GAME_OVERVIEW)
+            rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        games = []
+        for row in rows:
+            total_simulations, home_wins, ties = row[6:]
+            games.append({
+                **self._game_info(row),
+                "home_win_probability": self._percentage(home_wins, total_simulations),
+                "tie_rate": self._percentage(ties, total_simulations),
+                "total_simulations": total_simulations
+            })
+        return {"games": games}
+
+    @traced(Kinds.SERVICE)
+    def build_histogram_bins(self, game_id: int, bin_size: int) -> Optional[Dict[str, Any]]:
+        """Bin both teams' scores from per-score frequencies (blocking).
+
+        Only the aggregated (team, score, count) rows leave SQLite, so the
+        work and the payload depend on the score range, not the run count.
+        Bin ``i`` covers ``bin_start + i * bin_size`` up to the next bin.
+        """
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            SELECT home_team, away_team
+            FROM games
+            WHERE id = ?
+            """, (game_id,))
+            game_row = cursor.fetchone()
+
+            if not game_row:
+                return None
+
+            home_team, away_team = game_row
+
+            cursor.execute("""
+            SELECT team, results, COUNT(*)
+            FROM simulations
+            WHERE team IN (?, ?)
+            GROUP BY team, results
+            """, (home_team, away_team))
+            frequency_rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        return self._bin_frequencies(frequency_rows, home_team, away_team, bin_size)
+
+    @traced(Kinds.SERVICE)
+    def build_game_bundle(self, game_id: int, bin_size: int) -> Optional[Dict[str, Any]]:
+        """Build game info, analysis aggregates and histogram bins together (blocking).
+
+        Reads the game row and both teams' simulations once and derives the
+        win probability and the binned score distribution from the same rows.
+        """
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            SELECT
+                g.id,
+                g.home_team,
+                g.away_team,
+                g.date,
+                g.venue_id,
+                v.venue_name
+            FROM games g
+            LEFT JOIN venues v ON g.venue_id = v.venue_id
+            WHERE g.id = ?
+            """, (game_id,))
+            game_row = cursor.fetchone()
+
+            if not game_row:
+                return None
+
+            game_info = self._game_info(game_row)
+            home_team = game_info['home_team']
+            away_team = game_info['away_team']
+
+            cursor.execute("""
+            SELECT
+                team,
+                simulation_run,
+                results
+            FROM simulations
+            WHERE team IN (?, ?)
+            ORDER BY simulation_run, team
+            """, (home_team, away_team))
+            simulation_rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        home_scores, _, home_wins = self._pair_runs(simulation_rows, home_team, away_team)
+        frequencies = Counter((team, score) for team, _, score in simulation_rows)
+        frequency_rows = [(team, score, count) for (team, score), count in frequencies.items()]
+
+        return {
+            "game": game_info,
+            "home_win_probability": self._percentage(home_wins, len(home_scores)),
+            "total_simulations": len(home_scores),
+            "histogram": self._bin_frequencies(frequency_rows, home_team, away_team, bin_size)
+        }
+
+    @traced(Kinds.SERVICE)
+    def build_histogram_data(self, game_id: int) -> Optional[Dict[str, Any]]:
+        """Query score distributions for both teams of a game (blocking)."""
+        conn = self.db_manager.get_connection()
+        try:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+            SELECT home_team, away_team
+            FROM games
+            WHERE id = ?
+            """, (game_id,))
+            game_row = cursor.fetchone()
+
+            if not game_row:
+                return None
+
+            home_team, away_team = game_row
+
+            logger.debug(f"Getting simulation data for teams: {home_team}, {away_team}")
+            cursor.execute("""
+            SELECT team, results
+            FROM simulations
+            WHERE team IN (?, ?)
+            """, (home_team, away_team))
+            simulation_rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        home_scores = []
+        away_scores = []
+        for team, score in simulation_rows:
+            if team == home_team:
+                home_scores.append(score)
+            elif team == away_team:
+                away_scores.append(score)
+
+        all_scores = home_scores + away_scores
+        if all_scores:
+            score_range = {"min": min(all_scores), "max": max(all_scores)}
+        else:
+            score_range = {"min": 0, "max": 0}
+
+        # Frequency keys are strings, as expected by the frontend
+        home_frequency = {str(score): count for score, count in Counter(home_scores).items()}
+        away_frequency = {str(score): count for score, count in Counter(away_scores).items()}
+
+        logger.debug(f"Generated histogram data for game {game_id}: {len(home_scores)} home scores, {len(away_scores)} away scores")
+        return {
+            "home_team": home_team,
+            "away_team": away_team,
+            "home_scores": home_scores,
+            "away_scores": away_scores,
+            "home_frequency": home_frequency,
+            "away_frequency": away_frequency,
+            "score_range": score_range
+        }
+
+
+# Singleton instance so concurrent requests share in-flight computations
+game_analysis_service = GameAnalysisService(
+    db_manager,
+    ResultStore(db_manager) if db_manager.config.persistent_cache_enabled else None,
+    db_manager.config.cache_max_bytes
+)
@@ -3,10 +3,11 @@
 
 from typing import List, Optional
 from ..models.game import Game
-from ..models.simulation import GameAnalysis, HistogramData, Simulation
+from ..models.simulation import GameAnalysis, HistogramData
 from ..database.repositories.game_repository import GameRepository
 from ..database.repositories.simulation_repository import SimulationRepository
 from ..constants import BusinessLogic, ErrorMessages
+from ..monitoring.tracing import Kinds, traced
 from collections import Counter
 import math
 
@@ -18,56 +19,59 @@ class GameService:
         self.game_repo = game_repo
         self.simulation_repo = simulation_repo
     
+    @traced(Kinds.SERVICE)
     async def get_all_games(self) -> List[Game]:
         """Get all games with venue information."""
         return await self.game_repo.find_all_with_venues()
     
+    @traced(Kinds.SERVICE)
     async def get_game_by_id(self, game_id: int) -> Optional[Game]:
         """Get game by ID with venue information."""
         return await self.game_repo.find_with_venue(game_id)
     
+    @traced(Kinds.SERVICE)
     async def get_game_analysis(self, game_id: int) -> Optional[GameAnalysis]:
         """Get complete game analysis with simulations and win probability."""
         game = await self.get_game_by_id(game_id)
         if not game:
             return None
         
-        simulations = await self.simulation_repo.get_game_simulations(
+        score_pairs = await self.simulation_repo.get_game_simulations(
             game.home_team, game.away_team
         )
         
-        if not simulations:
+        if not score_pairs:
             return None
         
-        home_wins = sum(1 for sim in simulations if sim.home_wins)
-        total_sims = len(simulations)
+        home_wins = sum(1 for pair in score_pairs if pair.home_wins)
+        total_sims = len(score_pairs)
         win_probability = round(
             (home_wins / total_sims) * BusinessLogic.WinProbability.PERCENTAGE_MULTIPLIER,
             BusinessLogic.WinProbability.DECIMAL_PLACES
         )
         
-        return GameAnalysis(
+        # The scores were validated when they were loaded, so the analysis
+        # keeps the repository's ScorePair tuples without validating them again
+        return GameAnalysis.model_construct(
             game_id=game_id,
-            simulations=simulations,
+            simulations=score_pairs,
             home_win_probability=win_probability,
             total_simulations=total_sims
         )
     
+    @traced(Kinds.SERVICE)
     async def get_histogram_data(self, game_id: int) -> Optional[HistogramData]:
         """Get histogram data for game visualization."""
         game = await self.get_game_by_id(game_id)
         if not game:
             return None
         
-        home_simulations = await self.simulation_repo.find_by_team(game.home_team)
-        away_simulations = await self.simulation_repo.find_by_team(game.away_team)
+        home_scores = await self.simulation_repo.get_team_scores(game.home_team)
+        away_scores = await self.simulation_repo.get_team_scores(game.away_team)
         
-        if not home_simulations or not away_simulations:
+        if not home_scores or not away_scores:
             return None
         
-        home_scores = [sim.results for sim in home_simulations]
-        away_scores = [sim.results for sim in away_simulations]
-        
         all_scores = home_scores + away_scores
         score_range = (min(all_scores), max(all_scores))
         
@@ -79,6 +83,7 @@ class GameService:
             score_range=score_range
         )
     
+    @traced(Kinds.SERVICE)
     async def find_games_by_teams(self, home_team: str, away_team: str) -> List[Game]:
         """Find games by team names."""
         return await self.game_repo.find_by_teams(home_team, away_team)
@@ -0,0 +1,125 @@
+"""In-memory cache of computed API payloads."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import orjson
+
+from ..constants import Performance
+
+
+class CachedPayload:
+    """A computed payload, kept as its JSON encoding.
+
+    Built either from the payload data (fresh computation) or from encoded
+    bytes (persistent store), so cache hits can be sent without serializing.
+    The data is encoded on first use of ``body`` and then dropped, so a cached
+    payload holds only its bytes; ``data`` decodes them again when needed.
+    A payload may also be built from bytes in another encoding (e.g. a
+    MessagePack response body), in which case only ``body`` is used.
+    """
+
+    __slots__ = ("_data", "_body")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, body: Optional[bytes] = None):
+        if data is None and body is None:
+            raise ValueError("CachedPayload needs data or body")
+        self._data = data
+        self._body = body
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Payload as Python objects (decoded on each use once encoded)."""
+        if self._data is not None:
+            return self._data
+        return orjson.loads(self._body)
+
+    @property
+    def body(self) -> bytes:
+        """Payload encoded as JSON."""
+        if self._body is None:
+            self._body = orjson.dumps(self._data, option=orjson.OPT_SERIALIZE_NUMPY)
+            self._data = None
+        return self._body
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the encoded payload."""
+        return len(self.body)
+
+
+class ResultCache:
+    """Thread-safe LRU cache for computed payloads, bounded by encoded size.
+
+    Entries only depend on the loaded data, so there is no TTL; the cache is
+    cleared whenever the data is reloaded. Least recently used entries are
+    evicted once the payloads' encoded bytes exceed ``max_bytes``; a payload
+    larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_bytes: int = Performance.Cache.MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: "OrderedDict[Hashable, CachedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        """Get a cached payload, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def set(self, key: Hashable, value: CachedPayload, evict: bool = True) -> bool:
+        """Store a payload, evicting least recently used entries to fit it.
+
+        With ``evict=False`` the payload is only stored if it fits without
+        evicting anything. Returns whether it was stored.
+        """
+        size = value.nbytes  # encodes outside the lock
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            previous = self._entries.get(key)
+            if not evict and self.nbytes - (previous.nbytes if previous else 0) + size > self.max_bytes:
+                return False
+            if previous is not None:
+                del self._entries[key]
+                self.nbytes -= previous.nbytes
+            self._entries[key] = value
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+            return True
+
+    def clear(self) -> None:
+        """Drop all cached payloads."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        return {
+            "size": len(self._entries),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
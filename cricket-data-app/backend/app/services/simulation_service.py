@@ -5,9 +5,10 @@
 
 from typing import List, Dict
 from collections import Counter
-from ..models.simulation import TeamSimulation
+from ..models.records import SimulationRecord
 from ..database.repositories.simulation_repository import SimulationRepository
 from ..constants import BusinessLogic
+from ..monitoring.tracing import Kinds, traced
 
 
 class SimulationService:
@@ -16,19 +17,23 @@ class SimulationService:
     def __init__(self, simulation_repo: SimulationRepository):
         self.simulation_repo = simulation_repo
     
-    async def get_team_simulations(self, team_name: str) -> List[TeamSimulation]:
+    @traced(Kinds.SERVICE)
+    async def get_team_simulations(self, team_name: str) -> List[SimulationRecord]:
         """Get all simulations for a team."""
         return await self.simulation_repo.find_by_team(team_name)
     
+    @traced(Kinds.SERVICE)
     async def get_all_team_names(self) -> List[str]:
         """Get all unique team names."""
         return await self.simulation_repo.get_team_names()
     
+    @traced(Kinds.SERVICE)
     async def get_team_score_distribution(self, team_name: str) -> Dict[int, int]:
         """Get score distribution for a team."""
         distribution = await self.simulation_repo.get_score_distribution(team_name)
         return dict(distribution)
     
+    @traced(Kinds.SERVICE)
     async def get_team_statistics(self, team_name: str) -> Dict[str, float]:
         """Calculate team statistics."""
         simulations = await self.get_team_simulations(team_name)
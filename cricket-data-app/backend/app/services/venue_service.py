@@ -2,6 +2,7 @@
 from typing import List, Optional
 from ..models.venue import Venue
 from ..database.repositories.venue_repository import VenueRepository
+from ..monitoring.tracing import Kinds, traced
 
 
 class VenueService:
@@ -10,14 +11,17 @@ class VenueService:
     def __init__(self, venue_repo: VenueRepository):
         self.venue_repo = venue_repo
     
+    @traced(Kinds.SERVICE)
     async def get_all_venues(self) -> List[Venue]:
         """Get all venues."""
         return await self.venue_repo.find_all()
     
+    @traced(Kinds.SERVICE)
     async def get_venue_by_id(self, venue_id: int) -> Optional[Venue]:
         """Get venue by ID."""
         return await self.venue_repo.find_by_id(venue_id)
     
+    @traced(Kinds.SERVICE)
     async def get_venue_by_name(self, name: str) -> Optional[Venue]:
         """Get venue by name."""
         return await self.venue_repo.find_by_name(name)
@@ -0,0 +1,90 @@
+"""Benchmark response serialization: FastAPI's default path vs FastJSONResponse.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization --runs 1000 10000 100000
+"""
+
+import argparse
+import random
+import timeit
+from typing import Any, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.responses.encoding import FastJSONResponse
+from app.services.result_cache import CachedPayload
+
+
+def make_analysis_payload(runs: int, seed: int = 0) -> Dict[str, Any]:
+    """Build an analysis payload shaped like /games/{id}/analysis."""
+    rng = random.Random(seed)
+    simulations = [
+        {"home_score": rng.randint(80, 220), "away_score": rng.randint(80, 220)}
+        for _ in range(runs)
+    ]
+    home_wins = sum(1 for sim in simulations if sim["home_score"] > sim["away_score"])
+    return {
+        "game": {
+            "id": 1,
+            "home_team": "Doncaster Renegades",
+            "away_team": "Hull Stars",
+            "date": "2024-03-24",
+            "venue_id": 2,
+            "venue_name": "The Square"
+        },
+        "simulations": simulations,
+        "home_win_probability": round(home_wins / runs * 100, 2),
+        "total_simulations": runs
+    }
+
+
+def _best_seconds(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(runs_list: List[int], repeat: int = 5) -> List[Dict[str, Any]]:
+    """Time each serialization path for payloads of each size."""
+    results = []
+    for runs in runs_list:
+        payload = make_analysis_payload(runs)
+        cached = CachedPayload(data=payload)
+        body = cached.body
+
+        paths = {
+            # What FastAPI does for a returned dict: jsonable_encoder + json.dumps
+            "default": lambda: JSONResponse(jsonable_encoder(payload)).body,
+            "fast_json": lambda: FastJSONResponse(payload).body,
+            "pre_encoded": lambda: FastJSONResponse(cached.body).body,
+        }
+        timings = {name: _best_seconds(func, repeat) for name, func in paths.items()}
+        results.append({
+            "runs": runs,
+            "bytes": len(body),
+            "seconds": timings,
+            "speedup_fast_json": timings["default"] / timings["fast_json"],
+            "speedup_pre_encoded": timings["default"] / timings["pre_encoded"],
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'runs':>8} {'bytes':>10} {'default ms':>11} {'fast ms':>9} {'cached ms':>10} {'fast x':>7} {'cached x':>9}")
+    for result in run(args.runs, args.repeat):
+        seconds = result["seconds"]
+        print(
+            f"{result['runs']:>8} {result['bytes']:>10} "
+            f"{seconds['default'] * 1000:>11.2f} {seconds['fast_json'] * 1000:>9.2f} "
+            f"{seconds['pre_encoded'] * 1000:>10.3f} "
+            f"{result['speedup_fast_json']:>7.1f} {result['speedup_pre_encoded']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
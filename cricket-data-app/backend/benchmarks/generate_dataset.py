@@ -0,0 +1,322 @@
+"""Generate synthetic venues, games and simulations data at any scale.
+
+Writes ``venues.csv``, ``games.csv`` and ``simulations.csv`` in the layout of
+``data/`` (optionally also as Parquet) so the app and the benchmarks can be
+run against realistic volumes. Run from the backend directory:
+
+    python -m benchmarks.generate_dataset --scale medium
+    python -m benchmarks.generate_dataset --teams 2000 --runs 50000 --games 20000 --out /tmp/big
+    python -m benchmarks.generate_dataset --scale small --distribution gamma --format csv parquet
+
+Output is reproducible: each team's scores come from a generator seeded
+with ``(seed, team_id, block)``, so the same seed gives the same files
+whatever ``--chunk-rows`` is. Simulations are generated and written in
+chunks of whole teams (large teams in blocks of runs), so memory stays
+bounded at any size.
+"""
+
+import argparse
+import os
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.constants import BusinessLogic, Database
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - Parquet output is optional
+    pa = None
+    pq = None
+
+DEFAULT_OUTPUT_ROOT = os.path.join(os.path.dirname(__file__), "data")
+
+# Runs generated per seeded block; fixed so output does not depend on --chunk-rows
+RUN_BLOCK = 1_000_000
+
+TOWNS = [
+    "Doncaster", "Hull", "Oldham", "Rochdale", "Peterborough", "Huddersfield", "Morecambe", "Wigan",
+    "Bolton", "Bradford", "Barnsley", "Blackburn", "Burnley", "Carlisle", "Chester", "Derby",
+    "Durham", "Exeter", "Gloucester", "Grimsby", "Halifax", "Harrogate", "Ipswich", "Kendal",
+    "Lancaster", "Leicester", "Lincoln", "Luton", "Macclesfield", "Middlesbrough", "Norwich", "Preston",
+    "Reading", "Salford", "Scarborough", "Sheffield", "Stockport", "Sunderland", "Swindon", "Taunton",
+    "Wakefield", "Warrington", "Worcester", "York", "Bath", "Canterbury", "Colchester", "Hereford"
+]
+NICKNAMES = [
+    "Renegades", "Stars", "Super Kings", "Hurricanes", "Strikers", "Heat", "Titans", "Royals",
+    "Knights", "Chargers", "Warriors", "Thunder", "Falcons", "Panthers", "Giants", "Rockets",
+    "Vikings", "Sixers", "Blaze", "Outlaws"
+]
+GROUND_TYPES = ["Cricket Ground", "Oval", "County Ground", "Park", "Road", "Green"]
+
+DISTRIBUTIONS = ["normal", "gamma", "uniform"]
+
+
+class DatasetSpec:
+    """Size and score distribution of a generated dataset."""
+
+    def __init__(
+        self,
+        venues: int,
+        teams: int,
+        games: int,
+        runs: int,
+        distribution: str = "normal",
+        mean: float = 150.0,
+        std: float = 25.0,
+        team_spread: float = 10.0,
+        seed: int = 0
+    ):
+        if teams < 2:
+            raise ValueError("At least two teams are needed to schedule games")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Distribution must be one of: {DISTRIBUTIONS}")
+        self.venues = venues
+        self.teams = teams
+        self.games = games
+        self.runs = runs  # simulation runs per team
+        self.distribution = distribution
+        self.mean = mean
+        self.std = std
+        self.team_spread = team_spread  # std of per-team strength around ``mean``
+        self.seed = seed
+
+    @property
+    def simulation_rows(self) -> int:
+        return self.teams * self.runs
+
+
+# Presets shared by the benchmark suite
+SCALES: Dict[str, DatasetSpec] = {
+    "small": DatasetSpec(venues=10, teams=20, games=100, runs=1_000),  # 20K simulation rows
+    "medium": DatasetSpec(venues=25, teams=100, games=1_000, runs=10_000),  # 1M
+    "large": DatasetSpec(venues=50, teams=1_000, games=5_000, runs=10_000),  # 10M
+    "xlarge": DatasetSpec(venues=100, teams=2_000, games=20_000, runs=50_000),  # 100M
+}
+
+
+def _unique_names(count: int, first: List[str], second: List[str], joiner: str = " ") -> List[str]:
+    """``count`` distinct "<first> <second>" names, numbered once combinations run out."""
+    names = []
+    generation = 0
+    while len(names) < count:
+        suffix = f" {generation + 1}" if generation else ""
+        for nickname in second:
+            for town in first:
+                names.append(f"{town}{joiner}{nickname}{suffix}")
+                if len(names) == count:
+                    return names
+        generation += 1
+    return names
+
+
+def team_names(count: int) -> List[str]:
+    return _unique_names(count, TOWNS, NICKNAMES)
+
+
+def venue_names(count: int) -> List[str]:
+    return _unique_names(count, TOWNS, GROUND_TYPES)
+
+
+def generate_venues(spec: DatasetSpec) -> pd.DataFrame:
+    return pd.DataFrame({
+        Database.Columns.VENUE_ID: np.arange(spec.venues, dtype=np.int32),
+        Database.Columns.VENUE_NAME: venue_names(spec.venues)
+    })
+
+
+def generate_games(spec: DatasetSpec, names: List[str]) -> pd.DataFrame:
+    """Fixtures between random distinct teams over one season."""
+    rng = np.random.default_rng([spec.seed, 1])
+    home = rng.integers(0, spec.teams, spec.games)
+    # Shift away teams by 1..teams-1 so nobody plays themselves
+    away = (home + rng.integers(1, spec.teams, spec.games)) % spec.teams
+    season_start = date(2024, 3, 1)
+    days = np.sort(rng.integers(0, 200, spec.games))
+    names_array = np.array(names, dtype=object)
+    return pd.DataFrame({
+        Database.Columns.HOME_TEAM: names_array[home],
+        Database.Columns.AWAY_TEAM: names_array[away],
+        Database.Columns.DATE: [(season_start + timedelta(days=int(day))).isoformat() for day in days],
+        Database.Columns.GAME_VENUE_ID: rng.integers(0, max(spec.venues, 1), spec.games, dtype=np.int32)
+    })
+
+
+def _team_strengths(spec: DatasetSpec) -> np.ndarray:
+    return np.random.default_rng([spec.seed, 2]).normal(0.0, spec.team_spread, spec.teams)
+
+
+def _scores(spec: DatasetSpec, team_id: int, strength: float, block: int, size: int) -> np.ndarray:
+    rng = np.random.default_rng([spec.seed, 3, team_id, block])
+    mean = spec.mean + strength
+    if spec.distribution == "normal":
+        values = rng.normal(mean, spec.std, size)
+    elif spec.distribution == "gamma":
+        # Right-skewed, with the requested mean and standard deviation
+        shape = (mean / spec.std) ** 2
+        values = rng.gamma(shape, mean / shape, size)
+    else:
+        half_width = spec.std * np.sqrt(3)
+        values = rng.uniform(mean - half_width, mean + half_width, size)
+    return np.clip(np.rint(values), BusinessLogic.DataLimits.MIN_SCORE, BusinessLogic.DataLimits.MAX_SCORE).astype(np.int16)
+
+
+def simulation_chunks(spec: DatasetSpec, names: List[str], chunk_rows: int) -> Iterator[List[Tuple[int, str, int, np.ndarray]]]:
+    """Yield lists of ``(team_id, team, first_run, scores)`` segments of about ``chunk_rows`` rows."""
+    strengths = _team_strengths(spec)
+    chunk: List[Tuple[int, str, int, np.ndarray]] = []
+    rows = 0
+    for team_id, name in enumerate(names):
+        for block_start in range(0, spec.runs, RUN_BLOCK):
+            size = min(RUN_BLOCK, spec.runs - block_start)
+            scores = _scores(spec, team_id, strengths[team_id], block_start // RUN_BLOCK, size)
+            # Split blocks larger than a chunk so memory stays bounded
+            for offset in range(0, size, chunk_rows):
+                part = scores[offset:offset + chunk_rows]
+                chunk.append((team_id, name, block_start + offset + 1, part))
+                rows += len(part)
+                if rows >= chunk_rows:
+                    yield chunk
+                    chunk, rows = [], 0
+    if chunk:
+        yield chunk
+
+
+_SCORE_TEXT = np.array([str(score) for score in range(BusinessLogic.DataLimits.MAX_SCORE + 1)], dtype=object)
+
+
+def _csv_lines(team_id: int, name: str, first_run: int, scores: np.ndarray) -> str:
+    # Formatting rows directly is several times faster than DataFrame.to_csv
+    prefix = f"{team_id},{_csv_field(name)},"
+    return "".join([
+        f"{prefix}{run},{score}\n"
+        for run, score in zip(range(first_run, first_run + len(scores)), _SCORE_TEXT[scores])
+    ])
+
+
+def _csv_field(value: str) -> str:
+    if any(char in value for char in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _segments_table(segments: List[Tuple[int, str, int, np.ndarray]]):
+    lengths = [len(scores) for _, _, _, scores in segments]
+    return pa.table({
+        Database.Columns.TEAM_ID: np.repeat([team_id for team_id, _, _, _ in segments], lengths).astype(np.int32),
+        Database.Columns.TEAM: np.repeat(np.array([name for _, name, _, _ in segments], dtype=object), lengths),
+        Database.Columns.SIMULATION_RUN: np.concatenate([
+            np.arange(first_run, first_run + len(scores), dtype=np.int32) for _, _, first_run, scores in segments
+        ]),
+        Database.Columns.RESULTS: np.concatenate([scores for _, _, _, scores in segments])
+    })
+
+
+def write_dataset(
+    spec: DatasetSpec,
+    out_dir: str,
+    formats: Tuple[str, ...] = ("csv",),
+    chunk_rows: int = 1_000_000,
+    progress: bool = False
+) -> Dict[str, str]:
+    """Write the dataset to ``out_dir``; returns the paths written by file name."""
+    if "parquet" in formats and pq is None:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)")
+    os.makedirs(out_dir, exist_ok=True)
+    names = team_names(spec.teams)
+    paths: Dict[str, str] = {}
+
+    for stem, frame in (("venues", generate_venues(spec)), ("games", generate_games(spec, names))):
+        if "csv" in formats:
+            paths[f"{stem}.csv"] = os.path.join(out_dir, f"{stem}.csv")
+            frame.to_csv(paths[f"{stem}.csv"], index=False)
+        if "parquet" in formats:
+            paths[f"{stem}.parquet"] = os.path.join(out_dir, f"{stem}.parquet")
+            frame.to_parquet(paths[f"{stem}.parquet"], index=False)
+
+    csv_file = None
+    parquet_writer: Optional["pq.ParquetWriter"] = None
+    if "csv" in formats:
+        paths["simulations.csv"] = os.path.join(out_dir, "simulations.csv")
+        csv_file = open(paths["simulations.csv"], "w", encoding="utf-8", newline="")
+        csv_file.write(",".join([
+            Database.Columns.TEAM_ID, Database.Columns.TEAM, Database.Columns.SIMULATION_RUN, Database.Columns.RESULTS
+        ]) + "\n")
+    if "parquet" in formats:
+        paths["simulations.parquet"] = os.path.join(out_dir, "simulations.parquet")
+
+    written = 0
+    start_time = time.perf_counter()
+    try:
+        for segments in simulation_chunks(spec, names, chunk_rows):
+            if csv_file is not None:
+                csv_file.write("".join(_csv_lines(*segment) for segment in segments))
+            if "parquet" in formats:
+                table = _segments_table(segments)
+                if parquet_writer is None:
+                    parquet_writer = pq.ParquetWriter(paths["simulations.parquet"], table.schema)
+                parquet_writer.write_table(table)
+            written += sum(len(scores) for _, _, _, scores in segments)
+            if progress:
+                elapsed = time.perf_counter() - start_time
+                print(f"  {written:,}/{spec.simulation_rows:,} simulation rows ({written / elapsed:,.0f} rows/s)")
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+    return paths
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    base = SCALES[args.scale]
+    return DatasetSpec(
+        venues=args.venues if args.venues is not None else base.venues,
+        teams=args.teams if args.teams is not None else base.teams,
+        games=args.games if args.games is not None else base.games,
+        runs=args.runs if args.runs is not None else base.runs,
+        distribution=args.distribution,
+        mean=args.mean,
+        std=args.std,
+        team_spread=args.team_spread,
+        seed=args.seed
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="Preset sizes; flags below override them")
+    parser.add_argument("--venues", type=int)
+    parser.add_argument("--teams", type=int)
+    parser.add_argument("--games", type=int)
+    parser.add_argument("--runs", type=int, help="Simulation runs per team")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="normal", help="Score distribution")
+    parser.add_argument("--mean", type=float, default=150.0, help="Mean score")
+    parser.add_argument("--std", type=float, default=25.0, help="Score standard deviation within a team")
+    parser.add_argument("--team-spread", type=float, default=10.0, help="Standard deviation of team strength")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", nargs="+", choices=["csv", "parquet"], default=["csv"], dest="formats")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="Simulation rows generated per chunk")
+    parser.add_argument("--out", help="Output directory (default: benchmarks/data/<scale>)")
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    out_dir = args.out or os.path.join(DEFAULT_OUTPUT_ROOT, args.scale)
+    print(
+        f"Generating {spec.venues:,} venues, {spec.teams:,} teams, {spec.games:,} games and "
+        f"{spec.simulation_rows:,} simulation rows into {out_dir}"
+    )
+    start_time = time.perf_counter()
+    paths = write_dataset(spec, out_dir, tuple(args.formats), args.chunk_rows, progress=True)
+    elapsed = time.perf_counter() - start_time
+    for name, path in sorted(paths.items()):
+        print(f"  {name}: {os.path.getsize(path) / 1e6:,.1f} MB")
+    print(f"Done in {elapsed:.1f}s ({spec.simulation_rows / elapsed:,.0f} simulation rows/s)")
+
+
+if __name__ == "__main__":
+    main()
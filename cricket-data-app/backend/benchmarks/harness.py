@@ -0,0 +1,170 @@
+"""Shared setup for the benchmarks that drive the application.
+
+The app reads its settings when ``app.config`` is first imported, so a
+benchmark process calls ``configure_environment`` before importing any
+``app`` module (the runners do their app imports inside functions).
+"""
+
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from .generate_dataset import DEFAULT_OUTPUT_ROOT, SCALES, write_dataset
+
+# (name, method, path, JSON body); paths are filled in per dataset by route_cases
+RouteCase = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+
+def ensure_dataset(scale: str, root: str = DEFAULT_OUTPUT_ROOT) -> str:
+    """Directory holding the ``scale`` preset's CSVs, generating them if missing."""
+    data_dir = os.path.join(root, scale)
+    if not all(os.path.exists(os.path.join(data_dir, f"{stem}.csv")) for stem in ("venues", "games", "simulations")):
+        log(f"Generating {scale} dataset in {data_dir}")
+        write_dataset(SCALES[scale], data_dir)
+    return data_dir
+
+
+def configure_environment(data_dir: str, work_dir: str, **overrides: str) -> None:
+    """Point the app at ``data_dir`` with a fresh database in ``work_dir`` and quiet logging."""
+    os.environ.update({
+        "DATA_DIRECTORY": data_dir,
+        "DATABASE_PATH": os.path.join(work_dir, "benchmark.db"),
+        "LOG_FILE": os.path.join(work_dir, "benchmark.log"),
+        "LOG_LEVEL": "WARNING",
+        "ACCESS_LOG_SAMPLE_RATE": "0",
+        "SLOW_QUERY_LOG_ENABLED": "false",
+        "WARMUP_ON_STARTUP": "false",
+        **overrides
+    })
+
+
+def load_data() -> Dict[str, Any]:
+    """Create the schema and load the CSVs; returns timing and row counts."""
+    from app.database.connection import db_manager
+    from app.services.data_loader import DataLoaderService
+
+    start_time = time.perf_counter()
+    db_manager.init_database()
+    loader = DataLoaderService()
+    if not loader.load_all_csv_data():
+        raise RuntimeError("Loading the benchmark dataset failed")
+    seconds = time.perf_counter() - start_time
+
+    tables = loader.get_data_status()["tables_info"]
+    rows = sum(table["row_count"] for table in tables.values())
+    return {"seconds": seconds, "rows": rows, "rows_per_sec": rows / seconds, "tables": tables}
+
+
+def sample_keys(count: int) -> Dict[str, List[Any]]:
+    """Game IDs, teams and venues spread over the loaded data, for varying request arguments."""
+    from app.database.connection import db_manager
+
+    conn = db_manager.get_connection()
+    try:
+        total_games = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        step = max(total_games // count, 1)
+        games = conn.execute(
+            "SELECT id, home_team, away_team, venue_id FROM games WHERE (id - 1) % ? = 0 ORDER BY id LIMIT ?",
+            (step, count)
+        ).fetchall()
+        venues = conn.execute("SELECT venue_id, venue_name FROM venues ORDER BY venue_id LIMIT ?", (count,)).fetchall()
+    finally:
+        conn.close()
+    return {
+        "game_ids": [game[0] for game in games],
+        "matchups": [(game[1], game[2]) for game in games],
+        "teams": list(dict.fromkeys(team for game in games for team in game[1:3]))[:count],
+        "venue_ids": [venue[0] for venue in venues],
+        "venue_names": [venue[1] for venue in venues],
+    }
+
+
+def route_cases(keys: Dict[str, List[Any]], batch_size: int = 50) -> List[Tuple[str, bool, List[RouteCase]]]:
+    """``(name, cold, requests)`` per route; requests cycle over the sampled keys.
+
+    ``cold`` cases clear the analysis cache before each request so the
+    computation is measured rather than the cached payload.
+    """
+    game_ids = keys["game_ids"]
+    teams = [quote(team) for team in keys["teams"]]
+
+    def per_game(path: str) -> List[RouteCase]:
+        return [("GET", path.format(game_id=game_id), None) for game_id in game_ids]
+
+    return [
+        ("GET /health", False, [("GET", "/health", None)]),
+        ("GET /venues/", False, [("GET", "/venues/", None)]),
+        ("GET /games/", False, [("GET", "/games/", None)]),
+        ("GET /games/?team=", False, [("GET", f"/games/?team={team}", None) for team in teams]),
+        ("GET /games/overview", False, [("GET", "/games/overview", None)]),
+        ("GET /games/{id}/analysis", False, per_game("/games/{game_id}/analysis")),
+        ("GET /games/{id}/analysis (cold)", True, per_game("/games/{game_id}/analysis")),
+        ("GET /games/{id}/analysis?format=columnar", False, per_game("/games/{game_id}/analysis?format=columnar")),
+        ("GET /games/{id}/histogram-data", False, per_game("/games/{game_id}/histogram-data")),
+        ("GET /games/{id}/histogram-data (cold)", True, per_game("/games/{game_id}/histogram-data")),
+        ("GET /games/{id}/histogram-data?version=2", False, per_game("/games/{game_id}/histogram-data?version=2")),
+        ("GET /games/{id}/bundle", False, per_game("/games/{game_id}/bundle")),
+        ("GET /games/{id}/bundle (cold)", True, per_game("/games/{game_id}/bundle")),
+        ("POST /games/analysis:batch (cold)", True, [("POST", "/games/analysis:batch", {"ids": game_ids[:batch_size]})]),
+        ("GET /simulations/{team}", False, [("GET", f"/simulations/{team}", None) for team in teams]),
+        ("GET /simulations/{team}?stream=true", False, [("GET", f"/simulations/{team}?stream=true", None) for team in teams]),
+    ]
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds (nearest-rank percentiles)."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, max(math.ceil(fraction * len(ordered)) - 1, 0))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_worker(module: str, scale: str, args: Sequence[str] = ()) -> Dict[str, Any]:
+    """Run ``python -m module --worker scale --output FILE *args`` and return the JSON it writes.
+
+    Each scale gets a fresh process, so settings, caches and peak memory
+    measurements do not carry over from the previous one.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as output:
+        output_path = output.name
+    try:
+        subprocess.run(
+            [sys.executable, "-m", module, "--worker", scale, "--output", output_path, *args],
+            check=True,
+            stdout=subprocess.DEVNULL
+        )
+        with open(output_path) as f:
+            return json.load(f)
+    finally:
+        os.unlink(output_path)
+
+
+def log(message: str) -> None:
+    """Progress output; stderr, so stdout stays clean for results."""
+    print(message, file=sys.stderr, flush=True)
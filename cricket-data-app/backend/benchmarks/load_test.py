@@ -0,0 +1,293 @@
+"""Load test: a route mix at increasing concurrency, against the ASGI app or a local uvicorn.
+
+Run from the backend directory:
+
+    python -m benchmarks.load_test --scale medium --concurrency 1 4 16 64 256
+    python -m benchmarks.load_test --target uvicorn --mix analysis=8 bundle=1 games=1
+
+Each level runs ``--concurrency`` client tasks that send requests back to
+back for ``--duration`` seconds, each picking a route from the weighted
+``--mix`` and a game from ``--games`` sampled IDs. Per level it reports
+throughput, latency percentiles, error rate and event-loop lag, and names
+the saturation knee: the last level that still raised throughput by at
+least ``KNEE_MIN_GAIN``.
+
+Event-loop lag is how late a 10 ms sleep on this process's loop wakes up.
+With ``--target asgi`` that loop also runs the app, so it is the server's
+lag; with ``--target uvicorn`` the server runs in its own process, and the
+latency of a ``/health`` probe sent alongside the load stands in for it.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from .harness import configure_environment, ensure_dataset, load_data, log, percentiles, sample_keys
+
+ROUTES = {
+    "analysis": "/games/{game_id}/analysis",
+    "columnar": "/games/{game_id}/analysis?format=columnar",
+    "histogram": "/games/{game_id}/histogram-data",
+    "bundle": "/games/{game_id}/bundle",
+    "game": "/games/{game_id}",
+    "games": "/games/",
+    "venues": "/venues/",
+    "simulations": "/simulations/{team}",
+    "health": "/health",
+}
+
+DEFAULT_CONCURRENCY = [1, 2, 4, 8, 16, 32, 64, 128]
+LAG_INTERVAL = 0.01
+PROBE_INTERVAL = 0.1
+# A level must raise throughput by this fraction over the previous one to
+# count as below saturation
+KNEE_MIN_GAIN = 0.1
+SERVER_START_TIMEOUT = 120.0
+
+
+def parse_mix(entries: Sequence[str]) -> List[Tuple[str, float]]:
+    """``name=weight`` pairs (weight defaults to 1) validated against ROUTES."""
+    mix = []
+    for entry in entries:
+        name, _, weight = entry.partition("=")
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {name!r}; choose from {', '.join(ROUTES)}")
+        mix.append((name, float(weight) if weight else 1.0))
+    return mix
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop runs a periodic sleep."""
+
+    def __init__(self, interval: float = LAG_INTERVAL):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start_time = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.perf_counter() - start_time - self.interval, 0.0))
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class LoadGenerator:
+    """Sends the route mix from a fixed number of concurrent client tasks."""
+
+    def __init__(self, client, mix: List[Tuple[str, float]], keys: Dict[str, List[Any]], seed: int = 0, probe: bool = False):
+        self.client = client
+        self.names = [name for name, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.game_ids = keys["game_ids"]
+        self.teams = [quote(team) for team in keys["teams"]]
+        self.seed = seed
+        self.probe = probe
+
+    def _path(self, rng: random.Random) -> Tuple[str, str]:
+        name = rng.choices(self.names, self.weights)[0]
+        path = ROUTES[name].format(game_id=rng.choice(self.game_ids), team=rng.choice(self.teams))
+        return name, path
+
+    async def _worker(self, worker_id: int, start_at: float, stop_at: float, results: List[Tuple[str, float, bool]]) -> None:
+        rng = random.Random(self.seed * 100_003 + worker_id)
+        while True:
+            name, path = self._path(rng)
+            start_time = time.perf_counter()
+            if start_time >= stop_at:
+                return
+            try:
+                response = await self.client.get(path)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            if start_time >= start_at:
+                results.append((name, time.perf_counter() - start_time, failed))
+
+    async def _probe(self, start_at: float, stop_at: float, samples: List[float]) -> None:
+        while time.perf_counter() < stop_at:
+            start_time = time.perf_counter()
+            await self.client.get(ROUTES["health"])
+            if start_time >= start_at:
+                samples.append(time.perf_counter() - start_time)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    async def run_level(self, concurrency: int, duration: float, warmup: float) -> Dict[str, Any]:
+        """Drive ``concurrency`` clients for ``warmup + duration`` seconds; only the last ``duration`` counts."""
+        results: List[Tuple[str, float, bool]] = []
+        probe_samples: List[float] = []
+        monitor = LoopLagMonitor()
+
+        start_at = time.perf_counter() + warmup
+        stop_at = start_at + duration
+        tasks = [self._worker(worker_id, start_at, stop_at, results) for worker_id in range(concurrency)]
+        if self.probe:
+            tasks.append(self._probe(start_at, stop_at, probe_samples))
+
+        await asyncio.sleep(0)
+        monitor.start()
+        await asyncio.gather(*tasks)
+        await monitor.stop()
+        elapsed = max(time.perf_counter() - start_at, duration)
+
+        errors = sum(1 for _, _, failed in results if failed)
+        level = {
+            "concurrency": concurrency,
+            "requests": len(results),
+            "throughput_rps": len(results) / elapsed,
+            "error_rate": errors / len(results) if results else 0.0,
+            "latency": percentiles([seconds for _, seconds, _ in results]),
+            "loop_lag": percentiles(monitor.samples),
+            "routes": {
+                name: percentiles([seconds for route, seconds, _ in results if route == name])
+                for name in self.names
+            }
+        }
+        if self.probe:
+            level["probe"] = percentiles(probe_samples)
+        return level
+
+
+def find_knee(levels: List[Dict[str, Any]], min_gain: float = KNEE_MIN_GAIN) -> Optional[int]:
+    """Concurrency after which throughput stops growing by ``min_gain``."""
+    for previous, current in zip(levels, levels[1:]):
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            return previous["concurrency"]
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_ready(client, process: subprocess.Popen) -> None:
+    deadline = time.perf_counter() + SERVER_START_TIMEOUT
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            if (await client.get(ROUTES["health"])).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+async def sweep(args: argparse.Namespace, mix: List[Tuple[str, float]]) -> Dict[str, Any]:
+    import httpx
+
+    levels = []
+    server = None
+    if args.target == "asgi":
+        from main import create_app
+
+        load_data()
+        keys = sample_keys(args.games)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()), base_url="http://load-test")
+    else:
+        port = _free_port()
+        log(f"Starting uvicorn on port {port}")
+        # The server's lifespan loads the data into the configured database
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", "1", "--no-access-log", "--log-level", "warning"]
+        )
+        limits = httpx.Limits(max_connections=max(args.concurrency) + 1, max_keepalive_connections=max(args.concurrency) + 1)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=args.timeout)
+
+    try:
+        async with client:
+            if server is not None:
+                await _wait_until_ready(client, server)
+                keys = sample_keys(args.games)
+            generator = LoadGenerator(client, mix, keys, args.seed, probe=server is not None)
+            for concurrency in args.concurrency:
+                log(f"  concurrency {concurrency}")
+                levels.append(await generator.run_level(concurrency, args.duration, args.warmup))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    return {
+        "target": args.target,
+        "scale": args.scale,
+        "mix": dict(mix),
+        "games": len(keys["game_ids"]),
+        "duration": args.duration,
+        "levels": levels,
+        "knee": find_knee(levels)
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    if report["target"] == "uvicorn":
+        lag_label, max_label = "probe p99", "client lag"
+    else:
+        lag_label, max_label = "lag p99", "lag max"
+    print(f"\n{report['target']} / {report['scale']}: mix {report['mix']}, {report['games']} games, {report['duration']}s per level")
+    print(f"{'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {lag_label:>10} {max_label:>10}")
+    for level in report["levels"]:
+        latency, lag = level["latency"], level["loop_lag"]
+        server_lag = level["probe"].get("p99_ms", 0.0) if "probe" in level else lag.get("p99_ms", 0.0)
+        print(
+            f"{level['concurrency']:>8} {level['throughput_rps']:>9.1f} {latency.get('p50_ms', 0.0):>9.2f} "
+            f"{latency.get('p95_ms', 0.0):>9.2f} {latency.get('p99_ms', 0.0):>9.2f} {level['error_rate']:>7.1%} "
+            f"{server_lag:>10.2f} {lag.get('max_ms', 0.0):>10.2f}"
+        )
+    knee = report["knee"]
+    print(f"\nSaturation knee: {knee} concurrent clients" if knee else "\nNo saturation knee within the tested levels")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--scale", default="small", help="dataset preset")
+    parser.add_argument("--mix", nargs="+", default=["analysis"], help=f"route=weight pairs from: {', '.join(ROUTES)}")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before each level")
+    parser.add_argument("--games", type=int, default=50, help="distinct game IDs (and teams) to spread requests over")
+    parser.add_argument("--timeout", type=float, default=30.0, help="request timeout against uvicorn")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+    try:
+        mix = parse_mix(args.mix)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    with tempfile.TemporaryDirectory(prefix="load-test-") as work_dir:
+        configure_environment(ensure_dataset(args.scale), work_dir)
+        report = asyncio.run(sweep(args, mix))
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Memory benchmarks: traced allocations per ingest stage and per request.
+
+Run from the backend directory:
+
+    python -m benchmarks.memory                                # small and medium
+    python -m benchmarks.memory --scales large --top 15 --output memory.json
+
+Allocations are measured with ``tracemalloc``. For each table the CSV load
+is split into its stages (``read`` the CSV, ``validate`` it into the
+table's shape, ``write`` it to SQLite) as ``DataLoaderService`` runs them,
+followed by the index and overview build. Each route is then requested
+through the in-process ASGI app. Every measurement reports:
+
+- ``peak_kb``: highest traced memory above the starting point while it ran
+- ``retained_kb``: memory still allocated afterwards, after a collection
+  (a stage's output frame counts, since the next stage uses it)
+- ``top_sites``: the source lines holding the most new memory at the end
+
+Routes report the worst per-request peak, retained memory per request and
+the allocation sites of their first request. Tracing slows everything down
+several times, so use ``benchmarks.run`` for timings.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, List
+
+from .harness import configure_environment, ensure_dataset, log, peak_rss_mb, route_cases, run_worker, sample_keys
+
+DEFAULT_SCALES = ["small", "medium"]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_TOP_SITES = 10
+
+# Allocations made by the tracing itself or by imports are not the code's
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def _kb(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+class AllocationProbe:
+    """Traced peak and retained memory of one measured block."""
+
+    def __init__(self, top: int = DEFAULT_TOP_SITES, sites: bool = True):
+        self.top = top
+        self.sites = sites
+        self.peak = 0
+        self.retained = 0
+        self.top_sites: List[Dict[str, Any]] = []
+
+    def __enter__(self) -> "AllocationProbe":
+        gc.collect()
+        # Retained memory is counted from before the snapshot, which is freed by then
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        self._before = self._snapshot() if self.sites else None
+        tracemalloc.reset_peak()
+        self._start = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.peak = max(tracemalloc.get_traced_memory()[1] - self._start, 0)
+        if self.sites:
+            # Before collecting, so short-lived garbage still shows where it came from
+            self.top_sites = self._growth_sites()
+            self._before = None
+        gc.collect()
+        self.retained = tracemalloc.get_traced_memory()[0] - self._baseline
+
+    def _growth_sites(self) -> List[Dict[str, Any]]:
+        # A separate frame, so the full comparison is freed before retained memory is read
+        growth = self._snapshot().compare_to(self._before, "lineno")
+        return [
+            {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "size_kb": _kb(stat.size_diff), "count": stat.count_diff}
+            for stat in growth[:self.top]
+            if stat.size_diff > 0
+        ]
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"peak_kb": _kb(self.peak), "retained_kb": _kb(self.retained), "top_sites": self.top_sites}
+
+
+def measure_ingest(top: int) -> Dict[str, Any]:
+    """Measure each stage of loading every table, in ``load_all_csv_data`` order."""
+    import pandas as pd
+
+    from app.constants import Database
+    from app.database.connection import db_manager
+    from app.services.data_loader import DataLoaderService
+    from app.services.game_analysis_service import game_analysis_service
+
+    db_manager.init_database()
+    loader = DataLoaderService()
+    tables = [
+        (Database.Tables.VENUES, loader.config.venues_path, "venues"),
+        (Database.Tables.GAMES, loader.config.games_path, "games"),
+        (Database.Tables.SIMULATIONS, loader.config.simulations_path, "simulations"),
+    ]
+
+    stages: Dict[str, Dict[str, Any]] = {}
+    for table_name, path, data_type in tables:
+        with AllocationProbe(top) as probe:
+            df = pd.read_csv(path)
+        stages[f"{table_name}.read"] = {"rows": len(df), **probe.to_dict()}
+
+        with AllocationProbe(top) as probe:
+            df = loader._prepare_dataframe(df, table_name)
+        stages[f"{table_name}.validate"] = probe.to_dict()
+
+        with AllocationProbe(top) as probe:
+            if not loader._save_dataframe_to_db(df, table_name, data_type):
+                raise RuntimeError(f"Writing {table_name} failed")
+        stages[f"{table_name}.write"] = probe.to_dict()
+        del df
+
+    with AllocationProbe(top) as probe:
+        db_manager.create_indexes()
+        loader._materialize_game_overview()
+    stages["finalize"] = probe.to_dict()
+
+    game_analysis_service.set_data_fingerprint(loader.compute_data_fingerprint())
+    return stages
+
+
+async def measure_routes(keys: Dict[str, List[Any]], requests_per_route: int, top: int) -> Dict[str, Dict[str, Any]]:
+    """Per-request peak and retained memory of every route."""
+    import httpx
+
+    from app.services.game_analysis_service import game_analysis_service
+    from main import create_app
+
+    fingerprint = game_analysis_service.data_fingerprint
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()), base_url="http://benchmark") as client:
+        for name, cold, requests in route_cases(keys):
+            log(f"  {name}")
+            # Same starting state for every route: nothing cached from earlier routes
+            game_analysis_service.set_data_fingerprint(None if cold else fingerprint)
+            game_analysis_service.invalidate()
+            # One unmeasured request pays for first-use work (imports, compiled patterns)
+            method, path, body = requests[-1]
+            await client.request(method, path, json=body)
+
+            peaks, retained, first_sites, sizes = [], 0, [], []
+            for index in range(requests_per_route):
+                method, path, body = requests[index % len(requests)]
+                if cold:
+                    game_analysis_service.invalidate()
+                with AllocationProbe(top, sites=index == 0) as probe:
+                    response = await client.request(method, path, json=body)
+                    sizes.append(len(response.content))
+                    del response
+                peaks.append(probe.peak)
+                retained += probe.retained
+                if index == 0:
+                    first_sites = probe.top_sites
+            results[name] = {
+                "requests": requests_per_route,
+                "mean_bytes": sum(sizes) / len(sizes),
+                "peak_kb": _kb(max(peaks)),
+                "mean_peak_kb": _kb(sum(peaks) / len(peaks)),
+                "retained_kb_per_request": _kb(retained / requests_per_route),
+                "top_sites": first_sites
+            }
+    game_analysis_service.set_data_fingerprint(fingerprint)
+    return results
+
+
+def run_scale(scale: str, requests_per_route: int, sample_size: int, top: int, frames: int) -> Dict[str, Any]:
+    """Measure one scale in this process; must run before any ``app`` import."""
+    data_dir = ensure_dataset(scale)
+    with tempfile.TemporaryDirectory(prefix=f"memory-{scale}-") as work_dir:
+        configure_environment(data_dir, work_dir)
+        # Importing the app allocates a lot once; do it before tracing starts
+        import main  # noqa: F401
+
+        tracemalloc.start(frames)
+        try:
+            log(f"[{scale}] ingest")
+            ingest = measure_ingest(top)
+            keys = sample_keys(sample_size)
+            log(f"[{scale}] routes")
+            routes = asyncio.run(measure_routes(keys, requests_per_route, top))
+        finally:
+            tracemalloc.stop()
+        return {"dataset": data_dir, "ingest": ingest, "routes": routes, "peak_rss_mb": peak_rss_mb()}
+
+
+def _print_sites(sites: List[Dict[str, Any]], limit: int) -> None:
+    for site in sites[:limit]:
+        print(f"    {site['size_kb']:>10,.1f} KB  {site['count']:>8,}  {site['site']}")
+
+
+def print_report(results: Dict[str, Any], sites: int) -> None:
+    for scale, result in results["scales"].items():
+        print(f"\n[{scale}] ingest (peak RSS {result['peak_rss_mb']:.0f} MB)")
+        print(f"{'stage':<28} {'peak KB':>12} {'retained KB':>12}")
+        for name, stage in result["ingest"].items():
+            print(f"{name:<28} {stage['peak_kb']:>12,.1f} {stage['retained_kb']:>12,.1f}")
+            _print_sites(stage["top_sites"], sites)
+
+        print(f"\n[{scale}] routes")
+        print(f"{'route':<44} {'peak KB':>10} {'mean KB':>10} {'kept/req':>9}")
+        for name, route in result["routes"].items():
+            print(f"{name:<44} {route['peak_kb']:>10,.1f} {route['mean_peak_kb']:>10,.1f} {route['retained_kb_per_request']:>9,.1f}")
+            _print_sites(route["top_sites"], sites)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES, help="dataset presets to run")
+    parser.add_argument("--requests", type=int, default=10, help="requests measured per route")
+    parser.add_argument("--sample-size", type=int, default=20, help="distinct games and teams to cycle over")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_SITES, help="allocation sites kept per measurement")
+    parser.add_argument("--show-sites", type=int, default=3, help="allocation sites printed per measurement")
+    parser.add_argument("--frames", type=int, default=1, help="traceback depth tracemalloc records")
+    parser.add_argument("--output", help="results file (default benchmarks/results/memory-<timestamp>.json)")
+    parser.add_argument("--worker", metavar="SCALE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_scale(args.worker, args.requests, args.sample_size, args.top, args.frames)
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        return
+
+    worker_args = [
+        "--requests", str(args.requests),
+        "--sample-size", str(args.sample_size),
+        "--top", str(args.top),
+        "--frames", str(args.frames)
+    ]
+    results = {
+        "meta": {"timestamp": datetime.now().isoformat(), "requests": args.requests},
+        "scales": {scale: run_worker("benchmarks.memory", scale, worker_args) for scale in args.scales}
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"memory-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print_report(results, args.show_sites)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Benchmark suite: data loading, repository queries and HTTP routes per dataset scale.
+
+Run from the backend directory:
+
+    python -m benchmarks.run                                   # small and medium
+    python -m benchmarks.run --scales small medium large --output results.json
+    python -m benchmarks.run --baseline benchmarks/results/before.json
+
+Each scale runs in its own process, so settings, caches and peak RSS do not
+leak between scales. With ``--baseline`` the run is compared against a
+previous results file and exits with status 1 if anything regressed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .harness import (
+    configure_environment, ensure_dataset, load_data, log, peak_rss_mb, percentiles, route_cases, run_worker,
+    sample_keys
+)
+
+DEFAULT_SCALES = ["small", "medium"]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# A result must be this much slower than the baseline, relatively and in
+# absolute milliseconds, to count as a regression
+DEFAULT_TOLERANCE = 0.2
+NOISE_FLOOR_MS = 0.5
+
+
+def _row_count(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        return sum(result.values())
+    return 1
+
+
+async def _time_case(call: Callable[[int], Awaitable[Any]], iterations: int) -> Dict[str, Any]:
+    samples, rows = [], 0
+    for index in range(iterations):
+        start_time = time.perf_counter()
+        result = await call(index)
+        samples.append(time.perf_counter() - start_time)
+        rows += _row_count(result)
+    stats = percentiles(samples)
+    stats["rows"] = rows
+    stats["rows_per_sec"] = rows / sum(samples) if sum(samples) else 0.0
+    return stats
+
+
+async def bench_repositories(keys: Dict[str, List[Any]], iterations: int) -> Dict[str, Dict[str, Any]]:
+    """Time every repository query, cycling its arguments over the sampled keys."""
+    from app.database.repositories.game_repository import GameRepository
+    from app.database.repositories.simulation_repository import SimulationRepository
+    from app.database.repositories.venue_repository import VenueRepository
+
+    venues, games, simulations = VenueRepository(), GameRepository(), SimulationRepository()
+
+    def pick(name: str) -> Callable[[int], Any]:
+        values = keys[name]
+        return lambda index: values[index % len(values)]
+
+    game_id, matchup, team = pick("game_ids"), pick("matchups"), pick("teams")
+    venue_id, venue_name = pick("venue_ids"), pick("venue_names")
+    cases: List[Tuple[str, Callable[[int], Awaitable[Any]]]] = [
+        ("VenueRepository.find_all", lambda i: venues.find_all()),
+        ("VenueRepository.find_by_id", lambda i: venues.find_by_id(venue_id(i))),
+        ("VenueRepository.find_by_name", lambda i: venues.find_by_name(venue_name(i))),
+        ("GameRepository.find_all", lambda i: games.find_all()),
+        ("GameRepository.find_by_id", lambda i: games.find_by_id(game_id(i))),
+        ("GameRepository.find_all_with_venues", lambda i: games.find_all_with_venues()),
+        ("GameRepository.find_with_venue", lambda i: games.find_with_venue(game_id(i))),
+        ("GameRepository.find_by_teams", lambda i: games.find_by_teams(*matchup(i))),
+        ("SimulationRepository.find_by_team", lambda i: simulations.find_by_team(team(i))),
+        ("SimulationRepository.get_game_simulations", lambda i: simulations.get_game_simulations(*matchup(i))),
+        ("SimulationRepository.get_team_names", lambda i: simulations.get_team_names()),
+        ("SimulationRepository.get_score_distribution", lambda i: simulations.get_score_distribution(team(i))),
+    ]
+
+    results = {}
+    for name, call in cases:
+        log(f"  {name}")
+        try:
+            results[name] = await _time_case(call, iterations)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+async def bench_routes(keys: Dict[str, List[Any]], iterations: int) -> Dict[str, Dict[str, Any]]:
+    """Time every route through the in-process ASGI app."""
+    import httpx
+
+    from app.services.game_analysis_service import game_analysis_service
+    from main import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    fingerprint = game_analysis_service.data_fingerprint
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, cold, requests in route_cases(keys):
+            log(f"  {name}")
+            if cold:
+                # Without a fingerprint nothing is read from the persisted result store
+                game_analysis_service.set_data_fingerprint(None)
+            else:
+                # One pass to fill the caches the warm case measures
+                for method, path, body in requests:
+                    await client.request(method, path, json=body)
+
+            samples, sizes, errors = [], [], 0
+            for index in range(iterations):
+                method, path, body = requests[index % len(requests)]
+                if cold:
+                    game_analysis_service.invalidate()
+                start_time = time.perf_counter()
+                response = await client.request(method, path, json=body)
+                samples.append(time.perf_counter() - start_time)
+                sizes.append(len(response.content))
+                if response.status_code >= 400:
+                    errors += 1
+            if cold:
+                game_analysis_service.set_data_fingerprint(fingerprint)
+            stats = percentiles(samples)
+            stats["mean_bytes"] = sum(sizes) / len(sizes)
+            stats["errors"] = errors
+            results[name] = stats
+    return results
+
+
+def run_scale(scale: str, iterations: int, repository_iterations: int, sample_size: int) -> Dict[str, Any]:
+    """Benchmark one scale in this process; must run before any ``app`` import."""
+    data_dir = ensure_dataset(scale)
+    with tempfile.TemporaryDirectory(prefix=f"benchmark-{scale}-") as work_dir:
+        configure_environment(data_dir, work_dir)
+
+        log(f"[{scale}] loading {data_dir}")
+        ingest = load_data()
+        ingest["peak_rss_mb"] = peak_rss_mb()
+        keys = sample_keys(sample_size)
+
+        log(f"[{scale}] repositories")
+        repositories = asyncio.run(bench_repositories(keys, repository_iterations))
+        repositories_rss = peak_rss_mb()
+
+        log(f"[{scale}] routes")
+        routes = asyncio.run(bench_routes(keys, iterations))
+
+        return {
+            "dataset": data_dir,
+            "ingest": ingest,
+            "repositories": repositories,
+            "routes": routes,
+            "peak_rss_mb": {"ingest": ingest["peak_rss_mb"], "repositories": repositories_rss, "routes": peak_rss_mb()}
+        }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Latency and ingest-time changes for every measurement present in both runs."""
+    rows = []
+
+    def check(scale: str, name: str, current: Optional[float], previous: Optional[float]) -> None:
+        if current is None or previous is None:
+            return
+        change = (current - previous) / previous if previous else 0.0
+        rows.append({
+            "scale": scale,
+            "name": name,
+            "baseline_ms": previous,
+            "current_ms": current,
+            "change": change,
+            "regression": change > tolerance and current - previous > NOISE_FLOOR_MS
+        })
+
+    for scale, current in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if previous is None:
+            continue
+        check(scale, "ingest", current["ingest"]["seconds"] * 1000, previous["ingest"]["seconds"] * 1000)
+        for section in ("repositories", "routes"):
+            for name, stats in current[section].items():
+                check(scale, name, stats.get("p50_ms"), previous[section].get(name, {}).get("p50_ms"))
+    return rows
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    for scale, result in results["scales"].items():
+        ingest = result["ingest"]
+        print(f"\n[{scale}] ingest {ingest['rows']:,} rows in {ingest['seconds']:.2f}s "
+              f"({ingest['rows_per_sec']:,.0f} rows/s), peak RSS {max(result['peak_rss_mb'].values()):.0f} MB")
+        print(f"{'':<48} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>12}")
+        for section in ("repositories", "routes"):
+            for name, stats in result[section].items():
+                if "error" in stats:
+                    print(f"{name:<48} {stats['error']}")
+                    continue
+                rate = f"{stats['rows_per_sec']:>12,.0f}" if "rows_per_sec" in stats else f"{'':>12}"
+                errors = f"  ({stats['errors']} errors)" if stats.get("errors") else ""
+                print(f"{name:<48} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {rate}{errors}")
+
+
+def print_comparison(rows: List[Dict[str, Any]], tolerance: float) -> None:
+    print(f"\nBaseline comparison (p50; regression above +{tolerance:.0%})")
+    print(f"{'scale':<8} {'':<48} {'baseline':>10} {'current':>10} {'change':>8}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['scale']:<8} {row['name']:<48} {row['baseline_ms']:>10.2f} "
+              f"{row['current_ms']:>10.2f} {row['change']:>+8.1%}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=DEFAULT_SCALES, help="dataset presets to run")
+    parser.add_argument("--iterations", type=int, default=50, help="requests timed per route")
+    parser.add_argument("--repository-iterations", type=int, default=20, help="calls timed per repository query")
+    parser.add_argument("--sample-size", type=int, default=20, help="distinct games, teams and venues to cycle over")
+    parser.add_argument("--output", help="results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p50 slowdown, e.g. 0.2")
+    parser.add_argument("--worker", metavar="SCALE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_scale(args.worker, args.iterations, args.repository_iterations, args.sample_size)
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        return
+
+    worker_args = [
+        "--iterations", str(args.iterations),
+        "--repository-iterations", str(args.repository_iterations),
+        "--sample-size", str(args.sample_size)
+    ]
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "repository_iterations": args.repository_iterations
+        },
+        "scales": {scale: run_worker("benchmarks.run", scale, worker_args) for scale in args.scales}
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print_summary(results)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.tolerance)
+        print_comparison(rows, args.tolerance)
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,28 +6,27 @@ Cricket Data App - FastAPI Application with Enhanced Logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import traceback
 import sys
 import time
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from app.constants import Logging
+from app.monitoring.log_config import setup_logging, should_log_access
+
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(Logging.Pipeline.ACCESS_LOGGER)
 
 # Import configuration and dependencies with error handling
 try:
     from app.config import get_environment_settings
     config = get_environment_settings()
+    # Configure logging: records are written by a background thread
+    setup_logging(config)
     logger.info("Config loaded successfully")
 except Exception as e:
+    setup_logging()
     logger.error(f"Config import error: {e}")
     logger.error(f"Traceback: {traceback.format_exc()}")
     # Fallback config
@@ -40,6 +39,10 @@ except Exception as e:
         api_reload = True
         environment = "development"
         database_path = "cricket_data.db"
+        warmup_on_startup = False
+        warmup_workers = 1
+        access_log_sample_rate = 1.0
+        log_request_headers = False
     config = FallbackConfig()
 
 try:
@@ -58,6 +61,14 @@ except Exception as e:
     logger.error(f"Traceback: {traceback.format_exc()}")
     DataLoaderService = None
 
+try:
+    from app.services.game_analysis_service import game_analysis_service
+    logger.info("Game analysis service loaded")
+except Exception as e:
+    logger.error(f"Game analysis service import error: {e}")
+    logger.error(f"Traceback: {traceback.format_exc()}")
+    game_analysis_service = None
+
 try:
     from app.api.middleware import setup_middleware
     logger.info("Middleware loaded")
@@ -109,12 +120,35 @@ except Exception as e:
     logger.error(f"Simulations router import error: {e}")
     logger.error(f"Traceback: {traceback.format_exc()}")
 
+try:
+    from app.api.endpoints.events import router as events_router
+    routers_to_load.append(("events", events_router, ""))
+    logger.info("Events router loaded")
+except Exception as e:
+    logger.error(f"Events router import error: {e}")
+    logger.error(f"Traceback: {traceback.format_exc()}")
+
+
+async def warm_up_analysis_cache(app: FastAPI) -> None:
+    """Precompute analysis and histogram payloads for every game."""
+    try:
+        logger.info("Warming analysis cache...")
+        await asyncio.get_event_loop().run_in_executor(
+            None, game_analysis_service.warm_up, config.warmup_workers
+        )
+    except Exception as e:
+        logger.error(f"Warm-up error: {e}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+    finally:
+        app.state.warmup_complete = True
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     logger.info("Starting Cricket Data App...")
+    warmup_task = None
     
     try:
         # Initialize database
@@ -136,6 +170,13 @@ async def lifespan(app: FastAPI):
                 logger.warning("CSV data loading had issues")
         else:
             logger.warning("Data loader service not available")
+        
+        # Warm the analysis cache in the background; /health reports
+        # warming_up until it finishes
+        if game_analysis_service:
+            if config.warmup_on_startup:
+                app.state.warmup_complete = False
+                warmup_task = asyncio.create_task(warm_up_analysis_cache(app))
     except Exception as e:
         logger.error(f"Startup error: {e}")
         logger.error(f"Traceback: {traceback.format_exc()}")
@@ -146,6 +187,8 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Cricket Data App...")
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
 
 
 # Global exception handler
@@ -170,23 +213,33 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 # Request logging middleware
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests."""
-    start_time = time.time()
+    """Write one (sampled) access log line per request."""
+    start_time = time.perf_counter()
     
-    logger.info(f"Incoming request: {request.method} {request.url}")
-    logger.info(f"Headers: {dict(request.headers)}")
+    if config.log_request_headers and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Headers: {dict(request.headers)}")
     
     try:
         response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"Response: {response.status_code} | Time: {process_time:.3f}s")
-        return response
     except Exception as e:
-        process_time = time.time() - start_time
+        process_time = time.perf_counter() - start_time
         logger.error(f"Request failed: {request.method} {request.url}")
         logger.error(f"Error: {str(e)} | Time: {process_time:.3f}s")
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise
+    
+    process_time = time.perf_counter() - start_time
+    if should_log_access(response.status_code, config.access_log_sample_rate):
+        access_logger.info(
+            f"{request.method} {request.url.path} {response.status_code} {process_time * 1000:.1f}ms",
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "status": response.status_code,
+                "duration_ms": round(process_time * 1000, 2)
+            }
+        )
+    return response
 
 
 def create_app() -> FastAPI:
@@ -1,8 +1,12 @@
 import pytest
 import asyncio
+import sqlite3
 import tempfile
 import os
-from unittest.mock import patch
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+from app.database.instrumentation import InstrumentedConnection
+from app.monitoring.query_counts import count_queries
 
 
 @pytest.fixture(scope="session")
@@ -26,6 +30,72 @@ def test_database():
         os.unlink(test_db_path)
 
 
+@pytest.fixture
+def game_database(test_database):
+    """Provide a small venues/games/simulations database."""
+    conn = sqlite3.connect(test_database)
+    conn.executescript("""
+        CREATE TABLE venues (venue_id INTEGER, venue_name TEXT);
+        CREATE TABLE games (id INTEGER, home_team TEXT, away_team TEXT, date TEXT, venue_id INTEGER);
+        CREATE TABLE simulations (team_id INTEGER, team TEXT, simulation_run INTEGER, results INTEGER);
+        INSERT INTO venues VALUES (1, 'Test Venue');
+        INSERT INTO games VALUES (1, 'Team A', 'Team B', '2024-01-01', 1),
+                                 (2, 'Team B', 'Team C', '2024-01-02', 1);
+        INSERT INTO simulations VALUES (0, 'Team A', 1, 150), (0, 'Team A', 2, 140),
+                                       (1, 'Team B', 1, 145), (1, 'Team B', 2, 145),
+                                       (2, 'Team C', 1, 100), (2, 'Team C', 2, 200);
+    """)
+    conn.commit()
+    conn.close()
+    return test_database
+
+
+@pytest.fixture
+def game_db_manager(game_database):
+    """Provide a database manager stand-in whose connections open ``game_database``."""
+    db_manager = Mock()
+    db_manager.get_connection.side_effect = lambda: sqlite3.connect(game_database)
+    return db_manager
+
+
+@pytest.fixture
+def app_database(game_database):
+    """Point the shared database manager at ``game_database`` with an empty analysis cache."""
+    from app.database.connection import db_manager
+    from app.services.game_analysis_service import game_analysis_service
+    
+    game_analysis_service.invalidate()
+    with patch.object(
+        db_manager, "get_connection",
+        side_effect=lambda **kwargs: sqlite3.connect(game_database, factory=InstrumentedConnection, **kwargs)
+    ):
+        yield game_database
+    game_analysis_service.invalidate()
+
+
+@pytest.fixture
+def query_budget():
+    """Assert the code in a block stays within a statement (and row) budget.
+    
+    Usage::
+    
+        with query_budget(max_statements=2):
+            client.get("/games/1/analysis")
+    """
+    @contextmanager
+    def budget(max_statements, max_rows=None):
+        with count_queries() as queries:
+            yield queries
+        executed = "\n".join(f"  {operation}: {sql}" for operation, sql in queries.queries)
+        assert queries.statements <= max_statements, (
+            f"{queries.statements} statements executed, budget is {max_statements}:\n{executed}"
+        )
+        if max_rows is not None:
+            assert queries.rows <= max_rows, f"{queries.rows} rows fetched, budget is {max_rows}"
+    
+    return budget
+
+
 @pytest.fixture
 def mock_config(test_database):
     """Provide mock configuration for testing."""
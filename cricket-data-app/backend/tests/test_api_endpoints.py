@@ -1,8 +1,21 @@
+import json
+import sqlite3
+import threading
+from datetime import date
 import pytest
+import msgpack
+import numpy as np
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 from main import create_app
-from app.constants import HTTPStatus
+from app.constants import HTTPStatus, API, Database
+from app.api.responses.encoding import (
+    MessagePackResponse, negotiate_media_type, pack_columns, stream_ndjson_response
+)
+from app.api.endpoints.events import data_version_stream
+from app.api.endpoints.games import games_page_query
+from app.monitoring.slow_queries import explain_query_plan
+from app.services.events import DataVersionBroadcaster
 
 
 class TestAPIEndpoints:
@@ -68,3 +81,195 @@ class TestAPIEndpoints:
         assert len(data) == 1
         assert data[0]["home_team"] == "Team A"
 
+    
+    def test_accept_header_negotiation(self):
+        """Test MessagePack is only chosen when the client asks for it."""
+        assert negotiate_media_type(None) == API.MediaTypes.JSON
+        assert negotiate_media_type("*/*") == API.MediaTypes.JSON
+        assert negotiate_media_type("application/x-msgpack") == API.MediaTypes.MSGPACK
+        assert negotiate_media_type("application/json, application/msgpack") == API.MediaTypes.JSON
+        assert negotiate_media_type("application/json;q=0.5, application/vnd.msgpack") == API.MediaTypes.MSGPACK
+        assert negotiate_media_type("application/x-msgpack;q=0") == API.MediaTypes.JSON
+        assert negotiate_media_type("application/x-ndjson") == API.MediaTypes.JSON
+        assert negotiate_media_type(
+            "application/x-ndjson", offered=(API.MediaTypes.JSON, API.MediaTypes.NDJSON)
+        ) == API.MediaTypes.NDJSON
+    
+    def test_packed_columns_round_trip(self):
+        """Test packed integer columns decode back to the original values."""
+        packed = msgpack.unpackb(MessagePackResponse(
+            pack_columns({"results": [141, 154, 0]}, {"results": API.BinaryDtypes.SCORE})
+        ).body)
+        results = np.frombuffer(packed["columns"]["results"], dtype=packed["dtypes"]["results"])
+        assert results.tolist() == [141, 154, 0]
+    
+    @pytest.mark.parametrize("url", ["/games/", "/venues/"])
+    def test_list_encodings_agree(self, app_database, url):
+        """Test list routes send the same rows as JSON objects, NDJSON lines and MessagePack columns."""
+        objects = self.client.get(url).json()
+        lines = self.client.get(url, headers={"Accept": API.MediaTypes.NDJSON}).text.splitlines()
+        packed = msgpack.unpackb(self.client.get(url, headers={"Accept": API.MediaTypes.MSGPACK}).content)
+        
+        assert [json.loads(line) for line in lines] == objects
+        assert packed["count"] == len(objects)
+        for name in objects[0]:
+            column = packed["columns"][name]
+            if name in packed["dtypes"]:
+                column = np.frombuffer(column, dtype=packed["dtypes"][name]).tolist()
+            assert column == [item[name] for item in objects]
+    
+    @pytest.mark.parametrize("request_kwargs", [
+        {"headers": {"Accept": "application/x-ndjson"}},
+        {"params": {"stream": "true"}}
+    ])
+    def test_team_simulations_ndjson_stream(self, request_kwargs):
+        """Test team simulations stream as NDJSON in fetchmany-sized chunks."""
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute("CREATE TABLE simulations (team_id INTEGER, team TEXT, simulation_run INTEGER, results INTEGER)")
+        conn.executemany(
+            "INSERT INTO simulations VALUES (?, ?, ?, ?)",
+            [(1, "Team A", run, 100 + run) for run in range(1, 8)]
+        )
+        
+        with patch('app.api.endpoints.simulations.get_database_connection', return_value=conn), \
+                patch('app.constants.Performance.QueryLimits.STREAM_FETCH_SIZE', 3):
+            response = self.client.get("/simulations/Team A", **request_kwargs)
+        
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"].startswith(API.MediaTypes.NDJSON)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["simulation_run"] for line in lines] == list(range(1, 8))
+        assert lines[0] == {"team_id": 1, "team": "Team A", "simulation_run": 1, "results": 101}
+        # The stream closed the connection once it was exhausted
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    
+    @pytest.mark.asyncio
+    async def test_ndjson_stream_fetches_off_the_event_loop(self):
+        """Test streamed chunks are fetched in the thread pool and the response closes an unstarted stream's connection."""
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute("CREATE TABLE runs (run INTEGER)")
+        conn.executemany("INSERT INTO runs VALUES (?)", [(run,) for run in range(5)])
+        cursor = conn.execute("SELECT run FROM runs ORDER BY run")
+        fetch_threads = []
+        fetchmany = cursor.fetchmany
+        
+        class RecordingCursor:
+            def fetchmany(self, size):
+                fetch_threads.append(threading.get_ident())
+                return fetchmany(size)
+        
+        request = AsyncMock()
+        request.is_disconnected.return_value = False
+        response = stream_ndjson_response(request, conn, RecordingCursor(), ("run",), cursor.fetchmany(2), fetch_size=2)
+        lines = [line async for chunk in response.body_iterator for line in chunk.splitlines()]
+        
+        assert [json.loads(line)["run"] for line in lines] == list(range(5))
+        assert fetch_threads and threading.get_ident() not in fetch_threads
+        
+        # A stream that never starts is closed by the response's background task
+        unstarted = sqlite3.connect(":memory:", check_same_thread=False)
+        response = stream_ndjson_response(request, unstarted, unstarted.cursor(), ("run",), [], fetch_size=2)
+        await response.background()
+        with pytest.raises(sqlite3.ProgrammingError):
+            unstarted.execute("SELECT 1")
+    
+    def test_games_keyset_pagination_and_filters(self, test_database):
+        """Test games are paged by ID with X-Next-Cursor and can be filtered."""
+        conn = sqlite3.connect(test_database)
+        conn.execute("CREATE TABLE venues (venue_id INTEGER, venue_name TEXT)")
+        conn.execute("CREATE TABLE games (id INTEGER, home_team TEXT, away_team TEXT, date TEXT, venue_id INTEGER)")
+        conn.execute("INSERT INTO venues VALUES (1, 'Test Venue')")
+        conn.executemany(
+            "INSERT INTO games VALUES (?, ?, ?, ?, ?)",
+            [(game_id, "Team A" if game_id % 2 else "Team B", "Team C", f"2024-01-{game_id:02d}", 1)
+             for game_id in range(1, 6)]
+        )
+        conn.commit()
+        conn.close()
+        
+        with patch('app.api.endpoints.games.get_database_connection', side_effect=lambda: sqlite3.connect(test_database)):
+            first = self.client.get("/games/", params={"limit": 2})
+            second = self.client.get("/games/", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]})
+            last = self.client.get("/games/", params={"limit": 2, "cursor": second.headers["X-Next-Cursor"]})
+            filtered = self.client.get("/games/", params={"team": "Team A", "date_from": "2024-01-02"})
+        
+        assert [game["id"] for game in first.json()] == [1, 2]
+        assert [game["id"] for game in second.json()] == [3, 4]
+        assert [game["id"] for game in last.json()] == [5]
+        assert "X-Next-Cursor" not in last.headers
+        assert [game["id"] for game in filtered.json()] == [3, 5]
+    
+    def test_game_analysis_json_shape(self, app_database):
+        """Test each simulation run is serialized as a home/away score object."""
+        response = self.client.get("/games/1/analysis")
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["game"]["id"] == 1
+        assert data["simulations"] == [
+            {"home_score": 150, "away_score": 145},
+            {"home_score": 140, "away_score": 145}
+        ]
+        assert data["home_win_probability"] == 50.0
+        assert data["total_simulations"] == 2
+    
+    @pytest.mark.parametrize("filters, index, sorted_rows, expected_ids", [
+        ({}, None, False, [1, 2]),
+        ({"team": "Team B"}, "idx_games_home_team", False, [1, 2]),
+        ({"team": "Team B", "date_from": date(2024, 1, 2)}, "idx_games_away_team", False, [2]),
+        ({"venue_id": 1, "date_to": date(2024, 1, 2)}, "idx_games_venue_id", False, [1, 2]),
+        ({"date_from": date(2024, 1, 2)}, "idx_games_date", True, [2]),
+        ({"date_from": date(2024, 1, 1), "date_to": date(2024, 1, 1)}, "idx_games_date", True, [1]),
+    ])
+    def test_games_filter_query_plans(self, game_database, filters, index, sorted_rows, expected_ids):
+        """Test filtered game pages search an index; only date-only filters sort their matches."""
+        conn = sqlite3.connect(game_database)
+        for statement in Database.Queries.CREATE_INDEXES:
+            conn.execute(statement)
+        query, params = games_page_query(51, after=0, **filters)
+        plan = "\n".join(explain_query_plan(conn, query, params))
+        games = conn.execute(query, params).fetchall()
+        conn.close()
+        
+        assert "MULTI-INDEX OR" not in plan
+        assert ("TEMP B-TREE" in plan) == sorted_rows, plan
+        if index:
+            assert f"USING INDEX {index}" in plan, plan
+        assert [game[0] for game in games] == expected_ids
+    
+    @pytest.mark.parametrize("method, url, max_statements, max_rows", [
+        ("GET", "/games/1/analysis", 2, 5),
+        ("GET", "/games/1/histogram-data", 2, 5),
+        ("GET", "/games/1/histogram-data?version=2", 2, 5),
+        ("GET", "/games/1/bundle", 2, 5),
+        ("POST", "/games/analysis:batch", 2, 8),
+        ("GET", "/games/", 1, 2),
+        ("GET", "/venues/", 1, 1),
+        ("GET", "/simulations/Team%20A", 1, 2),
+    ])
+    def test_endpoint_query_budgets(self, app_database, query_budget, method, url, max_statements, max_rows):
+        """Test endpoints run a fixed number of statements however many runs a game has."""
+        body = {"json": {"ids": [1, 2]}} if method == "POST" else {}
+        with query_budget(max_statements=max_statements, max_rows=max_rows):
+            response = self.client.request(method, url, **body)
+        assert response.status_code == HTTPStatus.OK
+    
+    @pytest.mark.asyncio
+    async def test_data_version_stream_sends_current_version(self):
+        """Test the SSE stream starts with the current version and unsubscribes on disconnect."""
+        events = DataVersionBroadcaster()
+        events.publish("v1")
+        request = AsyncMock()
+        request.is_disconnected.side_effect = [False, True]
+        
+        stream = data_version_stream(request, events, last_event_id=None)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        assert chunks[0].startswith(b"retry: ")
+        assert chunks[1].startswith(b"event: data-version\nid: v1\ndata: ")
+        assert json.loads(chunks[1].split(b"data: ")[1])["scope"] == "full"
+        
+        events.publish("v2")
+        assert json.loads((await stream.__anext__()).split(b"data: ")[1])["version"] == "v2"
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
+        assert events.subscriber_count() == 0
@@ -0,0 +1,231 @@
+import asyncio
+import contextvars
+import logging
+import queue
+import sqlite3
+import threading
+from fastapi.testclient import TestClient
+from main import create_app
+from app.database.instrumentation import (
+    InstrumentedConnection, QueryObserver, add_query_observer, remove_query_observer
+)
+from app.monitoring.log_config import DroppingQueueHandler, should_log_access
+from app.monitoring.metrics import MetricsRegistry, log_records_dropped
+from app.monitoring.profiling import (
+    ProfileStore, ProfilingQueryObserver, RequestProfile, current_profile
+)
+from app.monitoring.slow_queries import SlowQueryObserver, normalize_sql
+from app.monitoring.tracing import Kinds, Trace, current_trace, span, traced
+
+
+class RecordingObserver(QueryObserver):
+    """Collects (operation, sql) for each executed statement."""
+    
+    def __init__(self):
+        self.queries = []
+    
+    def on_query(self, event):
+        self.queries.append((event.operation, event.sql))
+
+
+class TestMonitoring:
+    """Test metrics and database instrumentation."""
+    
+    def test_metrics_merge_thread_shards(self):
+        """Test counters and histograms add up observations from every thread."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        
+        def record():
+            for _ in range(100):
+                requests.inc(("/games/",))
+                latency.observe(("/games/",), 0.5)
+        
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        latency.observe(("/games/",), 2.0)
+        
+        text = registry.render()
+        assert 'requests_total{route="/games/"} 400' in text
+        assert 'latency_seconds_bucket{route="/games/",le="0.1"} 0' in text
+        assert 'latency_seconds_bucket{route="/games/",le="1"} 400' in text
+        assert 'latency_seconds_bucket{route="/games/",le="+Inf"} 401' in text
+        assert 'latency_seconds_count{route="/games/"} 401' in text
+    
+    def test_instrumented_connection_reports_calling_function(self):
+        """Test statements are attributed to the function that ran them."""
+        observer = RecordingObserver()
+        add_query_observer(observer)
+        try:
+            conn = sqlite3.connect(":memory:", factory=InstrumentedConnection)
+            conn.execute("CREATE TABLE games (id INTEGER)")
+            conn.cursor().execute("SELECT * FROM games")
+            conn.close()
+        finally:
+            remove_query_observer(observer)
+        
+        operation = "TestMonitoring.test_instrumented_connection_reports_calling_function"
+        assert observer.queries == [
+            (operation, "CREATE TABLE games (id INTEGER)"),
+            (operation, "SELECT * FROM games")
+        ]
+    
+    def test_metrics_endpoint_labels_route_templates(self):
+        """Test /metrics exposes request latency by route template."""
+        client = TestClient(create_app())
+        client.get("/health")
+        client.get("/games/not-a-number")
+        
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'http_request_duration_seconds_count{method="GET",route="/health"}' in response.text
+        assert 'route="/games/{game_id}",status="422"' in response.text
+    
+    def test_log_queue_drops_instead_of_blocking(self):
+        """Test a full log queue drops records and counts them."""
+        log_queue = queue.Queue(maxsize=1)
+        handler = DroppingQueueHandler(log_queue)
+        dropped_before = log_records_dropped.value()
+        
+        for message in ("first", "second", "third"):
+            handler.handle(logging.LogRecord("app", logging.INFO, __file__, 0, message, None, None))
+        
+        assert log_queue.get_nowait().getMessage() == "first"
+        assert log_records_dropped.value() - dropped_before == 2
+    
+    def test_access_log_sampling_keeps_errors(self):
+        """Test errors are always logged while successes follow the sample rate."""
+        assert should_log_access(500, 0.0)
+        assert should_log_access(404, 0.0)
+        assert not should_log_access(200, 0.0)
+        assert should_log_access(200, 1.0)
+    
+    def test_profiling_observer_records_only_profiled_queries(self):
+        """Test statements are attached to the current profile with parameter types, not values."""
+        observer = ProfilingQueryObserver()
+        add_query_observer(observer)
+        profile = RequestProfile("GET", "/games/1/analysis")
+        try:
+            conn = sqlite3.connect(":memory:", factory=InstrumentedConnection)
+            conn.execute("SELECT 1")
+            token = current_profile.set(profile)
+            try:
+                conn.execute("SELECT ?, ?", (1, "Hull Stars"))
+            finally:
+                current_profile.reset(token)
+            conn.close()
+        finally:
+            remove_query_observer(observer)
+        
+        assert len(profile.queries) == 1
+        assert profile.queries[0]["sql"] == "SELECT ?, ?"
+        assert profile.queries[0]["params"] == ["int", "str"]
+    
+    def test_profile_store_keeps_most_recent(self):
+        """Test the profile store evicts the oldest profiles and lists newest first."""
+        store = ProfileStore(max_size=2)
+        profiles = [RequestProfile("GET", f"/games/{game_id}/analysis") for game_id in range(3)]
+        for profile in profiles:
+            store.add(profile)
+        
+        assert store.get(profiles[0].id) is None
+        assert [summary["id"] for summary in store.list()] == [profiles[2].id, profiles[1].id]
+    
+    def test_spans_nest_across_executor_threads(self):
+        """Test spans started in executor threads nest under the span that submitted the work."""
+        @traced(Kinds.REPOSITORY)
+        def load_rows():
+            with span("convert", Kinds.CONVERT):
+                return [1, 2, 3]
+        
+        @traced(Kinds.SERVICE)
+        async def get_rows():
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(None, context.run, load_rows)
+        
+        async def handle_request():
+            trace = Trace("GET", "/games/1/analysis")
+            token = current_trace.set(trace)
+            try:
+                assert await get_rows() == [1, 2, 3]
+            finally:
+                current_trace.reset(token)
+            trace.duration = 1.0
+            return trace
+        
+        trace = asyncio.run(handle_request())
+        
+        service, repository, convert = trace.spans
+        assert (service.kind, repository.kind, convert.kind) == (Kinds.SERVICE, Kinds.REPOSITORY, Kinds.CONVERT)
+        assert repository.parent is service and convert.parent is repository
+        assert set(trace.breakdown()) == {Kinds.SERVICE, Kinds.REPOSITORY, Kinds.CONVERT, Kinds.ROUTING}
+    
+    def test_span_is_noop_without_trace(self):
+        """Test span() records nothing for requests that are not sampled."""
+        with span("untraced", Kinds.SERVICE) as untraced:
+            assert untraced is None
+    
+    def test_trace_header_records_request(self):
+        """Test X-Trace: 1 traces a request and exposes it under /debug/traces."""
+        client = TestClient(create_app())
+        response = client.get("/health", headers={"X-Trace": "1"})
+        trace_id = response.headers["X-Trace-Id"]
+        
+        trace = client.get(f"/debug/traces/{trace_id}").json()
+        assert trace["route"] == "/health"
+        assert trace["spans"][0]["kind"] == Kinds.ENDPOINT
+        assert trace_id in [summary["id"] for summary in client.get("/debug/traces").json()["traces"]]
+    
+    def test_slow_query_log_includes_plan(self, caplog):
+        """Test statements over the threshold are logged with parameter types and query plan."""
+        observer = SlowQueryObserver(threshold_ms=0)
+        add_query_observer(observer)
+        try:
+            conn = sqlite3.connect(":memory:", factory=InstrumentedConnection)
+            conn.execute("CREATE TABLE simulations (team TEXT, results INTEGER)")
+            with caplog.at_level(logging.WARNING, logger="app.slow_queries"):
+                for _ in range(3):
+                    conn.execute("SELECT results FROM simulations WHERE team = ?", ("Hull Stars",)).fetchall()
+            conn.close()
+        finally:
+            remove_query_observer(observer)
+        
+        select = next(entry for entry in observer.slowest(10) if entry["sql"].startswith("SELECT"))
+        assert select["count"] == 3 and select["slow_count"] == 3
+        assert select["params"] == ["str"]
+        assert select["plan"] == ["SCAN simulations"]
+        assert any(record.plan == ["SCAN simulations"] for record in caplog.records)
+    
+    def test_slow_query_stats_merged_across_threads(self):
+        """Test fast statements are counted per thread and merged, without a plan lookup."""
+        observer = SlowQueryObserver(threshold_ms=60_000)
+        add_query_observer(observer)
+        try:
+            def run_queries():
+                conn = sqlite3.connect(":memory:", factory=InstrumentedConnection)
+                for _ in range(3):
+                    conn.execute("SELECT  1").fetchall()
+                conn.close()
+            
+            threads = [threading.Thread(target=run_queries) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            remove_query_observer(observer)
+        
+        [select] = observer.slowest(10)
+        assert select["sql"] == "SELECT 1"
+        assert select["count"] == 6 and select["slow_count"] == 0
+        assert select["operation"] == "TestMonitoring.test_slow_query_stats_merged_across_threads.<locals>.run_queries"
+        assert select["plan"] is None
+        assert normalize_sql.cache_info().hits >= 5
+        
+        observer.reset()
+        assert observer.slowest(10) == [] and observer.untracked == 0
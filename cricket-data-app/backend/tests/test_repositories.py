@@ -3,14 +3,18 @@ import pytest
 import sqlite3
 import tempfile
 import os
-from unittest.mock import patch, AsyncMock
+from datetime import date
+from unittest.mock import patch, AsyncMock, Mock
 
 from app.database.connection import DatabaseManager
 from app.database.repositories.venue_repository import VenueRepository
 from app.database.repositories.game_repository import GameRepository
 from app.database.repositories.simulation_repository import SimulationRepository
+from app.database.result_store import ResultStore
+from app.database.row_mapping import mapper_cache, parse_dates
 from app.models.venue import Venue
 from app.models.game import Game
+from app.models.records import ScorePair, SimulationRecord
 from app.models.simulation import TeamSimulation
 
 
@@ -67,3 +71,72 @@ class TestRepositories:
             venue = await repo.find_by_name('Test Venue')
             assert venue is not None
             assert venue.id == 1
+    
+    def test_result_store_keyed_by_fingerprint(self):
+        """Test persisted results are reused per fingerprint and pruned when data changes."""
+        db_manager = Mock()
+        db_manager.get_connection.side_effect = lambda: sqlite3.connect(self.test_db_path)
+        store = ResultStore(db_manager)
+        payload = b'{"home_win_probability":84.0,"total_simulations":100}'
+        
+        store.put("analysis", 1, "v1", payload)
+        assert store.get("analysis", 1, "v1") == payload
+        assert store.get("analysis", 1, "v2") is None
+        assert store.get("histogram", 1, "v1") is None
+        
+        # A new data fingerprint drops entries computed from the old data
+        assert store.prune("v2") == 1
+        assert store.get("analysis", 1, "v1") is None
+    
+    @pytest.mark.asyncio
+    async def test_simulation_repository_returns_records(self, game_database, query_budget):
+        """Test simulation queries return plain records and pair runs in one statement."""
+        repo = SimulationRepository()
+        db_manager = DatabaseManager()
+        db_manager.config = Mock(database_path=game_database)
+        
+        with patch.object(repo, 'db_manager', db_manager):
+            with query_budget(max_statements=1):
+                pairs = await repo.get_game_simulations("Team A", "Team B")
+            assert pairs == [ScorePair(150, 145), ScorePair(140, 145)]
+            assert [pair.home_wins for pair in pairs] == [True, False]
+            
+            simulations = await repo.find_by_team("Team C")
+            assert simulations == [
+                SimulationRecord(2, "Team C", 1, 100),
+                SimulationRecord(2, "Team C", 2, 200)
+            ]
+            assert await repo.get_team_scores("Team A") == [150, 140]
+            assert await repo.get_score_distribution("Team B") == {145: 2}
+    
+    @pytest.mark.asyncio
+    async def test_game_repository_maps_rows_by_position(self, game_database):
+        """Test games are mapped from joined and plain results, with dates parsed."""
+        repo = GameRepository()
+        db_manager = DatabaseManager()
+        db_manager.config = Mock(database_path=game_database)
+        
+        with patch.object(repo, 'db_manager', db_manager):
+            games = await repo.find_all_with_venues()
+            assert [game.id for game in games] == [1, 2]
+            assert games[0].game_date == date(2024, 1, 1)
+            assert games[0].venue_name == "Test Venue"
+            
+            # Without the join there is no venue name column
+            game = await repo.find_by_id(2)
+            assert game.away_team == "Team C"
+            assert game.game_date == date(2024, 1, 2)
+            assert game.venue_name is None
+            assert await repo.find_with_venue(99) is None
+            
+            # Mappers are compiled once per result shape
+            compiled = len(mapper_cache)
+            await repo.find_all_with_venues()
+            await repo.find_by_teams("Team A", "Team B")
+            assert len(mapper_cache) == compiled
+    
+    def test_parse_dates_once_per_value(self):
+        """Test date columns parse valid dates and turn anything else into None."""
+        assert parse_dates(["2024-01-01", None, "2024-01-01", "not a date"]) == [
+            date(2024, 1, 1), None, date(2024, 1, 1), None
+        ]
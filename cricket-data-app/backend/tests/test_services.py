@@ -1,11 +1,26 @@
 import pytest
-from unittest.mock import Mock, AsyncMock
+import asyncio
+import json
+import sqlite3
+import threading
+from unittest.mock import AsyncMock, patch
+
+import msgpack
+import numpy as np
 from app.services.game_service import GameService
 from app.services.venue_service import VenueService
 from app.services.simulation_service import SimulationService
+from app.services.coalescing import SingleFlight
+from app.services.game_analysis_service import GameAnalysisService
+from app.services.result_cache import CachedPayload, ResultCache
+from app.services.events import DataVersionBroadcaster
+from app.services.data_loader import DataLoaderService
+from app.database.result_store import ResultStore
 from app.models.venue import Venue
 from app.models.game import Game
-from app.models.simulation import TeamSimulation, Simulation
+from app.models.simulation import TeamSimulation
+from app.models.records import ScorePair
+from app.constants import API, Database
 
 
 class TestServices:
@@ -53,9 +68,9 @@ class TestServices:
         )
         
         test_simulations = [
-            Simulation(home_score=150, away_score=140),
-            Simulation(home_score=160, away_score=170),
-            Simulation(home_score=155, away_score=145)
+            ScorePair(home_score=150, away_score=140),
+            ScorePair(home_score=160, away_score=170),
+            ScorePair(home_score=155, away_score=145)
         ]
         
         self.mock_game_repo.find_with_venue.return_value = test_game
@@ -70,6 +85,10 @@ class TestServices:
         assert analysis.game_id == 1
         assert analysis.total_simulations == 3
         assert analysis.home_win_probability == 66.67  # 2 out of 3 wins
+        assert analysis.home_wins == 2
+        # Runs stay ScorePair tuples rather than one model per run
+        assert analysis.simulations[0] == ScorePair(home_score=150, away_score=140)
+        assert json.loads(analysis.model_dump_json())["simulations"][0] == [150, 140]
         
         self.mock_game_repo.find_with_venue.assert_called_once_with(1)
         self.mock_simulation_repo.get_game_simulations.assert_called_once_with("Team A", "Team B")
@@ -101,3 +120,246 @@ class TestServices:
         assert stats["min_score"] == 150
         assert stats["max_score"] == 160
 
+    
+    @pytest.mark.asyncio
+    async def test_single_flight_coalesces_concurrent_calls(self):
+        """Test concurrent identical calls share one computation."""
+        coalescer = SingleFlight()
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"total_simulations": 3}
+        
+        results = await asyncio.gather(
+            *(coalescer.run(("analysis", 1), compute) for _ in range(5))
+        )
+        assert len(calls) == 1
+        assert all(result == {"total_simulations": 3} for result in results)
+        assert coalescer.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+        
+        # A later call starts a fresh computation
+        await coalescer.run(("analysis", 1), compute)
+        assert len(calls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_game_analysis_warm_up_serves_from_cache(self, game_db_manager):
+        """Test warm-up caches every game's payloads before the first request."""
+        service = GameAnalysisService(game_db_manager)
+        
+        assert service.warm_up(max_workers=2) == 2
+        assert service.get_cache_stats()["size"] == 4
+        
+        analysis = (await service.get_game_analysis(1)).data
+        histogram = (await service.get_histogram_data(1)).data
+        assert analysis["total_simulations"] == 2
+        assert analysis["home_win_probability"] == 50.0
+        assert histogram["home_frequency"] == {"150": 1, "140": 1}
+        assert service.get_cache_stats()["hits"] == 2
+        assert service.get_coalescing_stats()["executed"] == 0
+    
+    def test_game_analysis_warm_up_capped_at_cache_size(self, game_db_manager, caplog):
+        """Test warm-up only fills the cache with the most recent games it can hold."""
+        service = GameAnalysisService(game_db_manager)
+        game_bytes = sum(
+            CachedPayload(data=build(2)).nbytes
+            for build in (service.build_game_analysis, service.build_histogram_data)
+        )
+        service.cache = ResultCache(max_bytes=game_bytes)
+        
+        assert service.warm_up(max_workers=1) == 1
+        assert service.cache.get((service.ANALYSIS_COLUMNAR, 2)) is not None
+        assert service.cache.get((service.ANALYSIS_COLUMNAR, 1)) is None
+        assert service.get_cache_stats()["evictions"] == 0
+        assert "most recent of 2 games" in caplog.text
+    
+    def test_result_cache_bounded_by_encoded_bytes(self):
+        """Test cached payloads keep only their encoding and are evicted by total size."""
+        payload = CachedPayload(data={"simulations": [{"home_score": 150, "away_score": 145}]})
+        cache = ResultCache(max_bytes=2 * payload.nbytes)
+        assert payload._data is None  # dropped once encoded
+        assert payload.data == {"simulations": [{"home_score": 150, "away_score": 145}]}
+        
+        for game_id in (1, 2, 3):
+            cache.set(("analysis", game_id), CachedPayload(body=payload.body))
+        assert ("analysis", 1) not in cache
+        assert cache.stats()["bytes"] == 2 * payload.nbytes
+        assert cache.stats()["evictions"] == 1
+        assert not cache.set(("analysis", 4), CachedPayload(body=payload.body), evict=False)
+        assert not cache.set(("large", 1), CachedPayload(body=payload.body * 3))
+    
+    @pytest.mark.asyncio
+    async def test_game_analysis_invalidated_mid_computation(self, game_database, game_db_manager):
+        """Test a computation overtaken by a data reload stores nothing."""
+        conn = sqlite3.connect(game_database)
+        conn.execute(Database.Queries.CREATE_RESULT_CACHE_TABLE)
+        conn.commit()
+        conn.close()
+        store = ResultStore(game_db_manager)
+        service = GameAnalysisService(game_db_manager, store)
+        service.set_data_fingerprint("v1")
+        
+        build = service.build_game_analysis
+        def build_during_reload(game_id):
+            analysis = build(game_id)
+            service.set_data_fingerprint("v2")
+            return analysis
+        
+        payload = await service._get_payload(service.ANALYSIS_COLUMNAR, 1, build_during_reload)
+        assert payload.data["total_simulations"] == 2  # the caller still gets its result
+        assert service.get_cache_stats()["size"] == 0
+        assert store.get(service.ANALYSIS_COLUMNAR, 1, "v1") is None
+        assert store.get(service.ANALYSIS_COLUMNAR, 1, "v2") is None
+        
+        # The next request computes and stores under the new data version
+        await service.get_game_analysis(1, response_format="columnar")
+        assert service.get_cache_stats()["size"] == 1
+        assert store.get(service.ANALYSIS_COLUMNAR, 1, "v2") is not None
+    
+    @pytest.mark.asyncio
+    async def test_game_analysis_batch_summaries(self, game_db_manager):
+        """Test batch summaries match per-game analysis and report missing IDs."""
+        service = GameAnalysisService(game_db_manager)
+        
+        summaries, missing = await service.get_analysis_summaries([2, 1, 99])
+        assert [summary["game"]["id"] for summary in summaries] == [2, 1]
+        assert missing == [99]
+        assert "simulations" not in summaries[0]
+        
+        for summary in summaries:
+            analysis = service.build_game_analysis(summary["game"]["id"])
+            assert summary["home_win_probability"] == analysis["home_win_probability"]
+            assert summary["total_simulations"] == analysis["total_simulations"]
+    
+    @pytest.mark.asyncio
+    async def test_game_analysis_compact_formats(self, game_db_manager):
+        """Test columnar and aggregates-only analysis representations."""
+        service = GameAnalysisService(game_db_manager)
+        
+        rows = (await service.get_game_analysis(1)).data
+        columnar = (await service.get_game_analysis(1, response_format="columnar")).data
+        summary = (await service.get_game_analysis(1, include_runs=False)).data
+        
+        assert rows["simulations"] == [
+            {"home_score": 150, "away_score": 145},
+            {"home_score": 140, "away_score": 145}
+        ]
+        assert columnar["simulations"] == {"home_score": [150, 140], "away_score": [145, 145]}
+        assert "simulations" not in summary
+        assert summary["home_win_probability"] == columnar["home_win_probability"] == 50.0
+    
+    @pytest.mark.asyncio
+    async def test_game_analysis_msgpack_body_cached(self, game_db_manager):
+        """Test the packed MessagePack analysis is encoded once and then served from the cache."""
+        service = GameAnalysisService(game_db_manager)
+        
+        first = await service.get_game_analysis(1, media_type=API.MediaTypes.MSGPACK)
+        hits = service.get_cache_stats()["hits"]
+        second = await service.get_game_analysis(1, media_type=API.MediaTypes.MSGPACK)
+        
+        assert second is first
+        assert service.get_cache_stats()["hits"] == hits + 2  # the analysis and its encoding
+        packed = msgpack.unpackb(first.body)
+        assert packed["simulations"]["dtypes"] == {"home_score": "<i2", "away_score": "<i2"}
+        assert np.frombuffer(packed["simulations"]["columns"]["home_score"], "<i2").tolist() == [150, 140]
+        assert packed["total_simulations"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_histogram_bins_match_frequencies(self, game_db_manager):
+        """Test version 2 histogram bins aggregate the raw frequencies."""
+        service = GameAnalysisService(game_db_manager)
+        
+        bins = (await service.get_histogram_bins(2, bin_size=50)).data
+        assert bins["bin_start"] == 100
+        assert bins["score_range"] == {"min": 100, "max": 200}
+        # Bins: 100-149, 150-199, 200-249
+        assert bins["home_counts"] == [2, 0, 0]
+        assert bins["away_counts"] == [1, 0, 1]
+        assert bins["home_total"] == bins["away_total"] == 2
+        
+        assert await service.get_histogram_bins(99) is None
+    
+    @pytest.mark.asyncio
+    async def test_game_bundle_matches_separate_payloads(self, game_db_manager):
+        """Test the bundle agrees with the analysis summary and histogram bins."""
+        service = GameAnalysisService(game_db_manager)
+        
+        bundle = (await service.get_game_bundle(2, bin_size=50)).data
+        summary = (await service.get_game_analysis(2, include_runs=False)).data
+        bins = (await service.get_histogram_bins(2, bin_size=50)).data
+        
+        assert bundle == {**summary, "histogram": bins}
+        assert await service.get_game_bundle(99) is None
+    
+    @pytest.mark.asyncio
+    async def test_game_overview_matches_batch_summaries(self, game_database, game_db_manager):
+        """Test the materialized overview agrees with per-game analysis."""
+        conn = sqlite3.connect(game_database)
+        conn.execute(Database.Queries.CREATE_GAME_OVERVIEW_TABLE)
+        conn.execute(Database.Queries.MATERIALIZE_GAME_OVERVIEW)
+        conn.commit()
+        conn.close()
+        service = GameAnalysisService(game_db_manager)
+        
+        overview = (await service.get_overview()).data["games"]
+        summaries, _ = await service.get_analysis_summaries([1, 2])
+        
+        assert [game["id"] for game in overview] == [1, 2]
+        for game, summary in zip(overview, summaries):
+            assert game["venue_name"] == summary["game"]["venue_name"]
+            assert game["home_win_probability"] == summary["home_win_probability"]
+            assert game["total_simulations"] == summary["total_simulations"]
+            assert game["tie_rate"] == 0.0
+        assert await service.get_overview() is await service.get_overview()
+    
+    @pytest.mark.asyncio
+    async def test_data_version_events_fan_out(self):
+        """Test events published from another thread reach every subscriber."""
+        events = DataVersionBroadcaster(queue_size=2)
+        first, second = events.subscribe(), events.subscribe()
+        
+        thread = threading.Thread(target=events.publish, args=("v1",))
+        thread.start()
+        thread.join()
+        events.publish("v2", games=[1], teams=["Team A"])
+        events.publish("v3", games=[2], teams=["Team B"])
+        await asyncio.sleep(0)
+        
+        # Each queue holds the two newest events; the oldest was dropped
+        for queue in (first, second):
+            assert [queue.get_nowait()["version"] for _ in range(queue.qsize())] == ["v2", "v3"]
+        assert events.latest["scope"] == "partial"
+        assert events.latest["games"] == [2]
+        
+        events.unsubscribe(first)
+        assert events.subscriber_count() == 1
+    
+    @pytest.mark.asyncio
+    async def test_data_reload_notifies_connected_subscribers(self, game_db_manager):
+        """Test a reload drops cached results and then reaches subscribers that are already connected."""
+        events = DataVersionBroadcaster()
+        service = GameAnalysisService(game_db_manager)
+        service.set_data_fingerprint("v1")
+        await service.get_game_analysis(1)
+        queue = events.subscribe()
+        
+        loader = DataLoaderService()
+        with patch("app.services.data_loader.data_events", events), \
+                patch("app.services.data_loader.game_analysis_service", service), \
+                patch("app.services.data_loader.db_manager"), \
+                patch.multiple(
+                    DataLoaderService,
+                    _load_venues=lambda self: True,
+                    _load_games=lambda self: True,
+                    _load_simulations=lambda self: True,
+                    _materialize_game_overview=lambda self: None,
+                    compute_data_fingerprint=lambda self: "v2"
+                ):
+            assert await asyncio.to_thread(loader.load_all_csv_data)
+        
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+        assert event["version"] == "v2"
+        assert event["scope"] == "full"
+        assert service.data_fingerprint == "v2"
+        assert service.get_cache_stats()["size"] == 0